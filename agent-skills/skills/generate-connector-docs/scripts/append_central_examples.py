@@ -94,7 +94,11 @@ def github_repo_from_metadata(metadata: dict) -> Optional[str]:
 
 
 def examples_from_metadata(metadata_path: Path) -> Optional[str]:
-    metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    return central_examples(json.loads(metadata_path.read_text(encoding="utf-8")))
+
+
+def central_examples(metadata: dict) -> Optional[str]:
+    """Return the README Examples section of already-parsed Central metadata, links rewritten."""
     readme = metadata.get("readme")
     if readme is None:
         return None
@@ -113,8 +117,16 @@ def append_central_examples(doc_path: Path, metadata_path: Path) -> tuple[bool,
     if not doc_path.is_file():
         raise FileNotFoundError(f"Missing guide: {doc_path}")
     metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
-    examples = examples_from_metadata(metadata_path)
-    text = doc_path.read_text(encoding="utf-8")
+    updated, found, added = merge_central_examples(
+        doc_path.read_text(encoding="utf-8"), metadata, central_examples(metadata)
+    )
+    if added:
+        doc_path.write_text(updated, encoding="utf-8")
+    return found, added
+
+
+def merge_central_examples(text: str, metadata: dict, examples: Optional[str]) -> tuple[str, bool, bool]:
+    """Return the guide text with `examples` appended, whether examples exist, and whether they were added."""
     matches = list(re.finditer(r"^## More code examples\n\n(?P<body>.*?)(?=^## |\Z)", text, re.M | re.S))
     if len(matches) > 1:
         raise ValueError("Guide contains duplicate More code examples sections")
@@ -130,11 +142,10 @@ def append_central_examples(doc_path: Path, metadata_path: Path) -> tuple[bool,
             normalized_actual = rewrite_relative_links(actual, github_repo) if github_repo else actual
             if normalized_actual != examples:
                 raise ValueError("Existing More code examples content does not match Ballerina Central")
-        return True, False
+        return text, True, False
     if examples is None:
-        return False, False
-    doc_path.write_text(f"{text.rstrip()}\n\n{SECTION_HEADING}\n\n{examples}\n", encoding="utf-8")
-    return True, True
+        return text, False, False
+    return f"{text.rstrip()}\n\n{SECTION_HEADING}\n\n{examples}\n", True, True
 
 
 def main() -> int:
@@ -9,8 +9,9 @@ import shutil
 import sys
 from pathlib import Path
 
+from png_header import NotPngError, read_png_header
+
 NAME_RE = re.compile(r"^[a-z0-9_]+_screenshot_(0[1-6])_[a-z0-9_]+\.png$")
-PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 
 
 def collect(source: Path, destination: Path) -> Path:
@@ -20,8 +21,12 @@ def collect(source: Path, destination: Path) -> Path:
         raise ValueError("Destination must use <prefix>_screenshot_01..06_<suffix>.png")
     if destination.exists():
         raise FileExistsError(f"Refusing to overwrite screenshot: {destination}")
-    if source.read_bytes()[:8] != PNG_SIGNATURE:
-        raise ValueError(f"Source is not a PNG file: {source}")
+    try:
+        read_png_header(source)
+    except NotPngError:
+        raise ValueError(f"Source is not a PNG file: {source}") from None
+    except ValueError as exc:
+        raise ValueError(f"Source has an unreadable PNG header: {source} ({exc})") from None
     destination.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy2(source, destination)
     return destination.resolve()
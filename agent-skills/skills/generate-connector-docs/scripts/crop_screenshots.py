@@ -1,11 +1,26 @@
 #!/usr/bin/env python3
-"""Crop code-server tab and status bars from connector screenshots."""
+"""Crop code-server tab and status bars from connector screenshots.
+
+Every crop box is checked from the PNG headers before any file changes, so a
+bad margin leaves the whole directory untouched. Each image is then decoded
+once in a process pool, re-encoded with --compress-level, and written through
+a temporary file that replaces the original atomically.
+"""
 
 from __future__ import annotations
 
 import argparse
+import os
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
+
+from png_header import inspect_directory
+
+# zlib level for re-encoded screenshots; flat UI captures shrink noticeably at 9
+DEFAULT_COMPRESS_LEVEL = 9
 
 
 def non_negative(value: str) -> int:
@@ -15,25 +30,65 @@ def non_negative(value: str) -> int:
     return parsed
 
 
-def crop_directory(directory: Path, top: int = 32, bottom: int = 18, left: int = 0, right: int = 0) -> int:
+def compress_level(value: str) -> int:
+    parsed = int(value)
+    if not 0 <= parsed <= 9:
+        raise argparse.ArgumentTypeError("compress level must be between 0 and 9")
+    return parsed
+
+
+def _crop_one(job: tuple[Path, tuple[int, int, int, int], int]) -> tuple[str, int, int]:
+    from PIL import Image
+
+    path, box, level = job
+    stat = path.stat()
+    before = stat.st_size
+    with Image.open(path) as image:
+        cropped = image.crop(box)
+    handle, temporary = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".png", dir=path.parent)
+    try:
+        with os.fdopen(handle, "wb") as output:
+            cropped.save(output, format="PNG", compress_level=level)
+        # mkstemp creates the file 0600; keep the original screenshot's permissions
+        os.chmod(temporary, stat.st_mode & 0o777)
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+    return path.name, before, path.stat().st_size
+
+
+def crop_directory(
+    directory: Path,
+    top: int = 32,
+    bottom: int = 18,
+    left: int = 0,
+    right: int = 0,
+    jobs: Optional[int] = None,
+    level: int = DEFAULT_COMPRESS_LEVEL,
+    sizes: Optional[dict[str, tuple[int, int]]] = None,
+) -> int:
+    """Crop every PNG in `directory`; fill `sizes` with name -> (bytes before, bytes after) when given."""
     try:
-        from PIL import Image
+        import PIL  # noqa: F401
     except ImportError as exc:
         raise RuntimeError("Pillow is required; install scripts/requirements.txt") from exc
-    images = sorted(directory.glob("*.png"))
-    crop_boxes = []
-    for path in images:
-        with Image.open(path) as image:
-            width, height = image.size
-            box = (left, top, width - right, height - bottom)
-            if box[0] >= box[2] or box[1] >= box[3]:
-                raise ValueError(f"Crop margins exceed dimensions for {path.name}")
-            crop_boxes.append((path, box))
-    for path, box in crop_boxes:
-        with Image.open(path) as image:
-            cropped = image.crop(box)
-            cropped.save(path, format="PNG")
-    return len(images)
+    crop_jobs = []
+    for path, header, error in inspect_directory(directory):
+        if error:
+            raise ValueError(f"Unreadable PNG header: {path.name} ({error})")
+        box = (left, top, header.width - right, header.height - bottom)
+        if box[0] >= box[2] or box[1] >= box[3]:
+            raise ValueError(f"Crop margins exceed dimensions for {path.name}")
+        crop_jobs.append((path, box, level))
+    if len(crop_jobs) <= 1:
+        results = [_crop_one(job) for job in crop_jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or min(len(crop_jobs), os.cpu_count() or 1)) as pool:
+            results = list(pool.map(_crop_one, crop_jobs))
+    if sizes is not None:
+        sizes.update((name, (before, after)) for name, before, after in results)
+    return len(results)
 
 
 def main() -> int:
@@ -43,13 +98,21 @@ def main() -> int:
     parser.add_argument("--bottom", type=non_negative, default=18)
     parser.add_argument("--left", type=non_negative, default=0)
     parser.add_argument("--right", type=non_negative, default=0)
+    parser.add_argument("--jobs", type=int, help="Parallel crop workers (default: CPU count)")
+    parser.add_argument("--compress-level", type=compress_level, default=DEFAULT_COMPRESS_LEVEL)
     args = parser.parse_args()
+    sizes: dict[str, tuple[int, int]] = {}
     try:
-        count = crop_directory(args.screenshots_dir, args.top, args.bottom, args.left, args.right)
+        count = crop_directory(
+            args.screenshots_dir, args.top, args.bottom, args.left, args.right,
+            jobs=args.jobs, level=args.compress_level, sizes=sizes,
+        )
     except (RuntimeError, ValueError, OSError) as exc:
         print(f"[ERROR] {exc}", file=sys.stderr)
         return 1
-    print(f"Cropped {count} screenshot(s).")
+    before = sum(size[0] for size in sizes.values())
+    after = sum(size[1] for size in sizes.values())
+    print(f"Cropped {count} screenshot(s); {before} -> {after} bytes ({before - after} saved).")
     return 0
 
 
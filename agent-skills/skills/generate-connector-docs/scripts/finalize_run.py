@@ -1,41 +1,155 @@
 #!/usr/bin/env python3
-"""Append Central examples, crop screenshots once, validate, and write run.json."""
+"""Append Central examples, crop screenshots once, validate, and write run.json.
+
+The context, Central metadata, and guide are loaded once into a RunArtifacts; the
+steps rewrite the guide in memory and it is written back a single time.
+
+Each step records a fingerprint of the inputs it depends on (guide, screenshots,
+sample directory, Central metadata, context) in run.json. On a rerun a step whose
+inputs still match is reported as cached and its recorded result is reused, so a
+fix-and-refinalize loop only redoes the steps an edit actually affects. --force
+ignores the recorded fingerprints.
+"""
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
 
-from append_central_examples import append_central_examples
+from append_central_examples import merge_central_examples
 from crop_screenshots import crop_directory
-from inject_try_it_yourself import build_urls, inject_try_it_yourself
+from inject_try_it_yourself import build_urls, check_sample_dir, insert_try_it_yourself
+from run_artifacts import RunArtifacts
 from validate_output import validate
 
+# Build output under the sample project is not part of what gets published
+SAMPLE_IGNORED_DIRS = {"target", ".git"}
+
+
+def file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return "missing"
+
+
+def tree_digest(directory: Path, pattern: str = "*") -> str:
+    """Digest every file below `directory` matching `pattern`, by relative path and content."""
+    digest = hashlib.sha256()
+    if directory.is_dir():
+        for path in sorted(directory.rglob(pattern)):
+            relative = path.relative_to(directory)
+            if not path.is_file() or SAMPLE_IGNORED_DIRS.intersection(relative.parts[:-1]):
+                continue
+            digest.update(relative.as_posix().encode("utf-8") + b"\0")
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class StepInputs:
+    """Lazily computed input digests; `changed()` drops the ones a step may have rewritten."""
+
+    def __init__(self, artifacts: RunArtifacts, context_path: Path):
+        context = artifacts.context
+        self.sources: dict[str, Callable[[], str]] = {
+            "context": lambda: file_digest(context_path),
+            # The in-memory guide, so a rewrite by an earlier step needs no disk round trip
+            "guide": lambda: hashlib.sha256(artifacts.guide.encode("utf-8")).hexdigest(),
+            "metadata": lambda: file_digest(Path(context["metadata_path"])),
+            "screenshots": lambda: tree_digest(Path(context["screenshots_dir"]), "*.png"),
+            "sample": lambda: tree_digest(Path(context["sample_dir"])),
+            # An updated validator or injector must not be answered from an old result
+            "scripts": lambda: hashlib.sha256(
+                "".join(file_digest(path) for path in sorted(Path(__file__).resolve().parent.glob("*.py"))).encode()
+            ).hexdigest(),
+        }
+        self.digests: dict[str, str] = {}
+
+    def fingerprint(self, *names: str) -> str:
+        for name in names:
+            if name not in self.digests:
+                self.digests[name] = self.sources[name]()
+        return hashlib.sha256(":".join(f"{name}={self.digests[name]}" for name in names).encode()).hexdigest()
+
+    def changed(self, *names: str) -> None:
+        for name in names:
+            self.digests.pop(name, None)
+
+
+# Step name -> the inputs whose content decides whether the step must run again
+STEP_INPUTS = {
+    "try_it_yourself": ("scripts", "context", "guide", "sample"),
+    "central_examples": ("scripts", "guide", "metadata"),
+    "crop": ("screenshots",),
+    "validate": ("scripts", "context", "guide", "metadata", "screenshots", "sample"),
+}
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--context", required=True, type=Path)
     parser.add_argument("--skip-crop", action="store_true", help="Keep original screenshots")
+    parser.add_argument("--force", action="store_true", help="Rerun every step even if its inputs are unchanged")
     args = parser.parse_args()
+    started = time.perf_counter()
     try:
-        context = json.loads(args.context.read_text(encoding="utf-8"))
-        doc_path = Path(context["doc_path"])
+        artifacts = RunArtifacts.load(args.context)
+        context = artifacts.context
         run_json_path = Path(context["run_log_dir"]) / "run.json"
         previous = json.loads(run_json_path.read_text(encoding="utf-8")) if run_json_path.exists() else {}
-        try_it_yourself_added = inject_try_it_yourself(
-            doc_path, Path(context["sample_dir"]), context["sample_name"]
-        )
+        recorded = {} if args.force else previous.get("steps", {})
+        inputs = StepInputs(artifacts, args.context)
+        steps: dict[str, dict] = {}
+
+        def cached(name: str) -> bool:
+            step = recorded.get(name)
+            if step and step.get("fingerprint") == inputs.fingerprint(*STEP_INPUTS[name]):
+                steps[name] = {**step, "status": "cached"}
+                return True
+            return False
+
+        if not cached("try_it_yourself"):
+            check_sample_dir(Path(context["sample_dir"]), context["sample_name"])
+            artifacts.guide, added = insert_try_it_yourself(artifacts.guide, context["sample_name"])
+            inputs.changed("guide")
+            steps["try_it_yourself"] = {"status": "ran", "result": {"added": added}}
+        try_it_yourself_added = steps["try_it_yourself"]["result"]["added"]
         devant_url, github_url = build_urls(context["sample_name"])
-        central_examples_found, examples_added = append_central_examples(
-            doc_path, Path(context["metadata_path"])
-        )
+
+        if not cached("central_examples"):
+            artifacts.guide, found, added = merge_central_examples(
+                artifacts.guide, artifacts.metadata, artifacts.central_examples
+            )
+            inputs.changed("guide")
+            steps["central_examples"] = {"status": "ran", "result": {"found": found, "added": added}}
+        central_examples_found = steps["central_examples"]["result"]["found"]
+        examples_added = steps["central_examples"]["result"]["added"]
+
         already_cropped = bool(previous.get("screenshots_cropped"))
-        if not args.skip_crop and not already_cropped:
+        if args.skip_crop or already_cropped:
+            # Cropping is not idempotent, so it never reruns once recorded, even with --force
+            steps["crop"] = {"status": "skipped" if args.skip_crop and not already_cropped else "cached"}
+        else:
             crop_directory(Path(context["screenshots_dir"]))
-        errors = validate(context)
+            inputs.changed("screenshots")
+            steps["crop"] = {"status": "ran"}
+
+        if not cached("validate"):
+            steps["validate"] = {"status": "ran", "result": {"errors": validate(context, artifacts=artifacts)}}
+        errors = steps["validate"]["result"]["errors"]
+        artifacts.save()
+
+        # Record what every step's inputs look like now: the guide is only ever rewritten
+        # idempotently, so rerunning any step against these exact inputs is a no-op.
+        for name, step in steps.items():
+            step["fingerprint"] = inputs.fingerprint(*STEP_INPUTS[name])
         result = {
             **context,
             "completed_at": datetime.now(timezone.utc).isoformat(),
@@ -45,12 +159,15 @@ def main() -> int:
             "devant_url": devant_url,
             "github_url": github_url,
             "screenshots_cropped": already_cropped or not args.skip_crop,
+            "steps": steps,
             "validation": {"status": "passed" if not errors else "failed", "errors": errors},
         }
         run_json_path.write_text(json.dumps(result, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     except (OSError, ValueError, RuntimeError, json.JSONDecodeError, KeyError) as exc:
         print(f"[ERROR] Finalization failed: {exc}", file=sys.stderr)
         return 1
+    summary = ", ".join(f"{name} {step['status']}" for name, step in steps.items())
+    print(f"Steps: {summary} ({(time.perf_counter() - started) * 1000:.0f} ms)")
     if errors:
         for error in errors:
             print(f"[ERROR] {error}", file=sys.stderr)
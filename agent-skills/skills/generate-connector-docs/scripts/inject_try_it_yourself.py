@@ -31,32 +31,39 @@ def build_section(sample_name: str) -> str:
     )
 
 
-def inject_try_it_yourself(doc_path: Path, sample_dir: Path, sample_name: str) -> bool:
+def check_sample_dir(sample_dir: Path, sample_name: str) -> None:
     if sample_dir.name != sample_name:
         raise ValueError(
             f"Sample directory name '{sample_dir.name}' does not match context sample name '{sample_name}'"
         )
-    if not doc_path.is_file():
-        raise FileNotFoundError(f"Missing guide: {doc_path}")
 
-    text = doc_path.read_text(encoding="utf-8")
+
+def insert_try_it_yourself(text: str, sample_name: str) -> tuple[str, bool]:
+    """Return the guide text with the section inserted, and whether it was added."""
     section = build_section(sample_name)
     existing = re.search(r"^## Try it yourself\n\n(?P<body>.*?)(?=^## |\Z)", text, re.M | re.S)
     if existing:
         actual = "## Try it yourself\n\n" + existing.group("body").strip()
         if actual != section:
             raise ValueError("Existing Try it yourself section does not match the deterministic template")
-        return False
+        return text, False
 
     examples = re.search(r"^## More code examples\s*$", text, re.M)
     if examples:
         before = text[: examples.start()].rstrip()
         after = text[examples.start() :].lstrip()
-        updated = f"{before}\n\n{section}\n\n{after.rstrip()}\n"
-    else:
-        updated = f"{text.rstrip()}\n\n{section}\n"
-    doc_path.write_text(updated, encoding="utf-8")
-    return True
+        return f"{before}\n\n{section}\n\n{after.rstrip()}\n", True
+    return f"{text.rstrip()}\n\n{section}\n", True
+
+
+def inject_try_it_yourself(doc_path: Path, sample_dir: Path, sample_name: str) -> bool:
+    check_sample_dir(sample_dir, sample_name)
+    if not doc_path.is_file():
+        raise FileNotFoundError(f"Missing guide: {doc_path}")
+    updated, added = insert_try_it_yourself(doc_path.read_text(encoding="utf-8"), sample_name)
+    if added:
+        doc_path.write_text(updated, encoding="utf-8")
+    return added
 
 
 def main() -> int:
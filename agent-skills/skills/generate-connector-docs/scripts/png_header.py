@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Inspect PNG screenshots from their signature and IHDR chunk without decoding.
+
+Only the first 33 bytes of each file are read: the 8-byte signature and the
+IHDR chunk that every PNG must start with, which carries the width, height, bit
+depth, and color type. Directories are inspected in a thread pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Signature + chunk length + b"IHDR" + 13 bytes of IHDR data + CRC
+HEADER_SIZE = 8 + 4 + 4 + 13 + 4
+# Allowed bit depths for each PNG color type
+BIT_DEPTHS = {0: {1, 2, 4, 8, 16}, 2: {8, 16}, 3: {1, 2, 4, 8}, 4: {8, 16}, 6: {8, 16}}
+
+
+@dataclass(frozen=True)
+class PngHeader:
+    width: int
+    height: int
+    bit_depth: int
+    color_type: int
+
+
+class NotPngError(ValueError):
+    """The file does not start with the PNG signature."""
+
+
+def read_png_header(path: Path) -> PngHeader:
+    """Read and check the signature and IHDR chunk of one PNG file."""
+    with path.open("rb") as handle:
+        data = handle.read(HEADER_SIZE)
+    if data[:8] != PNG_SIGNATURE:
+        raise NotPngError("missing PNG signature")
+    if len(data) < HEADER_SIZE:
+        raise ValueError("truncated PNG header")
+    length, chunk_type = struct.unpack(">I4s", data[8:16])
+    if length != 13 or chunk_type != b"IHDR":
+        raise ValueError("first chunk is not IHDR")
+    ihdr = data[16:29]
+    (crc,) = struct.unpack(">I", data[29:33])
+    if zlib.crc32(b"IHDR" + ihdr) != crc:
+        raise ValueError("IHDR checksum mismatch")
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", ihdr[:10])
+    if not width or not height:
+        raise ValueError("zero width or height")
+    if bit_depth not in BIT_DEPTHS.get(color_type, ()):
+        raise ValueError(f"invalid bit depth {bit_depth} for color type {color_type}")
+    return PngHeader(width, height, bit_depth, color_type)
+
+
+def _inspect(path: Path) -> tuple[Path, Optional[PngHeader], Optional[Exception]]:
+    try:
+        return path, read_png_header(path), None
+    except (OSError, ValueError) as exc:
+        return path, None, exc
+
+
+def inspect_pngs(
+    paths: Iterable[Path], jobs: Optional[int] = None
+) -> list[tuple[Path, Optional[PngHeader], Optional[Exception]]]:
+    """Return `(path, header, error)` for every path, in input order.
+
+    Exactly one of `header` and `error` is set. The reads are small and I/O bound,
+    so a thread pool overlaps them without loading any image data.
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return [_inspect(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=jobs or min(len(paths), 8)) as pool:
+        return list(pool.map(_inspect, paths))
+
+
+def inspect_directory(
+    directory: Path, jobs: Optional[int] = None
+) -> list[tuple[Path, Optional[PngHeader], Optional[Exception]]]:
+    return inspect_pngs(sorted(directory.glob("*.png")), jobs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", type=Path, help="PNG files or directories of PNG files")
+    parser.add_argument("--jobs", type=int, help="Parallel header reads (default: up to 8)")
+    args = parser.parse_args()
+    paths = []
+    for path in args.paths:
+        paths.extend(sorted(path.glob("*.png")) if path.is_dir() else [path])
+    results = inspect_pngs(paths, args.jobs)
+    report = [
+        {"path": str(path), **asdict(header)} if header else {"path": str(path), "error": str(error)}
+        for path, header, error in results
+    ]
+    print(json.dumps(report, indent=2))
+    return 1 if any(error for _, _, error in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,43 @@
 #!/usr/bin/env python3
-"""Validate a Central coordinate and create an isolated connector-doc run."""
+"""Validate a Central coordinate and create an isolated connector-doc run.
+
+Several coordinates (as arguments or via --batch-file) prepare one isolated run
+each: metadata is resolved concurrently (--jobs) under a shared request rate
+limit (--rate), and a per-coordinate result or failure is reported as JSON.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import shutil
 import sys
+import tempfile
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
 
 CENTRAL_BASE = "https://api.central.ballerina.io/2.0/registry/packages"
+# Shared across runs and invocation roots; override with --cache-dir or this variable.
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("CONNECTOR_DOCS_CENTRAL_CACHE")
+    or Path.home() / ".cache" / "ballerina-connector-docs" / "central"
+)
+# `latest` can move, so its cached metadata is revalidated after this many seconds.
+# Resolved versions are immutable on Central and are never revalidated.
+DEFAULT_LATEST_TTL_SECONDS = 3600
+DEFAULT_BATCH_JOBS = 8
+DEFAULT_BATCH_RATE = 5.0
+# Must match the --viewport-size the bundled Playwright MCP server is launched with
+SCREENSHOT_VIEWPORT = (1720, 968)
 COORDINATE_RE = re.compile(
     r"^(?P<org>[A-Za-z0-9][A-Za-z0-9_.-]*)/"
     r"(?P<package>[A-Za-z0-9][A-Za-z0-9_.-]*)"
@@ -80,14 +103,19 @@ def safe_slug(*parts: str, separator: str = "-") -> str:
     return re.sub(rf"[^{re.escape(separator)}a-z0-9]+", separator, joined).strip(separator)
 
 
-def fetch_metadata(url: str, timeout: int = 20) -> dict:
-    request = urllib.request.Request(url, headers={"Accept": "application/json"})
+def _request_central(url: str, timeout: int, validators: dict | None = None) -> tuple[dict | None, dict]:
+    """GET `url`; return (payload, response headers), or (None, headers) on HTTP 304."""
+    headers = {"Accept": "application/json", **(validators or {})}
+    request = urllib.request.Request(url, headers=headers)
     try:
         with urllib.request.urlopen(request, timeout=timeout) as response:
             if response.status != 200:
                 raise RuntimeError(f"Ballerina Central returned HTTP {response.status}")
             payload = json.load(response)
+            response_headers = dict(response.headers.items())
     except urllib.error.HTTPError as exc:
+        if exc.code == 304 and validators:
+            return None, dict(exc.headers.items())
         if exc.code == 404:
             raise RuntimeError("Package or requested version was not found in Ballerina Central") from exc
         raise RuntimeError(f"Ballerina Central returned HTTP {exc.code}") from exc
@@ -95,9 +123,195 @@ def fetch_metadata(url: str, timeout: int = 20) -> dict:
         raise RuntimeError(f"Could not reach Ballerina Central: {exc}") from exc
     if not isinstance(payload, dict):
         raise RuntimeError("Ballerina Central returned an unexpected response")
+    return payload, response_headers
+
+
+def fetch_metadata(url: str, timeout: int = 20) -> dict:
+    payload, _ = _request_central(url, timeout)
     return payload
 
 
+def _cache_component(value: str) -> str:
+    """Percent-encode a path component losslessly; `.` and `..` are encoded too."""
+    quoted = urllib.parse.quote(value, safe="")
+    return quoted if quoted.strip(".") else quoted.replace(".", "%2E")
+
+
+def cache_entry_path(cache_dir: Path, org: str, package: str, version: str) -> Path:
+    org, package, version = (_cache_component(part) for part in (org, package, version))
+    return cache_dir / org / package / f"{version}.json"
+
+
+def _read_cache_entry(path: Path) -> dict | None:
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or not isinstance(entry.get("metadata"), dict):
+        return None
+    return entry
+
+
+def _write_cache_entry(path: Path, entry: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(entry, handle, sort_keys=True)
+    os.replace(temp, path)
+
+
+def load_metadata(
+    org: str,
+    package: str,
+    version: str,
+    cache_dir: Path | None = DEFAULT_CACHE_DIR,
+    ttl_seconds: int = DEFAULT_LATEST_TTL_SECONDS,
+    offline: bool = False,
+    timeout: int = 20,
+    throttle: Callable[[], None] | None = None,
+) -> tuple[dict, str]:
+    """Return (metadata, source) for a coordinate through the shared on-disk cache.
+
+    `source` is one of "network", "cache", "revalidated", or "stale-cache". Pinned
+    versions are served from the cache forever once fetched. `latest` is served
+    from the cache within `ttl_seconds` and afterwards revalidated with the stored
+    ETag/Last-Modified validators, so an unchanged package costs a 304 instead of
+    a full download of its README. `offline` never touches the network.
+    `throttle`, when given, is called before every request actually sent.
+    """
+    url = central_url(org, package, version)
+    if cache_dir is None:
+        if offline:
+            raise RuntimeError("Offline mode needs the metadata cache")
+        if throttle:
+            throttle()
+        return fetch_metadata(url, timeout), "network"
+
+    path = cache_entry_path(cache_dir, org, package, version)
+    entry = _read_cache_entry(path)
+    if entry is not None:
+        age = time.time() - float(entry.get("fetched_at", 0))
+        if offline or version != "latest" or age < ttl_seconds:
+            return entry["metadata"], "cache"
+    elif offline:
+        raise RuntimeError(f"{org}/{package}:{version} is not in the metadata cache (offline mode)")
+
+    validators = {}
+    if entry is not None and entry.get("etag"):
+        validators["If-None-Match"] = entry["etag"]
+    if entry is not None and entry.get("last_modified"):
+        validators["If-Modified-Since"] = entry["last_modified"]
+    if throttle:
+        throttle()
+    try:
+        payload, headers = _request_central(url, timeout, validators)
+    except RuntimeError as exc:
+        if entry is None:
+            raise
+        print(f"[WARN] {exc}; using cached metadata for {org}/{package}:{version}", file=sys.stderr)
+        return entry["metadata"], "stale-cache"
+
+    source = "network"
+    if payload is None:
+        payload, source = entry["metadata"], "revalidated"
+        headers = {"ETag": entry.get("etag"), "Last-Modified": entry.get("last_modified"), **headers}
+    headers = {name.lower(): value for name, value in headers.items()}
+    fresh = {
+        "coordinate": f"{org}/{package}:{version}",
+        "fetched_at": time.time(),
+        "etag": headers.get("etag"),
+        "last_modified": headers.get("last-modified"),
+        "metadata": payload,
+    }
+    _write_cache_entry(path, fresh)
+    resolved = str(payload.get("version") or "")
+    if version == "latest" and resolved and resolved != "latest":
+        _write_cache_entry(
+            cache_entry_path(cache_dir, org, package, resolved),
+            {**fresh, "coordinate": f"{org}/{package}:{resolved}"},
+        )
+    return payload, source
+
+
+class RateLimiter:
+    """Space calls to `wait()` at least 1/`rate` seconds apart across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_batch_file(path: Path) -> list[str]:
+    """Return coordinates from a file with one per line; blank lines and # comments are skipped."""
+    coordinates = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            coordinates.append(line)
+    return coordinates
+
+
+def prepare_batch(
+    coordinates: list[str],
+    root: Path,
+    jobs: int = DEFAULT_BATCH_JOBS,
+    rate: float = DEFAULT_BATCH_RATE,
+    docs_repo_root: str | None = None,
+    **metadata_options,
+) -> list[dict]:
+    """Prepare one run per coordinate concurrently; return a result per coordinate in input order.
+
+    Each result has `coordinate` and either `context_path`/`resolved_coordinate`/
+    `metadata_source` or `error`. Coordinates that map to the same run directory
+    as an earlier one are reported as duplicates instead of racing for it.
+    """
+    limiter = RateLimiter(rate)
+    seen: dict[str, str] = {}
+    results: list[dict] = [{"coordinate": coordinate.strip()} for coordinate in coordinates]
+    pending = []
+    for result in results:
+        try:
+            org, package, _ = parse_coordinate(result["coordinate"])
+        except ValueError as exc:
+            result["error"] = str(exc)
+            continue
+        slug = safe_slug(org, package)
+        if slug in seen:
+            result["error"] = f"Duplicate of {seen[slug]} (both would use artifacts/{slug})"
+            continue
+        seen[slug] = result["coordinate"]
+        pending.append(result)
+
+    def prepare_one(result: dict) -> None:
+        org, package, version = parse_coordinate(result["coordinate"])
+        try:
+            metadata, source = load_metadata(org, package, version, throttle=limiter.wait, **metadata_options)
+            context = build_context(result["coordinate"], root, metadata, docs_repo_root=docs_repo_root)
+        except (ValueError, RuntimeError, FileExistsError, OSError) as exc:
+            result["error"] = str(exc)
+            return
+        result.update({
+            "resolved_coordinate": context["resolved_coordinate"],
+            "metadata_source": source,
+            "run_dir": context["run_dir"],
+            "context_path": context["context_path"],
+            "category_slug": context["category_slug"],
+        })
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        list(pool.map(prepare_one, pending))
+    return results
+
+
 def prerequisite_status() -> dict[str, bool]:
     return {
         name: shutil.which(name) is not None
@@ -192,6 +406,7 @@ def build_context(
         "prepared_at": datetime.now(timezone.utc).isoformat(),
         "prerequisites": prerequisite_status(),
         "code_server": {"port": 8080, "started_by_run": False, "pid": None},
+        "screenshot_viewport": list(SCREENSHOT_VIEWPORT),
         "github_repo": github_repo or f"module-{org}-{package}",
     }
     if docs_repo_root is not None and category is not None:
@@ -222,9 +437,41 @@ def build_context(
 
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("coordinate", help="organization/package or organization/package:version")
+    parser.add_argument(
+        "coordinate",
+        nargs="*",
+        help="organization/package or organization/package:version (several for a batch)",
+    )
+    parser.add_argument("--batch-file", type=Path, help="File with one coordinate per line to prepare as a batch")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_BATCH_JOBS,
+        help="Batch: coordinates resolved concurrently (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_BATCH_RATE,
+        help="Batch: maximum Central requests per second, 0 for unlimited (default: %(default)s)",
+    )
     parser.add_argument("--root", type=Path, default=Path.cwd(), help="Invocation repository root")
     parser.add_argument("--metadata-file", type=Path, help="Use saved Central JSON (tests/offline replay)")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Shared Central metadata cache (default: $CONNECTOR_DOCS_CENTRAL_CACHE or "
+        "~/.cache/ballerina-connector-docs/central).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch from Central; never read or write the cache")
+    parser.add_argument(
+        "--latest-ttl",
+        type=int,
+        default=DEFAULT_LATEST_TTL_SECONDS,
+        help="Seconds a cached `latest` lookup is trusted before revalidation (default: %(default)s).",
+    )
+    parser.add_argument("--offline", action="store_true", help="Use only cached metadata; never contact Central")
     parser.add_argument(
         "--docs-repo-root",
         help="Local checkout of wso2/docs-integrator. When set with --category, the example "
@@ -244,17 +491,50 @@ def main() -> int:
         "(default: module-<organization>-<package>).",
     )
     args = parser.parse_args()
-    try:
-        org, package, version = parse_coordinate(args.coordinate)
-        metadata = (
-            json.loads(args.metadata_file.read_text(encoding="utf-8"))
-            if args.metadata_file
-            else fetch_metadata(central_url(org, package, version))
+    coordinates = list(args.coordinate)
+    if args.batch_file:
+        try:
+            coordinates.extend(read_batch_file(args.batch_file))
+        except OSError as exc:
+            print(f"[ERROR] {exc}", file=sys.stderr)
+            return 1
+    if not coordinates:
+        parser.error("a coordinate or --batch-file is required")
+    metadata_options = {
+        "cache_dir": None if args.no_cache else args.cache_dir,
+        "ttl_seconds": args.latest_ttl,
+        "offline": args.offline,
+    }
+    if args.batch_file or len(coordinates) > 1:
+        if args.metadata_file or args.category or args.github_repo:
+            parser.error("--metadata-file, --category, and --github-repo apply to a single coordinate only")
+        results = prepare_batch(
+            coordinates,
+            args.root,
+            jobs=args.jobs,
+            rate=args.rate,
+            docs_repo_root=args.docs_repo_root,
+            **metadata_options,
         )
+        failed = [result["coordinate"] for result in results if "error" in result]
+        for result in results:
+            if "error" in result:
+                print(f"[ERROR] {result['coordinate']}: {result['error']}", file=sys.stderr)
+        print(json.dumps({"results": results, "prepared": len(results) - len(failed), "failed": failed},
+                         indent=2, sort_keys=True))
+        return 1 if failed else 0
+
+    try:
+        org, package, version = parse_coordinate(coordinates[0])
+        if args.metadata_file:
+            metadata = json.loads(args.metadata_file.read_text(encoding="utf-8"))
+        else:
+            metadata, source = load_metadata(org, package, version, **metadata_options)
+            print(f"[INFO] Central metadata for {org}/{package}:{version}: {source}", file=sys.stderr)
         if not isinstance(metadata, dict):
             raise ValueError("Ballerina Central metadata must be a JSON object")
         context = build_context(
-            args.coordinate,
+            coordinates[0],
             args.root,
             metadata,
             docs_repo_root=args.docs_repo_root,
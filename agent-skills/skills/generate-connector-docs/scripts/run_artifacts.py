@@ -0,0 +1,67 @@
+"""Load one run's context, Central metadata, and guide once for the finalization steps."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from append_central_examples import central_examples
+
+_UNSET = object()
+
+
+class RunArtifacts:
+    """Shared in-memory view of a run.
+
+    The context, the Central metadata (with its README examples), and the guide text
+    are each read and parsed at most once. Steps replace `guide` in memory, and
+    `save()` writes it back once, only when it actually changed.
+    """
+
+    def __init__(self, context: dict):
+        self.context = context
+        self.doc_path = Path(context["doc_path"])
+        self._metadata: Optional[dict] = None
+        self._examples = _UNSET
+        self._guide: Optional[str] = None
+        self._saved_guide: Optional[str] = None
+
+    @classmethod
+    def load(cls, context_path: Path) -> "RunArtifacts":
+        return cls(json.loads(context_path.read_text(encoding="utf-8")))
+
+    @property
+    def metadata(self) -> dict:
+        if self._metadata is None:
+            self._metadata = json.loads(Path(self.context["metadata_path"]).read_text(encoding="utf-8"))
+        return self._metadata
+
+    @property
+    def central_examples(self) -> Optional[str]:
+        if self._examples is _UNSET:
+            self._examples = central_examples(self.metadata)
+        return self._examples
+
+    def has_guide(self) -> bool:
+        return self._guide is not None or self.doc_path.is_file()
+
+    @property
+    def guide(self) -> str:
+        if self._guide is None:
+            if not self.doc_path.is_file():
+                raise FileNotFoundError(f"Missing guide: {self.doc_path}")
+            self._guide = self._saved_guide = self.doc_path.read_text(encoding="utf-8")
+        return self._guide
+
+    @guide.setter
+    def guide(self, text: str) -> None:
+        self._guide = text
+
+    def save(self) -> bool:
+        """Write the guide back if a step changed it; returns whether it was written."""
+        if self._guide is None or self._guide == self._saved_guide:
+            return False
+        self.doc_path.write_text(self._guide, encoding="utf-8")
+        self._saved_guide = self._guide
+        return True
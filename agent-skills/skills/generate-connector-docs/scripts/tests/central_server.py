@@ -0,0 +1,84 @@
+"""Local stand-in for the Ballerina Central registry API used by the tests."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CentralStub:
+    """Serve `/2.0/registry/packages/<org>/<package>/<version>` from an in-memory dict.
+
+    Responses carry a content-derived ETag and honour If-None-Match with 304.
+    `requests` records every (path, status) served; `delay` slows every response.
+    `peak_in_flight` is the most requests that were being handled at the same time.
+    """
+
+    def __init__(self, packages: dict[str, dict] | None = None, delay: float = 0.0):
+        self.packages = dict(packages or {})
+        self.delay = delay
+        self.requests: list[tuple[str, int]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802 - http.server naming
+                with stub.lock:
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                try:
+                    self.respond()
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+            def respond(self):
+                time.sleep(stub.delay)
+                key = self.path.removeprefix("/2.0/registry/packages/")
+                payload = stub.packages.get(key)
+                if payload is None:
+                    status, body, headers = 404, b'{"message": "not found"}', {}
+                else:
+                    body = json.dumps(payload).encode("utf-8")
+                    etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                    headers = {"ETag": etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+                    status = 304 if self.headers.get("If-None-Match") == etag else 200
+                with stub.lock:
+                    stub.requests.append((key, status))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/2.0/registry/packages"
+
+    def statuses(self, key: str) -> list[int]:
+        with self.lock:
+            return [status for path, status in self.requests if path == key]
+
+    def __enter__(self) -> "CentralStub":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
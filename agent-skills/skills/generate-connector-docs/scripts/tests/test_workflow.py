@@ -1,14 +1,19 @@
 import base64
 import json
 import re
+import struct
 import subprocess
 import sys
 import tempfile
+import time
 import unittest
+import zlib
 from pathlib import Path
+from unittest.mock import patch
 
 SCRIPTS = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(SCRIPTS))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from append_central_examples import (
     append_central_examples,
@@ -19,14 +24,23 @@ from append_central_examples import (
 from collect_screenshot import collect
 from crop_screenshots import crop_directory
 from inject_try_it_yourself import build_section, build_urls, inject_try_it_yourself
+from png_header import NotPngError, PngHeader, inspect_directory, read_png_header
+from run_artifacts import RunArtifacts
+import prepare_run
 from prepare_run import build_context, central_url, derive_category_from_keywords, parse_coordinate, safe_slug
 from validate_output import BANNED, validate
+from central_server import CentralStub
 
 PNG = base64.b64decode(
     "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNk+A8AAQUBAScY42YAAAAASUVORK5CYII="
 )
 
 
+def png_header_bytes(width, height, bit_depth=8, color_type=6):
+    ihdr = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + ihdr + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+
+
 def valid_document(prefix):
     images = "\n".join(
         "![Milestone {0}](../screenshots/{1}_screenshot_{0:02d}_{2}.png)".format(
@@ -163,6 +177,117 @@ class CoordinateTests(unittest.TestCase):
             self.assertNotIn("Traceback", result.stderr)
 
 
+class CentralCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.cache = Path(self.temp.name) / "cache"
+        self.central = CentralStub({
+            "ballerinax/mysql/1.2.3": {"version": "1.2.3", "readme": "pinned"},
+            "ballerinax/mysql/latest": {"version": "1.2.3", "readme": "pinned"},
+        }).__enter__()
+        patcher = patch.object(prepare_run, "CENTRAL_BASE", self.central.base_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.central.__exit__(None, None, None)
+        self.temp.cleanup()
+
+    def load(self, version, **options):
+        return prepare_run.load_metadata("ballerinax", "mysql", version, cache_dir=self.cache, **options)
+
+    def test_pinned_version_is_fetched_once(self):
+        self.assertEqual(self.load("1.2.3"), ({"version": "1.2.3", "readme": "pinned"}, "network"))
+        self.assertEqual(self.load("1.2.3", ttl_seconds=0), ({"version": "1.2.3", "readme": "pinned"}, "cache"))
+        self.assertEqual(self.central.statuses("ballerinax/mysql/1.2.3"), [200])
+
+    def test_latest_uses_ttl_then_conditional_revalidation(self):
+        self.assertEqual(self.load("latest")[1], "network")
+        self.assertEqual(self.load("latest")[1], "cache")
+        self.assertEqual(self.load("latest", ttl_seconds=0)[1], "revalidated")
+        self.assertEqual(self.central.statuses("ballerinax/mysql/latest"), [200, 304])
+        # Resolving latest also pins the resolved version.
+        self.assertEqual(self.load("1.2.3")[1], "cache")
+        self.assertEqual(self.central.statuses("ballerinax/mysql/1.2.3"), [])
+
+        self.central.packages["ballerinax/mysql/latest"] = {"version": "1.3.0", "readme": "new"}
+        metadata, source = self.load("latest", ttl_seconds=0)
+        self.assertEqual((metadata["version"], source), ("1.3.0", "network"))
+
+    def test_offline_mode_never_contacts_central(self):
+        with self.assertRaisesRegex(RuntimeError, "offline"):
+            self.load("latest", offline=True)
+        self.load("latest")
+        self.assertEqual(self.load("latest", offline=True, ttl_seconds=0)[1], "cache")
+        self.assertEqual(len(self.central.statuses("ballerinax/mysql/latest")), 1)
+
+    def test_unreachable_central_falls_back_to_stale_cache(self):
+        self.load("latest")
+        with patch.object(prepare_run, "CENTRAL_BASE", "http://127.0.0.1:9/2.0/registry/packages"):
+            self.assertEqual(self.load("latest", ttl_seconds=0)[1], "stale-cache")
+
+    def test_missing_package_is_not_cached(self):
+        with self.assertRaisesRegex(RuntimeError, "not found"):
+            prepare_run.load_metadata("ballerinax", "absent", "latest", cache_dir=self.cache)
+        self.assertFalse(prepare_run.cache_entry_path(self.cache, "ballerinax", "absent", "latest").exists())
+
+    def test_cache_entry_path_keeps_every_component_inside_the_cache(self) -> None:
+        path = prepare_run.cache_entry_path(self.cache, "..", "../mysql/x", "1.0.0")
+        self.assertEqual(path.parent.parent.parent, self.cache)
+        self.assertEqual(path.relative_to(self.cache).parts, ("%2E%2E", "..%2Fmysql%2Fx", "1.0.0.json"))
+        self.assertNotEqual(prepare_run.cache_entry_path(self.cache, "ballerinax", "mysql.driver", "1"),
+                            prepare_run.cache_entry_path(self.cache, "ballerinax", "mysql_driver", "1"))
+
+
+class BatchPrepareTests(unittest.TestCase):
+    def test_batch_resolves_concurrently_and_reports_each_coordinate(self):
+        packages = {f"ballerinax/pkg{index}/latest": {"version": f"1.0.{index}"} for index in range(4)}
+        with tempfile.TemporaryDirectory() as temp, CentralStub(packages, delay=0.4) as central, \
+                patch.object(prepare_run, "CENTRAL_BASE", central.base_url):
+            root = Path(temp)
+            results = prepare_run.prepare_batch(
+                ["ballerinax/pkg0", "ballerinax/pkg1", "ballerinax/pkg2", "ballerinax/pkg3",
+                 "ballerinax/missing", "ballerinax/pkg1:1.0.1", "not-a-coordinate"],
+                root, jobs=4, rate=0, cache_dir=root / "cache",
+            )
+
+            # Each lookup holds its request open for 0.4s, so overlapping lookups show up in the stub
+            self.assertGreater(central.peak_in_flight, 1)
+            self.assertLessEqual(central.peak_in_flight, 4)
+            self.assertEqual([result["coordinate"] for result in results][:4],
+                             [f"ballerinax/pkg{index}" for index in range(4)])
+            for index, result in enumerate(results[:4]):
+                context = json.loads(Path(result["context_path"]).read_text(encoding="utf-8"))
+                self.assertEqual(context["resolved_coordinate"], f"ballerinax/pkg{index}:1.0.{index}")
+                self.assertEqual(result["metadata_source"], "network")
+            self.assertIn("not found", results[4]["error"])
+            self.assertIn("Duplicate of ballerinax/pkg1", results[5]["error"])
+            self.assertIn("full Ballerina Central coordinate", results[6]["error"])
+
+    def test_rate_limiter_spaces_requests(self):
+        limiter = prepare_run.RateLimiter(20)
+        started = time.monotonic()
+        for _ in range(5):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+    def test_cli_batch_file_reports_failures_per_coordinate(self):
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            batch = root / "batch.txt"
+            batch.write_text("# catalog refresh\nballerinax/mysql\n\nmysql\n", encoding="utf-8")
+            result = subprocess.run(
+                [sys.executable, str(SCRIPTS / "prepare_run.py"), "--batch-file", str(batch), "--root", str(root),
+                 "--offline", "--cache-dir", str(root / "cache")],
+                capture_output=True, text=True,
+            )
+            self.assertEqual(result.returncode, 1)
+            report = json.loads(result.stdout)
+            self.assertEqual(report["failed"], ["ballerinax/mysql", "mysql"])
+            self.assertIn("offline mode", report["results"][0]["error"])
+            self.assertNotIn("Traceback", result.stderr)
+
+
 class DocsIntegrationTests(unittest.TestCase):
     def test_derives_category_from_area_keyword(self):
         metadata = {"keywords": ["Cost/Paid", "Vendor/HubSpot", "Area/CRM & Sales", "Type/Connector"]}
@@ -555,6 +680,88 @@ class WorkflowTests(unittest.TestCase):
                 )
             )
 
+    def test_run_artifacts_share_parsed_inputs_and_write_guide_once(self):
+        with tempfile.TemporaryDirectory() as temp:
+            context = build_context(
+                "ballerinax/mysql",
+                Path(temp),
+                {"version": "1.2.3", "readme": "# Package\n\n## Examples\n\nUse Central.\n"},
+            )
+            doc = Path(context["doc_path"])
+            doc.write_text("# Example\n", encoding="utf-8")
+            artifacts = RunArtifacts.load(Path(context["context_path"]))
+            self.assertEqual(artifacts.central_examples, "Use Central.")
+            self.assertIs(artifacts.metadata, artifacts.metadata)
+            self.assertFalse(artifacts.save())
+
+            artifacts.guide = artifacts.guide + "\n## More code examples\n\nUse Central.\n"
+            self.assertEqual(doc.read_text(encoding="utf-8"), "# Example\n")
+            errors = validate(context, artifacts=artifacts)
+            self.assertNotIn("More code examples must exactly match the cached Ballerina Central metadata.", errors)
+            self.assertIn("More code examples must exactly match the cached Ballerina Central metadata.", validate(context))
+            self.assertTrue(artifacts.save())
+            self.assertFalse(artifacts.save())
+            self.assertTrue(doc.read_text(encoding="utf-8").endswith("Use Central.\n"))
+
+    def test_finalizer_reruns_only_steps_whose_inputs_changed(self):
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            context = build_context(
+                "ballerinax/mysql",
+                root,
+                {"version": "1.2.3", "readme": "# Package\n\n## Examples\n\nUse Central.\n"},
+            )
+            prefix = context["image_prefix"]
+            source = root / "source.png"
+            source.write_bytes(PNG)
+            for number, suffix in enumerate(
+                ["palette", "connection_form", "connections_list", "operations_panel", "operation_form", "completed_flow"], 1
+            ):
+                collect(source, Path(context["screenshots_dir"]) / f"{prefix}_screenshot_{number:02d}_{suffix}.png")
+            doc = Path(context["doc_path"])
+            doc.write_text(valid_document(prefix), encoding="utf-8")
+            sample = Path(context["sample_dir"])
+            (sample / "Ballerina.toml").write_text("[package]\norg='test'\nname='sample'\nversion='0.1.0'\n", encoding="utf-8")
+            (sample / "main.bal").write_text("public function main() {}\n", encoding="utf-8")
+            run_json = Path(context["run_log_dir"]) / "run.json"
+
+            def finalize(*extra):
+                result = subprocess.run(
+                    [sys.executable, str(SCRIPTS / "finalize_run.py"), "--context", context["context_path"], "--skip-crop", *extra],
+                    capture_output=True,
+                    text=True,
+                )
+                steps = json.loads(run_json.read_text(encoding="utf-8"))["steps"]
+                return result, {name: step["status"] for name, step in steps.items()}
+
+            result, statuses = finalize()
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(statuses["validate"], "ran")
+
+            result, statuses = finalize()
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(
+                statuses,
+                {"try_it_yourself": "cached", "central_examples": "cached", "crop": "skipped", "validate": "cached"},
+            )
+            self.assertTrue(json.loads(run_json.read_text(encoding="utf-8"))["central_examples_found"])
+
+            doc.write_text(doc.read_text(encoding="utf-8").replace("Select **Save**.", "Click **Save**.", 1), encoding="utf-8")
+            result, statuses = finalize()
+            self.assertEqual(result.returncode, 1)
+            self.assertIn("nonpreferred UI terminology", result.stderr)
+            self.assertEqual(statuses["validate"], "ran")
+            result, statuses = finalize()
+            self.assertEqual(statuses["validate"], "cached")
+            self.assertIn("nonpreferred UI terminology", result.stderr)
+
+            (sample / "main.bal").write_text("public function main() {}\n// edited\n", encoding="utf-8")
+            doc.write_text(doc.read_text(encoding="utf-8").replace("Click **Save**.", "Select **Save**.", 1), encoding="utf-8")
+            result, statuses = finalize()
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(statuses["try_it_yourself"], "ran")
+            self.assertEqual(finalize("--force")[1]["central_examples"], "ran")
+
     def test_validator_rejects_template_and_style_leaks(self):
         with tempfile.TemporaryDirectory() as temp:
             root = Path(temp)
@@ -577,6 +784,89 @@ class WorkflowTests(unittest.TestCase):
             self.assertTrue(any("template placeholders" in error for error in errors))
             self.assertTrue(any("nonpreferred UI terminology" in error for error in errors))
 
+    def test_validator_checks_every_run_and_reports_rule_timings(self):
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            source = root / "source.png"
+            source.write_bytes(PNG)
+            contexts = []
+            for coordinate in ("ballerinax/mysql", "ballerinax/redis"):
+                context = build_context(coordinate, root, {"version": "1.2.3", "readme": ""})
+                prefix = context["image_prefix"]
+                for number, suffix in enumerate(
+                    ["palette", "connection_form", "connections_list", "operations_panel", "operation_form", "completed_flow"], 1
+                ):
+                    collect(source, Path(context["screenshots_dir"]) / f"{prefix}_screenshot_{number:02d}_{suffix}.png")
+                Path(context["doc_path"]).write_text(valid_document(prefix), encoding="utf-8")
+                sample = Path(context["sample_dir"])
+                (sample / "Ballerina.toml").write_text("[package]\norg='test'\nname='sample'\nversion='0.1.0'\n", encoding="utf-8")
+                (sample / "main.bal").write_text("public function main() {}\n", encoding="utf-8")
+                inject_try_it_yourself(Path(context["doc_path"]), sample, context["sample_name"])
+                contexts.append(context)
+            broken = Path(contexts[1]["doc_path"])
+            broken.write_text(broken.read_text(encoding="utf-8").replace("Select **Save**.", "Click **Save**.", 1), encoding="utf-8")
+
+            timings = {}
+            self.assertEqual(validate(contexts[0], timings), [])
+            self.assertIn("parse", timings)
+            self.assertIn("banned-content", timings)
+
+            result = subprocess.run(
+                [sys.executable, str(SCRIPTS / "validate_output.py"), "--runs-dir", str(root / "artifacts"),
+                 "--jobs", "2", "--timings"],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 1, result.stderr)
+            report = json.loads(result.stdout)
+            self.assertEqual(len(report["runs"]), 2)
+            self.assertEqual(report["failed"], [contexts[1]["context_path"]])
+            self.assertTrue(all("steps" in run["timings"] for run in report["runs"]))
+
+    def test_png_header_inspection_reads_ihdr_without_decoding(self):
+        with tempfile.TemporaryDirectory() as temp:
+            directory = Path(temp)
+            (directory / "a.png").write_bytes(PNG)
+            # Header-only file: no IDAT, so any attempt to decode it would fail
+            (directory / "b.png").write_bytes(png_header_bytes(1720, 918) + b"\0" * 64)
+            (directory / "c.png").write_bytes(b"GIF89a" + b"\0" * 40)
+            corrupt = bytearray(png_header_bytes(10, 10))
+            corrupt[20] ^= 0xFF
+            (directory / "d.png").write_bytes(bytes(corrupt))
+            (directory / "e.png").write_bytes(png_header_bytes(10, 10, bit_depth=3, color_type=2))
+            results = inspect_directory(directory, jobs=4)
+            self.assertEqual([path.name for path, _, _ in results], ["a.png", "b.png", "c.png", "d.png", "e.png"])
+            self.assertEqual(results[0][1], PngHeader(1, 1, 8, 4))
+            self.assertEqual(results[1][1], PngHeader(1720, 918, 8, 6))
+            self.assertIsInstance(results[2][2], NotPngError)
+            self.assertIn("checksum", str(results[3][2]))
+            self.assertIn("bit depth", str(results[4][2]))
+            with self.assertRaises(ValueError):
+                read_png_header(directory / "c.png")
+            with self.assertRaisesRegex(ValueError, "not a PNG"):
+                collect(directory / "c.png", directory / "out" / "mysql_screenshot_01_palette.png")
+
+    def test_validator_rejects_screenshots_larger_than_viewport(self):
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            context = build_context("ballerinax/mysql", root, {"version": "1.2.3", "readme": ""})
+            self.assertEqual(context["screenshot_viewport"], [1720, 968])
+            prefix = context["image_prefix"]
+            suffixes = ["palette", "connection_form", "connections_list", "operations_panel", "operation_form", "completed_flow"]
+            for number, suffix in enumerate(suffixes, 1):
+                height = 4000 if number == 6 else 918
+                Path(context["screenshots_dir"], f"{prefix}_screenshot_{number:02d}_{suffix}.png").write_bytes(
+                    png_header_bytes(1720, height)
+                )
+            Path(context["doc_path"]).write_text(valid_document(prefix), encoding="utf-8")
+            sample = Path(context["sample_dir"])
+            (sample / "Ballerina.toml").write_text("[package]\norg='test'\nname='sample'\nversion='0.1.0'\n", encoding="utf-8")
+            (sample / "main.bal").write_text("public function main() {}\n", encoding="utf-8")
+            inject_try_it_yourself(Path(context["doc_path"]), sample, context["sample_name"])
+            errors = validate(context)
+            self.assertEqual(len(errors), 1, errors)
+            self.assertIn("_screenshot_06_completed_flow.png is 1720x4000", errors[0])
+
     def test_ui_terminology_distinguishes_verbs_from_nouns(self):
         pattern = BANNED["nonpreferred UI terminology"]
         for text in ("data type", "operation input", "input parameter"):
@@ -638,6 +928,34 @@ class WorkflowTests(unittest.TestCase):
             with Image.open(valid) as image:
                 self.assertEqual(image.size, (100, 80))
 
+    def test_crop_runs_in_parallel_and_reports_bytes_saved(self):
+        try:
+            from PIL import Image
+        except ImportError:
+            self.skipTest("Pillow is not installed")
+        with tempfile.TemporaryDirectory() as temp:
+            screenshots = Path(temp)
+            for number in range(1, 4):
+                Image.new("RGB", (120, 90), "white").save(screenshots / f"{number:02d}.png", compress_level=0)
+                (screenshots / f"{number:02d}.png").chmod(0o644)
+            sizes = {}
+            self.assertEqual(crop_directory(screenshots, jobs=2, sizes=sizes), 3)
+            self.assertEqual(sorted(sizes), ["01.png", "02.png", "03.png"])
+            self.assertTrue(all(after < before for before, after in sizes.values()))
+            self.assertEqual(sorted(path.name for path in screenshots.iterdir()), ["01.png", "02.png", "03.png"])
+            if sys.platform != "win32":
+                self.assertEqual((screenshots / "01.png").stat().st_mode & 0o777, 0o644)
+            with Image.open(screenshots / "03.png") as image:
+                self.assertEqual(image.size, (120, 40))
+
+            result = subprocess.run(
+                [sys.executable, str(SCRIPTS / "crop_screenshots.py"), str(screenshots), "--top", "0", "--bottom", "10"],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertRegex(result.stdout, r"Cropped 3 screenshot\(s\); \d+ -> \d+ bytes \(-?\d+ saved\)\.")
+
     def test_central_examples_cli_writes_sandbox_markdown(self):
         with tempfile.TemporaryDirectory() as temp:
             context = build_context(
@@ -1,19 +1,30 @@
 #!/usr/bin/env python3
-"""Validate a generated connector guide, screenshots, and sample project."""
+"""Validate a generated connector guide, screenshots, and sample project.
+
+The guide is parsed once into a GuideIndex (headings, H2 sections with line
+offsets, fences, bullets, and table rows); every check is a rule registered with
+@rule that runs against that index with precompiled patterns. --timings reports
+the time spent in each rule, and --runs-dir validates every run under a
+directory in parallel.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-from append_central_examples import examples_from_metadata
 from inject_try_it_yourself import build_section, build_urls
+from png_header import NotPngError, inspect_pngs
+from run_artifacts import RunArtifacts
 
-PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 BANNED = {
     "code-server": re.compile(r"code-server", re.I),
     "localhost": re.compile(r"localhost|127\.0\.0\.1", re.I),
@@ -65,35 +76,182 @@ def h2_kind(heading: str) -> Optional[str]:
     return None
 
 
-def validate(context: dict) -> list[str]:
-    errors: list[str] = []
-    doc_path = Path(context["doc_path"])
-    screenshots_dir = Path(context["screenshots_dir"])
-    sample_dir = Path(context["sample_dir"])
-    if not doc_path.is_file():
-        return [f"Missing guide: {doc_path}"]
-    text = doc_path.read_text(encoding="utf-8")
-    authored_text = re.split(r"^## Try it yourself\s*$", text, maxsplit=1, flags=re.M)[0]
-    if not text.startswith("# Example\n"):
-        errors.append("The guide must start at byte zero with '# Example'.")
-    if re.search(r"\{\{[A-Z0-9_]+\}\}|<!--", authored_text):
-        errors.append("Guide contains unresolved template placeholders or template comments.")
-
-    all_headings = re.findall(r"^(#{1,3}) (.+)$", authored_text, re.M)
-    punctuated = [heading for _, heading in all_headings if heading.endswith(".")]
+HEADING_RE = re.compile(r"^(#{1,3}) (.+)$")
+TRY_SPLIT_RE = re.compile(r"^## Try it yourself\s*$", re.M)
+FENCE_RE = re.compile(r"^```([^\n]*)$")
+PLACEHOLDER_RE = re.compile(r"\{\{[A-Z0-9_]+\}\}|<!--")
+WORD_RE = re.compile(r"[A-Za-z]+")
+STEP_PREFIX_RE = re.compile(r"^Step \d+:\s*")
+STEP_HEADING_RE = re.compile(r"^Step (\d+): .+$")
+SCREENSHOT_NUMBER_RE = re.compile(r"_screenshot_(\d{2})_")
+MERMAID_RE = re.compile(r"```mermaid\nflowchart LR\n.+?\n```\s*", re.S)
+NODE_ID_RE = re.compile(r"\b([A-Za-z][A-Za-z0-9_]*)\s*(?=\[|\(|\{)")
+USER_NODE_RE = re.compile(r"\bA\(\(User\)\)\s*-->")
+CONNECTOR_NODE_RE = re.compile(r"\bC\[[^\]\n]+ Connector\]", re.I)
+CONFIGURABLES_STEP_RE = re.compile(r"^### Step \d+: Set actual values for your configurables$", re.M)
+BULLET_RE = re.compile(r"^- \*\*[^*]+\*\*(?: \(`[^`]+`\))? : \S")
+TABLE_RE = re.compile(r"^\|.+\|\s*$")
+IMAGE_RE = re.compile(r"!\[[^\]]+\]\(([^)]+)\)")
+EXPECTED_SETUP = (
+    "> **New to WSO2 Integrator?** Follow the [Create a New Integration]"
+    "(../../../../develop/create-integrations/create-a-new-integration.md) guide to set up "
+    "your integration first, then return here to add the connector."
+)
+EXPECTED_NUMBERS = [f"{number:02d}" for number in range(1, 7)]
+
+
+@dataclass
+class Heading:
+    level: int
+    title: str
+    line: int
+    start: int
+    end: int
+
+
+@dataclass
+class Section:
+    heading: Heading
+    kind: Optional[str]
+    body_start: int
+    body_end: int
+    # The section is followed by another H2 (rather than running to the end of the guide)
+    terminated: bool
+    # The heading is followed by a blank line, as every canonical section is
+    spaced: bool
+
+
+@dataclass
+class GuideIndex:
+    text: str
+    authored_end: int
+    headings: list[Heading] = field(default_factory=list)
+    sections: list[Section] = field(default_factory=list)
+    fences: list[str] = field(default_factory=list)
+    bullets: list[str] = field(default_factory=list)
+    has_table: bool = False
+
+    @classmethod
+    def parse(cls, text: str) -> "GuideIndex":
+        split = TRY_SPLIT_RE.search(text)
+        index = cls(text=text, authored_end=split.start() if split else len(text))
+        offset = 0
+        h2: list[Heading] = []
+        for number, line in enumerate(text.splitlines(keepends=True)):
+            stripped = line.rstrip("\n")
+            authored = offset < index.authored_end
+            match = HEADING_RE.match(stripped)
+            if match:
+                heading = Heading(len(match.group(1)), match.group(2), number, offset, offset + len(line))
+                index.headings.append(heading)
+                if heading.level == 2:
+                    h2.append(heading)
+            if authored:
+                fence = FENCE_RE.match(stripped)
+                if fence:
+                    index.fences.append(fence.group(1))
+                elif stripped.startswith("- **"):
+                    index.bullets.append(stripped)
+                elif TABLE_RE.match(stripped):
+                    index.has_table = True
+            offset += len(line)
+        for position, heading in enumerate(h2):
+            following = h2[position + 1] if position + 1 < len(h2) else None
+            spaced = text.startswith("\n", heading.end) and text[heading.end - 1:heading.end] == "\n"
+            index.sections.append(Section(
+                heading=heading,
+                kind=h2_kind(heading.title),
+                body_start=heading.end + 1 if spaced else heading.end,
+                body_end=following.start if following else len(text),
+                terminated=following is not None,
+                spaced=spaced,
+            ))
+        return index
+
+    @property
+    def authored_text(self) -> str:
+        return self.text[:self.authored_end]
+
+    @property
+    def authored_headings(self) -> list[Heading]:
+        return [heading for heading in self.headings if heading.start < self.authored_end]
+
+    def section(self, kind: str, authored: bool = False, terminated: bool = True) -> Optional[str]:
+        """Body of the first spaced H2 section of `kind`, or None.
+
+        With `terminated`, the section must be followed by another H2 heading. With
+        `authored`, the section body is clipped to the authored part of the guide.
+        """
+        limit = self.authored_end if authored else len(self.text)
+        for section in self.sections:
+            if section.kind != kind or not section.spaced or section.heading.start >= limit:
+                continue
+            end = min(section.body_end, limit)
+            if terminated and (not section.terminated or section.body_end > limit):
+                continue
+            return self.text[section.body_start:end]
+        return None
+
+
+@dataclass
+class RuleContext:
+    context: dict
+    artifacts: RunArtifacts
+    guide: GuideIndex
+    doc_path: Path
+    screenshots_dir: Path
+    sample_dir: Path
+
+
+Rule = Callable[[RuleContext], list]
+RULES: list[tuple[str, Rule]] = []
+
+
+def rule(name: str) -> Callable[[Rule], Rule]:
+    """Register a check; rules run in registration order and return error messages."""
+
+    def register(function: Rule) -> Rule:
+        RULES.append((name, function))
+        return function
+
+    return register
+
+
+@rule("title")
+def check_title(run: RuleContext) -> list[str]:
+    if not run.guide.text.startswith("# Example\n"):
+        return ["The guide must start at byte zero with '# Example'."]
+    return []
+
+
+@rule("placeholders")
+def check_placeholders(run: RuleContext) -> list[str]:
+    if PLACEHOLDER_RE.search(run.guide.authored_text):
+        return ["Guide contains unresolved template placeholders or template comments."]
+    return []
+
+
+@rule("heading-style")
+def check_heading_style(run: RuleContext) -> list[str]:
+    errors = []
+    headings = [heading.title for heading in run.guide.authored_headings]
+    punctuated = [heading for heading in headings if heading.endswith(".")]
     if punctuated:
         errors.append(f"Headings must not end with periods: {', '.join(punctuated)}")
-    bad_case: list[str] = []
-    for _, heading in all_headings:
-        title = re.sub(r"^Step \d+:\s*", "", heading)
-        words = re.findall(r"[A-Za-z]+", title)
-        if any(word in GENERIC_HEADING_WORDS for word in words[1:]):
-            bad_case.append(heading)
+    bad_case = [
+        heading for heading in headings
+        if any(word in GENERIC_HEADING_WORDS for word in WORD_RE.findall(STEP_PREFIX_RE.sub("", heading))[1:])
+    ]
     if bad_case:
         errors.append(f"Headings must use sentence case: {', '.join(bad_case)}")
+    return errors
+
 
-    headings = re.findall(r"^## (.+)$", text, re.M)
-    kinds = [h2_kind(heading) for heading in headings]
+@rule("section-order")
+def check_section_order(run: RuleContext) -> list[str]:
+    errors = []
+    headings = [section.heading.title for section in run.guide.sections]
+    kinds = [section.kind for section in run.guide.sections]
     if any(kind is None for kind in kinds):
         unknown = [heading for heading, kind in zip(headings, kinds) if kind is None]
         errors.append(f"Unexpected H2 section(s): {', '.join(unknown)}")
@@ -114,125 +272,245 @@ def validate(context: dict) -> list[str]:
         follows_try = "try" in kinds and kinds.index("examples") == kinds.index("try") + 1
         if kinds[-1] != "examples" or not follows_try:
             errors.append("More code examples must immediately follow Try it yourself as the final H2 section.")
+    return errors
+
 
-    expected_examples = examples_from_metadata(Path(context["metadata_path"]))
-    examples_match = re.search(r"^## More code examples\n\n(?P<body>.*)\Z", text, re.M | re.S)
-    if expected_examples is None and examples_match:
-        errors.append("Guide contains More code examples but Central metadata has no examples.")
-    elif expected_examples is not None:
-        if not examples_match or examples_match.group("body").strip() != expected_examples:
-            errors.append("More code examples must exactly match the cached Ballerina Central metadata.")
+@rule("central-examples")
+def check_central_examples(run: RuleContext) -> list[str]:
+    expected_examples = run.artifacts.central_examples
+    body = None
+    for section in run.guide.sections:
+        if section.heading.title == "More code examples" and section.spaced:
+            # The examples body runs to the end of the guide, by construction
+            body = run.guide.text[section.body_start:]
+            break
+    if expected_examples is None and body is not None:
+        return ["Guide contains More code examples but Central metadata has no examples."]
+    if expected_examples is not None and (body is None or body.strip() != expected_examples):
+        return ["More code examples must exactly match the cached Ballerina Central metadata."]
+    return []
 
-    try_match = re.search(r"^## Try it yourself\n\n(?P<body>.*?)(?=^## |\Z)", text, re.M | re.S)
+
+@rule("try-it-yourself")
+def check_try_it_yourself(run: RuleContext) -> list[str]:
+    errors = []
+    body = run.guide.section("try", terminated=False)
     try:
-        expected_try = build_section(context["sample_name"])
-        build_urls(context["sample_name"])
+        expected_try = build_section(run.context["sample_name"])
+        build_urls(run.context["sample_name"])
     except ValueError as exc:
         expected_try = ""
         errors.append(str(exc))
-    actual_try = "## Try it yourself\n\n" + try_match.group("body").strip() if try_match else ""
+    actual_try = "## Try it yourself\n\n" + body.strip() if body is not None else ""
     if actual_try != expected_try:
         errors.append("Try it yourself section or its deterministic links are invalid.")
-    if sample_dir.name != context["sample_name"]:
+    if run.sample_dir.name != run.context["sample_name"]:
         errors.append("Sample directory name must exactly match context sample_name.")
+    return errors
 
-    setup_match = re.search(
-        r"^## Setting up the .+ integration\n\n(?P<body>.*?)(?=^## )", text, re.M | re.S
-    )
-    expected_setup = (
-        "> **New to WSO2 Integrator?** Follow the [Create a New Integration]"
-        "(../../../../develop/create-integrations/create-a-new-integration.md) guide to set up "
-        "your integration first, then return here to add the connector."
-    )
-    if not setup_match or setup_match.group("body").strip() != expected_setup:
-        errors.append("The fixed Setting up blockquote is missing or changed.")
 
-    fences = re.findall(r"^```([^\n]*)$", authored_text, re.M)
-    if fences != ["mermaid", ""]:
+@rule("setup-blockquote")
+def check_setup_blockquote(run: RuleContext) -> list[str]:
+    body = run.guide.section("setup")
+    if body is None or body.strip() != EXPECTED_SETUP:
+        return ["The fixed Setting up blockquote is missing or changed."]
+    return []
+
+
+@rule("architecture")
+def check_architecture(run: RuleContext) -> list[str]:
+    errors = []
+    if run.guide.fences != ["mermaid", ""]:
         errors.append("The only fenced block must be one Mermaid architecture block.")
-    architecture_match = re.search(r"^## Architecture\n\n(.*?)(?=^## )", text, re.M | re.S)
-    if not architecture_match or not re.fullmatch(
-        r"```mermaid\nflowchart LR\n.+?\n```\s*", architecture_match.group(1), re.S
-    ):
+    diagram = run.guide.section("architecture")
+    if diagram is None or not MERMAID_RE.fullmatch(diagram):
         errors.append("Architecture must contain only one Mermaid flowchart LR block.")
-    elif architecture_match:
-        diagram = architecture_match.group(1)
-        node_ids = set(re.findall(r"\b([A-Za-z][A-Za-z0-9_]*)\s*(?=\[|\(|\{)", diagram))
-        if len(node_ids) < 4:
-            errors.append("Architecture must contain at least four nodes.")
-        if not re.search(r"\bA\(\(User\)\)\s*-->", diagram):
-            errors.append("Architecture must begin with A((User)).")
-        if not re.search(r"\bC\[[^\]\n]+ Connector\]", diagram, re.I):
-            errors.append("Architecture must use the third node for the connector.")
-        if r"\n" in diagram:
-            errors.append("Architecture node labels must not contain literal \\n sequences.")
-
-    steps = [int(value) for value in re.findall(r"^### Step (\d+): .+$", authored_text, re.M)]
+        return errors
+    if len(set(NODE_ID_RE.findall(diagram))) < 4:
+        errors.append("Architecture must contain at least four nodes.")
+    if not USER_NODE_RE.search(diagram):
+        errors.append("Architecture must begin with A((User)).")
+    if not CONNECTOR_NODE_RE.search(diagram):
+        errors.append("Architecture must use the third node for the connector.")
+    if r"\n" in diagram:
+        errors.append("Architecture node labels must not contain literal \\n sequences.")
+    return errors
+
+
+@rule("steps")
+def check_steps(run: RuleContext) -> list[str]:
+    steps = [
+        int(match.group(1))
+        for heading in run.guide.authored_headings
+        if heading.level == 3 and (match := STEP_HEADING_RE.match(heading.title))
+    ]
     if not steps or steps != list(range(1, len(steps) + 1)):
-        errors.append(f"Step headings must be sequential from 1; found {steps}.")
+        return [f"Step headings must be sequential from 1; found {steps}."]
+    return []
 
-    connection_match = re.search(
-        r"^## Configuring the .+ connection\n\n(?P<body>.*?)(?=^## )", authored_text, re.M | re.S
-    )
-    if not connection_match or not re.search(
-        r"^### Step \d+: Set actual values for your configurables$", connection_match.group("body"), re.M
-    ):
-        errors.append("Connection section must include 'Set actual values for your configurables'.")
-    elif "**Configurations**" not in connection_match.group("body") or "**Data Mappers**" not in connection_match.group("body"):
-        errors.append("Configurations step must direct readers to Configurations under Data Mappers.")
-
-    for line in re.findall(r"^- \*\*[^\n]+$", authored_text, re.M):
-        if not re.match(r"^- \*\*[^*]+\*\*(?: \(`[^`]+`\))? : \S", line):
-            errors.append(f"Invalid parameter/configurable bullet format: {line}")
-
-    for label, pattern in BANNED.items():
-        if pattern.search(authored_text):
-            errors.append(f"Guide contains forbidden {label} content.")
-    if re.search(r"^\|.+\|\s*$", authored_text, re.M):
+
+@rule("configurables")
+def check_configurables(run: RuleContext) -> list[str]:
+    body = run.guide.section("connection", authored=True)
+    if body is None or not CONFIGURABLES_STEP_RE.search(body):
+        return ["Connection section must include 'Set actual values for your configurables'."]
+    if "**Configurations**" not in body or "**Data Mappers**" not in body:
+        return ["Configurations step must direct readers to Configurations under Data Mappers."]
+    return []
+
+
+@rule("bullets")
+def check_bullets(run: RuleContext) -> list[str]:
+    return [
+        f"Invalid parameter/configurable bullet format: {line}"
+        for line in run.guide.bullets
+        if not BULLET_RE.match(line)
+    ]
+
+
+@rule("banned-content")
+def check_banned_content(run: RuleContext) -> list[str]:
+    authored_text = run.guide.authored_text
+    errors = [f"Guide contains forbidden {label} content." for label, pattern in BANNED.items()
+              if pattern.search(authored_text)]
+    if run.guide.has_table:
         errors.append("Markdown tables are not allowed in the guide.")
+    return errors
+
 
-    image_refs = re.findall(r"!\[[^\]]+\]\(([^)]+)\)", authored_text)
-    screenshot_refs = [ref for ref in image_refs if ref.startswith("../screenshots/")]
-    expected_numbers = [f"{number:02d}" for number in range(1, 7)]
+@rule("screenshot-references")
+def check_screenshot_references(run: RuleContext) -> list[str]:
+    errors = []
+    screenshot_refs = [ref for ref in IMAGE_RE.findall(run.guide.authored_text) if ref.startswith("../screenshots/")]
     actual_numbers = []
+    screenshots_dir = run.screenshots_dir.resolve()
     for ref in screenshot_refs:
-        match = re.search(r"_screenshot_(\d{2})_", ref)
+        match = SCREENSHOT_NUMBER_RE.search(ref)
         if match:
             actual_numbers.append(match.group(1))
-        resolved = (doc_path.parent / ref).resolve()
-        if resolved.parent != screenshots_dir.resolve() or not resolved.is_file():
+        resolved = (run.doc_path.parent / ref).resolve()
+        if resolved.parent != screenshots_dir or not resolved.is_file():
             errors.append(f"Broken or unsafe screenshot reference: {ref}")
-    if actual_numbers != expected_numbers or len(screenshot_refs) != 6:
+    if actual_numbers != EXPECTED_NUMBERS or len(screenshot_refs) != 6:
         errors.append(f"Guide must reference screenshots 01-06 exactly once; found {actual_numbers}.")
+    return errors
+
 
-    pngs = sorted(screenshots_dir.glob("*.png"))
+@rule("screenshot-files")
+def check_screenshot_files(run: RuleContext) -> list[str]:
+    errors = []
+    pngs = sorted(run.screenshots_dir.glob("*.png"))
     file_numbers = []
-    for png in pngs:
-        match = re.search(r"_screenshot_(\d{2})_", png.name)
+    viewport = run.context.get("screenshot_viewport")
+    for png, header, error in inspect_pngs(pngs):
+        match = SCREENSHOT_NUMBER_RE.search(png.name)
         if match:
             file_numbers.append(match.group(1))
-        if png.read_bytes()[:8] != PNG_SIGNATURE:
+        if isinstance(error, NotPngError):
             errors.append(f"Unreadable PNG signature: {png.name}")
-    if file_numbers != expected_numbers or len(pngs) != 6:
+        elif error:
+            errors.append(f"Unreadable PNG header: {png.name} ({error})")
+        elif viewport and (header.width > viewport[0] or header.height > viewport[1]):
+            errors.append(
+                f"Screenshot {png.name} is {header.width}x{header.height}, larger than the "
+                f"{viewport[0]}x{viewport[1]} capture viewport."
+            )
+    if file_numbers != EXPECTED_NUMBERS or len(pngs) != 6:
         errors.append(f"Screenshot directory must contain only 01-06; found {file_numbers}.")
+    return errors
+
 
-    if not (sample_dir / "Ballerina.toml").is_file():
+@rule("sample-project")
+def check_sample_project(run: RuleContext) -> list[str]:
+    errors = []
+    if not (run.sample_dir / "Ballerina.toml").is_file():
         errors.append("Sample project is missing Ballerina.toml.")
-    if not list(sample_dir.rglob("*.bal")):
+    if not list(run.sample_dir.rglob("*.bal")):
         errors.append("Sample project contains no Ballerina source files.")
     return errors
 
 
+def validate(
+    context: dict,
+    timings: Optional[dict[str, float]] = None,
+    artifacts: Optional[RunArtifacts] = None,
+) -> list[str]:
+    """Run every registered rule; fill `timings` with seconds per rule when given.
+
+    Pass the finalizer's `artifacts` to validate its in-memory guide and reuse its
+    parsed Central metadata instead of reading both from disk again.
+    """
+    artifacts = artifacts or RunArtifacts(context)
+    if not artifacts.has_guide():
+        return [f"Missing guide: {artifacts.doc_path}"]
+    started = time.perf_counter()
+    guide = GuideIndex.parse(artifacts.guide)
+    if timings is not None:
+        timings["parse"] = time.perf_counter() - started
+    run = RuleContext(
+        context, artifacts, guide, artifacts.doc_path, Path(context["screenshots_dir"]), Path(context["sample_dir"])
+    )
+    errors: list[str] = []
+    for name, check in RULES:
+        started = time.perf_counter()
+        errors.extend(check(run))
+        if timings is not None:
+            timings[name] = time.perf_counter() - started
+    return errors
+
+
+def validate_context_file(context_path: str) -> dict:
+    """Validate one run from its context.json; used as the process-pool work item."""
+    timings: dict[str, float] = {}
+    try:
+        context = json.loads(Path(context_path).read_text(encoding="utf-8"))
+        errors = validate(context, timings)
+    except (OSError, json.JSONDecodeError, KeyError) as exc:
+        errors = [f"Could not validate output: {exc}"]
+    return {"context": context_path, "errors": errors, "timings": timings}
+
+
+def validate_runs(runs_dir: Path, jobs: Optional[int] = None) -> list[dict]:
+    """Validate every `<run>/run-log/context.json` below `runs_dir` in parallel."""
+    contexts = sorted(str(path) for path in runs_dir.glob("*/run-log/context.json"))
+    if len(contexts) <= 1:
+        return [validate_context_file(path) for path in contexts]
+    with ProcessPoolExecutor(max_workers=jobs or min(len(contexts), os.cpu_count() or 1)) as pool:
+        return list(pool.map(validate_context_file, contexts))
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    return ", ".join(f"{name} {seconds * 1000:.2f}ms" for name, seconds in
+                     sorted(timings.items(), key=lambda item: item[1], reverse=True))
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--context", required=True, type=Path)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--context", type=Path)
+    target.add_argument("--runs-dir", type=Path, help="Validate every <run>/run-log/context.json below this directory")
+    parser.add_argument("--jobs", type=int, help="Parallel validations with --runs-dir (default: CPU count)")
+    parser.add_argument("--timings", action="store_true", help="Report time spent in each rule")
     args = parser.parse_args()
+    if args.runs_dir:
+        results = validate_runs(args.runs_dir, args.jobs)
+        if not args.timings:
+            for result in results:
+                result.pop("timings")
+        print(json.dumps({
+            "runs": results,
+            "failed": [result["context"] for result in results if result["errors"]],
+        }, indent=2))
+        return 1 if any(result["errors"] for result in results) else 0
+    timings: dict[str, float] = {}
     try:
         context = json.loads(args.context.read_text(encoding="utf-8"))
-        errors = validate(context)
+        errors = validate(context, timings)
     except (OSError, json.JSONDecodeError, KeyError) as exc:
         print(f"[ERROR] Could not validate output: {exc}", file=sys.stderr)
         return 1
+    if args.timings:
+        print(f"Rule timings: {format_timings(timings)}", file=sys.stderr)
     if errors:
         for error in errors:
             print(f"[ERROR] {error}", file=sys.stderr)
@@ -4,64 +4,88 @@ Print a newline-separated list of candidate OpenAPI spec files found in CWD.
 Priority: openapi.yaml/yml/json first, then docs/spec/, then any *.yaml/json
 (max 8 results).
 
-Usage: find_spec_files.py
+Usage: find_spec_files.py [--ignore <dir>[,<dir>...]]
+  --ignore  Extra directory names to prune in addition to IGNORED_DIRS
+
+The tree is walked once with os.scandir; each file is classified into the highest
+priority class it belongs to, and the walk stops as soon as MAX_RESULTS named
+candidates have been found.
 """
 
 import os
-from itertools import chain
+import sys
 
 SPEC_EXTS = (".yaml", ".yml", ".json")
 NAMED_CANDIDATES = {"openapi.yaml", "openapi.yml", "openapi.json"}
-EXCLUDED_ANY = {".git", "node_modules", "target"}
+# Build outputs and tool caches that never hold the source spec but can be huge
+IGNORED_DIRS = {".git", "node_modules", "target", "build", ".gradle", ".venv", "__pycache__"}
+# Searched for named candidates only, never for arbitrary *.yaml/json files
+NAMED_ONLY_DIRS = {".claude"}
+NAMED_MAX_DEPTH = 4
+ANY_MAX_DEPTH = 3
+DOCS_SPEC = ("docs", "spec")
+DOCS_SPEC_MAX_DEPTH = 2
 MAX_RESULTS = 8
 
 
-def walk(root: str, max_depth: int, excluded: set):
-    if not os.path.isdir(root):
-        return
-    for current, dirs, files in os.walk(root):
-        rel = os.path.relpath(current, root)
-        depth = 0 if rel == "." else rel.count(os.sep) + 1
-        if depth >= max_depth:
-            dirs[:] = []
-            continue
-        dirs[:] = sorted(d for d in dirs if d not in excluded)
-        for f in sorted(files):
-            yield os.path.join(current, f)
-
-
-def find_named(cwd: str):
-    for path in walk(cwd, 4, {".git", "node_modules", "target"}):
-        if os.path.basename(path) in NAMED_CANDIDATES:
-            yield path
-
-
-def find_docs_spec(cwd: str):
-    docs_spec = os.path.join(cwd, "docs", "spec")
-    for path in walk(docs_spec, 2, {".git"}):
-        if path.endswith(SPEC_EXTS):
-            yield path
-
-
-def find_any(cwd: str):
-    for path in walk(cwd, 3, EXCLUDED_ANY | {".claude"}):
-        if path.endswith(SPEC_EXTS):
-            yield path
+class EnoughResults(Exception):
+    pass
+
+
+def find_candidates(cwd: str, ignored: set) -> list:
+    named, docs_spec, any_spec = [], [], []
+
+    def visit(directory: str, parts: tuple, any_allowed: bool) -> None:
+        depth = len(parts)
+        in_docs_spec = parts[:2] == DOCS_SPEC and depth - len(DOCS_SPEC) < DOCS_SPEC_MAX_DEPTH
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            return
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                # Like os.walk, list symlinked directories but do not descend into them
+                if entry.name not in ignored and not entry.is_symlink():
+                    subdirs.append(entry)
+                continue
+            if entry.name in NAMED_CANDIDATES:
+                named.append(entry.path)
+                if len(named) >= MAX_RESULTS:
+                    raise EnoughResults
+            elif entry.name.endswith(SPEC_EXTS):
+                if in_docs_spec:
+                    docs_spec.append(entry.path)
+                elif any_allowed and depth < ANY_MAX_DEPTH:
+                    any_spec.append(entry.path)
+        if depth + 1 >= NAMED_MAX_DEPTH:
+            return
+        for entry in subdirs:
+            visit(entry.path, parts + (entry.name,), any_allowed and entry.name not in NAMED_ONLY_DIRS)
+
+    if os.path.isdir(cwd):
+        try:
+            visit(cwd, (), True)
+        except EnoughResults:
+            pass
+    return (named + docs_spec + any_spec)[:MAX_RESULTS]
 
 
 def main() -> None:
-    cwd = os.getcwd()
-    seen = set()
-    results = []
-
-    for candidate in chain(find_named(cwd), find_docs_spec(cwd), find_any(cwd)):
-        if candidate not in seen:
-            seen.add(candidate)
-            results.append(candidate)
-        if len(results) >= MAX_RESULTS:
-            break
-
-    for path in results[:MAX_RESULTS]:
+    arguments = sys.argv[1:]
+    ignored = set(IGNORED_DIRS)
+    if arguments[:1] == ["--ignore"] and len(arguments) == 2:
+        ignored.update(name.strip() for name in arguments[1].split(",") if name.strip())
+    elif arguments:
+        print("Usage: find_spec_files.py [--ignore <dir>[,<dir>...]]", file=sys.stderr)
+        sys.exit(2)
+
+    for path in find_candidates(os.getcwd(), ignored):
         print(path)
 
 
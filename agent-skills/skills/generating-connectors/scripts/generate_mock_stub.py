@@ -7,19 +7,286 @@ Usage: generate_mock_stub.py <spec-path> <ballerina-dir> [operations] [license-p
   license-path  Optional path to a license header file passed to --license
 
 The stub is written to <ballerina-dir>/tests/mock_service.bal
+
+Generated stubs are cached under a key made of the spec content hash, the license
+header, and the bal version. Resource functions are stored per operationId, so a
+rerun with the same spec replays the stub without launching bal, and a rerun with a
+different operation subset only generates the operations that were not seen before.
+Stubs whose resources cannot be matched to operationIds are cached whole, keyed by
+the operation list as well.
+
+Environment:
+  CONNECTOR_MOCK_STUB_CACHE=0            Disable the cache
+  CONNECTOR_MOCK_STUB_CACHE_DIR          Cache location (default <tmp>/bal_mock_stub_cache)
+  CONNECTOR_MOCK_STUB_CACHE_MAX_ENTRIES  Least recently used spec entries beyond this are evicted (default 16)
 """
 
+import hashlib
+import json
 import os
+import re
+import shutil
 import subprocess
 import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from parse_openapi_spec import load_spec  # noqa: E402
+from run_bal_command import positive_int_env, toolchain_fingerprint  # noqa: E402
+
+try:
+    from yaml import YAMLError
+except ImportError:  # load_spec raises ImportError for YAML specs when PyYAML is missing
+    YAMLError = ImportError
+
+# What load_spec raises for a missing, unreadable, or malformed spec
+SPEC_LOAD_ERRORS = (OSError, UnicodeDecodeError, ValueError, ImportError, YAMLError)
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+DEFAULT_CACHE_MAX_ENTRIES = 16
+RESOURCE_PATTERN = re.compile(r"^\s*(?:isolated\s+)?resource\s+function\s+(\S+)\s+([^(]*?)\s*\(")
+IMPORT_PATTERN = re.compile(r"^import\s+([\w.]+/[\w.]+)(?:\s+as\s+(\w+))?\s*;")
 
 
-def run_bal(args: list, cwd: str) -> subprocess.CompletedProcess:
+def run_bal(args: list, cwd: str, capture: bool = False) -> subprocess.CompletedProcess:
     if os.name == "nt":
         # list2cmdline applies Windows quoting rules (paths with spaces etc.);
         # shell=True is needed because bal is a .bat/.cmd shim on Windows
-        return subprocess.run(subprocess.list2cmdline(args), shell=True, cwd=cwd)
-    return subprocess.run(args, shell=False, cwd=cwd)
+        return subprocess.run(subprocess.list2cmdline(args), shell=True, cwd=cwd, capture_output=capture,
+                              text=capture)
+    return subprocess.run(args, shell=False, cwd=cwd, capture_output=capture, text=capture)
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bal_version(cache_dir: str) -> str:
+    """Return `bal version` output, memoized on the toolchain fingerprint (launcher and selected distribution)."""
+    identity = toolchain_fingerprint(["bal"])
+    if not identity:
+        return ""
+    memo = os.path.join(cache_dir, "bal_version.json")
+    try:
+        with open(memo, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("toolchain") == identity:
+            return stored["version"]
+    except (OSError, ValueError, KeyError):
+        pass
+    result = run_bal(["bal", "version"], cwd=os.getcwd(), capture=True)
+    version = result.stdout.strip() if result.returncode == 0 else ""
+    if version:
+        write_json(memo, {"toolchain": identity, "version": version})
+    return version
+
+
+def write_json(path: str, value) -> None:
+    fd, temp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(temp, path)
+
+
+def read_json(path: str, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def spec_operations(spec_path: str) -> list:
+    """
+    Return [(operationId, method, normalized path)] in spec order, or [] if the spec cannot be
+    loaded; the stub is then generated and cached whole rather than per operation.
+    """
+    try:
+        spec = load_spec(spec_path)
+    except SPEC_LOAD_ERRORS as exc:
+        print(f">>> WARNING: could not read operations from {spec_path} ({exc}); "
+              "caching the stub whole instead of per operation", file=sys.stderr)
+        return []
+    operations = []
+    for path, path_item in ((spec or {}).get("paths") or {}).items():
+        if not isinstance(path_item, dict):
+            continue
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if isinstance(operation, dict):
+                segments = tuple("*" if re.fullmatch(r"\{[^}]+\}", segment) else segment
+                                 for segment in path.split("/") if segment)
+                operations.append((operation.get("operationId"), method, segments))
+    return operations
+
+
+def resource_identity(method: str, accessor_path: str) -> tuple:
+    segments = []
+    for segment in accessor_path.split("/"):
+        segment = segment.strip()
+        if not segment or segment == ".":
+            continue
+        segments.append("*" if segment.startswith("[") else segment.replace("\\", "").lstrip("'"))
+    return method.lstrip("'").lower(), tuple(segments)
+
+
+def split_service(text: str):
+    """Split a generated service file into (prelude, [(identity, block)], epilogue)."""
+    lines = text.splitlines(keepends=True)
+    start = next((index for index, line in enumerate(lines) if line.startswith("service ")), None)
+    if start is None or not lines[start].rstrip().endswith("{"):
+        return None
+    blocks, pending, index = [], [], start + 1
+    while index < len(lines):
+        line = lines[index]
+        if line.startswith("}"):
+            return "".join(lines[:start + 1]), blocks, "".join(pending + lines[index:])
+        match = RESOURCE_PATTERN.match(line)
+        if not match:
+            pending.append(line)
+            index += 1
+            continue
+        depth, opened, end = 0, False, index
+        while end < len(lines):
+            depth += lines[end].count("{") - lines[end].count("}")
+            opened = opened or "{" in lines[end]
+            if opened and depth <= 0:
+                break
+            end += 1
+        blocks.append((resource_identity(*match.groups()), "".join(pending + lines[index:end + 1])))
+        pending, index = [], end + 1
+    return None
+
+
+def assemble(prelude: str, blocks: list, epilogue: str) -> str:
+    body = "".join(blocks)
+    lines = []
+    for line in prelude.splitlines(keepends=True):
+        match = IMPORT_PATTERN.match(line)
+        if match:
+            prefix = match.group(2) or match.group(1).rsplit("/", 1)[1].rsplit(".", 1)[-1]
+            if not re.search(rf"\b{re.escape(prefix)}:", body + epilogue) and prefix != "http":
+                continue
+        lines.append(line)
+    return "".join(lines) + body + epilogue
+
+
+def imports_of(text: str) -> list:
+    return [line for line in text.splitlines(keepends=True) if IMPORT_PATTERN.match(line)]
+
+
+def merge_prelude(existing: str, incoming: str) -> str:
+    """Keep the existing prelude but add imports only the incoming generation used."""
+    if not existing:
+        return incoming
+    known = set(imports_of(existing))
+    extra = [line for line in imports_of(incoming) if line not in known]
+    if not extra:
+        return existing
+    lines = existing.splitlines(keepends=True)
+    last_import = max((index for index, line in enumerate(lines) if IMPORT_PATTERN.match(line)), default=-1)
+    return "".join(lines[:last_import + 1] + extra + lines[last_import + 1:])
+
+
+def generate(spec_path: str, operations: list, license_path: str):
+    """Run bal openapi into a scratch directory and return the service file text, or None."""
+    with tempfile.TemporaryDirectory(prefix="mock_stub_") as scratch:
+        # --mode service generates only the service stub, not a client
+        args = ["bal", "openapi", "-i", spec_path, "--mode", "service", "-o", scratch]
+        if operations:
+            print(f">>> Filtering to operations: {','.join(operations)}")
+            args += ["--operations", ",".join(operations)]
+        if license_path:
+            args += ["--license", license_path]
+
+        print(">>> Running bal openapi to generate service stub...")
+        result = run_bal(args, cwd=os.getcwd())
+        if result.returncode != 0:
+            sys.exit(result.returncode)
+
+        # types.bal, client.bal, and utils.bal are left behind in the scratch directory:
+        # the root package types.bal is already in scope for tests
+        services = [name for name in os.listdir(scratch) if name.endswith("_service.bal")]
+        if len(services) != 1:
+            return None
+        with open(os.path.join(scratch, services[0]), "r", encoding="utf-8") as f:
+            return f.read()
+
+
+def evict(cache_dir: str, max_entries: int) -> None:
+    entries = []
+    for entry in os.scandir(cache_dir):
+        store = os.path.join(entry.path, "store.json")
+        if entry.is_dir() and os.path.isfile(store):
+            entries.append((os.path.getmtime(store), entry.path))
+    for _, path in sorted(entries, reverse=True)[max_entries:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def build_stub(spec_path: str, operations: list, license_path: str, cache_dir: str) -> str:
+    version = bal_version(cache_dir)
+    digest = hashlib.sha256()
+    digest.update(file_digest(spec_path).encode("ascii"))
+    digest.update(file_digest(license_path).encode("ascii") if license_path else b"-")
+    digest.update(version.encode("utf-8"))
+    entry = os.path.join(cache_dir, digest.hexdigest())
+    os.makedirs(entry, exist_ok=True)
+    store_path = os.path.join(entry, "store.json")
+    store = read_json(store_path, {"prelude": "", "epilogue": "", "operations": {}, "stubs": {}})
+    selection = ",".join(sorted(operations)) or "*"
+
+    spec_ops = spec_operations(spec_path)
+    by_identity = {(method, segments): operation_id for operation_id, method, segments in spec_ops}
+    ordered = [operation_id for operation_id, _, _ in spec_ops]
+    requested = operations or ordered
+    incremental = bool(spec_ops) and all(ordered) and set(requested) <= set(ordered) and bool(version)
+
+    def finish(text: str, label: str) -> str:
+        if version:
+            write_json(store_path, store)
+            evict(cache_dir, positive_int_env("CONNECTOR_MOCK_STUB_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES))
+        print(f">>> {label}")
+        return text
+
+    def from_store() -> str:
+        wanted = set(requested)
+        blocks = [store["operations"][operation_id] for operation_id in ordered if operation_id in wanted]
+        return assemble(store["prelude"], blocks, store["epilogue"])
+
+    if version and selection in store["stubs"]:
+        return finish(store["stubs"][selection], "[cached] Reused generated stub (spec, operations, license, "
+                                                 "and bal version unchanged)")
+    missing = [operation_id for operation_id in requested if operation_id not in store["operations"]]
+    if incremental and store["prelude"] and not missing:
+        return finish(from_store(), "[cached] Assembled stub from cached resource functions")
+
+    subset = missing if incremental and store["prelude"] else operations
+    if incremental and store["prelude"]:
+        print(f">>> Cached resource functions reused; generating {len(missing)} new operation(s)")
+    text = generate(spec_path, subset, license_path)
+    if text is None:
+        print("ERROR: Expected exactly one *_service.bal file but bal openapi produced none or several.",
+              file=sys.stderr)
+        sys.exit(1)
+    if not version:
+        return text
+
+    parsed = split_service(text) if incremental else None
+    identities = [by_identity.get(identity) for identity, _ in parsed[1]] if parsed else []
+    if parsed and all(identities) and len(set(identities)) == len(identities):
+        prelude, blocks, epilogue = parsed
+        store["prelude"] = merge_prelude(store["prelude"], prelude)
+        store["epilogue"] = store["epilogue"] or epilogue
+        for operation_id, (_, block) in zip(identities, blocks):
+            store["operations"][operation_id] = block
+        if all(operation_id in store["operations"] for operation_id in requested):
+            return finish(from_store(), "Cached resource functions for reuse by later runs")
+    store["stubs"][selection] = text
+    return finish(text, "Cached generated stub for reuse by later runs")
 
 
 def main() -> None:
@@ -34,39 +301,26 @@ def main() -> None:
     ballerina_dir = sys.argv[2]
     operations = sys.argv[3] if len(sys.argv) > 3 else ""
     license_path = sys.argv[4] if len(sys.argv) > 4 else ""
+    selected = [operation.strip() for operation in operations.split(",") if operation.strip()]
 
     tests_dir = os.path.join(ballerina_dir, "tests")
     os.makedirs(tests_dir, exist_ok=True)
-
-    # --mode service generates only the service stub, not a client
-    args = ["bal", "openapi", "-i", spec_path, "--mode", "service", "-o", tests_dir]
-    if operations:
-        print(f">>> Filtering to operations: {operations}")
-        args += ["--operations", operations]
-    if license_path:
-        args += ["--license", license_path]
-
-    print(">>> Running bal openapi to generate service stub...")
-    result = run_bal(args, cwd=os.getcwd())
-    if result.returncode != 0:
-        sys.exit(result.returncode)
-
-    service_file = os.path.join(tests_dir, "aligned_ballerina_openapi_service.bal")
     mock_file = os.path.join(tests_dir, "mock_service.bal")
 
-    if not os.path.isfile(service_file):
-        print(f"ERROR: Expected {service_file} but it was not generated.", file=sys.stderr)
-        sys.exit(1)
-
-    os.replace(service_file, mock_file)
-    print(">>> Renamed aligned_ballerina_openapi_service.bal → mock_service.bal")
-
-    # Remove generated types.bal and client.bal — root package types.bal is already in scope
-    for name in ("types.bal", "client.bal", "utils.bal"):
-        path = os.path.join(tests_dir, name)
-        if os.path.isfile(path):
-            os.remove(path)
+    if os.environ.get("CONNECTOR_MOCK_STUB_CACHE", "1") == "0":
+        text = generate(spec_path, selected, license_path)
+        if text is None:
+            print("ERROR: Expected exactly one *_service.bal file but bal openapi produced none or several.",
+                  file=sys.stderr)
+            sys.exit(1)
+    else:
+        cache_dir = os.environ.get("CONNECTOR_MOCK_STUB_CACHE_DIR") or os.path.join(tempfile.gettempdir(),
+                                                                                   "bal_mock_stub_cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        text = build_stub(spec_path, selected, license_path, cache_dir)
 
+    with open(mock_file, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
     print(f"✓ Stub written: {mock_file}")
 
 
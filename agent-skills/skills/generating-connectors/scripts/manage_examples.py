@@ -1,20 +1,34 @@
 #!/usr/bin/env python3
-"""Safely identify and clean generated example packages.
+"""Safely identify, clean, and build-verify generated example packages.
 
 Only immediate subdirectories containing both main.bal and Ballerina.toml are
 considered generated use-case examples. Other user content is untouched.
+
+`verify` runs `bal build` on every example concurrently (bounded by --jobs),
+each with its own temporary --target-dir, and reports the parse_errors.py view of
+every failing build in one JSON result.
 """
 
 from __future__ import annotations
 
 import json
+import os
 import shutil
+import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from uuid import uuid4
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from parse_errors import PLAIN_ERROR, parse  # noqa: E402
+from run_bal_command import DEFAULT_TIMEOUT_SECONDS, positive_int_env  # noqa: E402
+
 
 QUARANTINE_PREFIX = ".generated-examples-quarantine-"
+DEFAULT_JOBS = 4
 
 
 def examples(root: Path) -> list[Path]:
@@ -128,8 +142,62 @@ def cleanup(root: Path) -> None:
     raise SystemExit(0 if not failures else 1)
 
 
+def build_example(example: Path, timeout_seconds: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix=f"example_target_{example.name}_") as target:
+        args = ["bal", "build", "--target-dir", target]
+        started = time.monotonic()
+        try:
+            if os.name == "nt":
+                # bal is a .bat/.cmd shim on Windows
+                result = subprocess.run(subprocess.list2cmdline(args), shell=True, cwd=example,
+                                        capture_output=True, text=True, timeout=timeout_seconds)
+            else:
+                result = subprocess.run(args, shell=False, cwd=example, capture_output=True, text=True,
+                                        timeout=timeout_seconds)
+            exit_code, stderr = result.returncode, result.stderr
+        except subprocess.TimeoutExpired:
+            exit_code, stderr = 124, f"Command timed out after {timeout_seconds} seconds."
+        except OSError as exc:
+            exit_code, stderr = 127, f"Failed to start bal: {exc}"
+    outcome = {"name": example.name, "exit_code": exit_code, "passed": exit_code == 0,
+               "duration_seconds": round(time.monotonic() - started, 1)}
+    if exit_code != 0:
+        errors = parse(stderr)
+        outcome["errors"] = errors
+        if not errors and (PLAIN_ERROR.search(stderr) or stderr.strip()):
+            outcome["unparsed_stderr"] = stderr.strip()[-4000:]
+    return outcome
+
+
+def verify(root: Path, jobs: int) -> None:
+    failures = reconcile_quarantines(root)
+    found = examples(root)
+    timeout_seconds = positive_int_env("CONNECTOR_BAL_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(found) or 1))) as pool:
+        results = list(pool.map(lambda example: build_example(example, timeout_seconds), found))
+    failed = [item["name"] for item in results if not item["passed"]]
+    result = {"examples": results, "count": len(results), "failed": failed,
+              "duration_seconds": round(time.monotonic() - started, 1)}
+    if failures:
+        result.update({"failures": failures, "complete": False})
+    print(json.dumps(result, indent=2))
+    if failed or failures:
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 3 or sys.argv[1] not in {"scan", "cleanup"}:
-        print(f"Usage: {sys.argv[0]} <scan|cleanup> <examples-dir>", file=sys.stderr)
+    arguments = sys.argv[1:]
+    jobs = DEFAULT_JOBS
+    if arguments[:1] == ["verify"] and arguments[2:3] == ["--jobs"] and len(arguments) == 4 \
+            and arguments[3].isdigit() and int(arguments[3]) > 0:
+        jobs = int(arguments[3])
+        arguments = arguments[:2]
+    if len(arguments) != 2 or arguments[0] not in {"scan", "cleanup", "verify"}:
+        print(f"Usage: {sys.argv[0]} <scan|cleanup|verify> <examples-dir> [--jobs <n>]", file=sys.stderr)
         raise SystemExit(2)
-    (scan if sys.argv[1] == "scan" else cleanup)(Path(sys.argv[2]))
+    if arguments[0] == "verify":
+        verify(Path(arguments[1]), jobs)
+    else:
+        (scan if arguments[0] == "scan" else cleanup)(Path(arguments[1]))
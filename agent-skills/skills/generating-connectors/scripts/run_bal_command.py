@@ -2,31 +2,277 @@
 """
 Wrapper for Ballerina CLI commands.
 
-Usage: run_bal_command.py [--cwd <working-dir>] <command> [<argument>...]
-Prints stdout/stderr to terminal and exits with the command's exit code.
-On failure, also writes captured stderr to a temp file and prints its path.
+Usage: run_bal_command.py [--cwd <working-dir>] [--cache] <command> [<argument>...]
+Streams stdout/stderr to the terminal as they arrive, each line prefixed with the
+elapsed time, and exits with the command's exit code. Output is spooled to bounded
+rotating files instead of memory; on failure the spooled stderr is written to a
+temp file and its path is printed. Compile/test/pack phase timings parsed from the
+Ballerina output are printed when the command finishes.
+
+--cache (or CONNECTOR_BAL_CACHE=1) enables the result cache for `bal build` and
+`bal test`: the outcome is keyed by a hash of every .bal file, Ballerina.toml,
+Dependencies.toml, Config.toml, every file under a tests/ directory, the
+Ballerina toolchain, and the command. The toolchain is
+identified by the resolved `bal` launcher, its mtime, and the distribution selected
+with `bal dist use`, so a cache hit starts no JVM. When nothing has changed the
+previous exit code, stdout, and stderr are replayed with a [cached] label instead
+of running the command again. Timeouts are never cached.
+
+Environment:
+  CONNECTOR_BAL_TIMEOUT_SECONDS    Kill the command after this many seconds (default 1800)
+  CONNECTOR_BAL_SPOOL_MAX_BYTES    Size of one spool segment per stream (default 4 MiB)
+  CONNECTOR_BAL_SPOOL_SEGMENTS     Spool segments kept per stream (default 4)
+  CONNECTOR_BAL_CACHE_DIR          Result cache location (default <tmp>/bal_command_cache)
+  CONNECTOR_BAL_CACHE_MAX_ENTRIES  Least recently used entries beyond this are evicted (default 32)
+  CONNECTOR_BAL_CACHE_TTL_SECONDS  Entries older than this are evicted (default 86400)
 """
 
+import hashlib
+import json
 import os
+import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 
 DEFAULT_TIMEOUT_SECONDS = 1800
+DEFAULT_SPOOL_MAX_BYTES = 4 * 1024 * 1024
+DEFAULT_SPOOL_SEGMENTS = 4
+DEFAULT_CACHE_MAX_ENTRIES = 32
+DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHEABLE_SUBCOMMANDS = {"build", "test"}
+CACHE_SKIPPED_DIRS = {"target", ".git", "node_modules"}
+CACHE_ROOT_FILES = {"Ballerina.toml", "Dependencies.toml", "Config.toml"}
+USAGE = "Usage: run_bal_command.py [--cwd <working-dir>] [--cache] <command> [<argument>...]"
+TRUNCATED_NOTICE = "... earlier output truncated; only the most recent spooled segments were kept ...\n"
+
+# Phase markers printed by bal build/test/pack at the start of each phase
+PHASE_MARKERS = (
+    ("compile", re.compile(r"^Compiling source")),
+    ("test", re.compile(r"^Running [Tt]ests")),
+    ("pack", re.compile(r"^(Creating bala|Generating executable)")),
+)
+
+
+class Spool:
+    """Append-only text spool split across at most `segments` files of `max_bytes` each."""
+
+    def __init__(self, directory: str, name: str, max_bytes: int, segments: int):
+        self.directory = directory
+        self.name = name
+        self.max_bytes = max_bytes
+        self.segments = segments
+        self.index = 0
+        self.dropped = False
+        self.size = 0
+        self.handle = open(self.segment_path(0), "w", encoding="utf-8")
+
+    def segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{self.name}.{index}.log")
+
+    def write(self, text: str) -> None:
+        encoded = len(text.encode("utf-8"))
+        if self.size and self.size + encoded > self.max_bytes:
+            self.rotate()
+        self.handle.write(text)
+        self.size += encoded
+
+    def rotate(self) -> None:
+        self.handle.close()
+        self.index += 1
+        expired = self.index - self.segments
+        if expired >= 0:
+            os.remove(self.segment_path(expired))
+            self.dropped = True
+        self.handle = open(self.segment_path(self.index), "w", encoding="utf-8")
+        self.size = 0
+
+    def close(self) -> None:
+        self.handle.close()
+
+    def copy_to(self, target) -> None:
+        if self.dropped:
+            target.write(TRUNCATED_NOTICE)
+        for index in range(max(0, self.index - self.segments + 1), self.index + 1):
+            with open(self.segment_path(index), "r", encoding="utf-8") as segment:
+                shutil.copyfileobj(segment, target)
+
+
+class PhaseClock:
+    """Records when each Ballerina phase marker first appears in the output."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.starts = []
+        self.lock = threading.Lock()
+
+    def observe(self, line: str, now: float) -> None:
+        for phase, pattern in PHASE_MARKERS:
+            if pattern.match(line):
+                with self.lock:
+                    if phase not in [name for name, _ in self.starts]:
+                        self.starts.append((phase, now))
+                return
+
+    def durations(self, finished: float) -> list:
+        with self.lock:
+            starts = sorted(self.starts, key=lambda item: item[1])
+        ends = [start for _, start in starts[1:]] + [finished]
+        return [(phase, end - start) for (phase, start), end in zip(starts, ends)]
+
+
+def positive_int_env(name: str, default: int) -> int:
+    try:
+        value = int(os.environ.get(name, default))
+        if value <= 0:
+            raise ValueError
+    except ValueError:
+        print(f"ERROR: {name} must be a positive integer.", file=sys.stderr)
+        sys.exit(2)
+    return value
+
+
+def toolchain_fingerprint(command: list) -> str:
+    """
+    Identify the Ballerina toolchain without starting it (`bal version` boots a JVM): the
+    resolved launcher with its size and mtime, plus the distribution selected by `bal dist use`.
+    """
+    launcher = shutil.which(command[0])
+    if launcher is None:
+        return ""
+    launcher = os.path.realpath(launcher)
+    try:
+        stat = os.stat(launcher)
+    except OSError:
+        return ""
+    parts = [launcher, str(stat.st_size), str(stat.st_mtime_ns)]
+    selected = os.path.join(os.path.expanduser("~"), ".ballerina", "ballerina-version")
+    try:
+        with open(selected, "r", encoding="utf-8") as f:
+            parts.append(f.read().strip())
+    except OSError:
+        pass
+    return "\n".join(parts)
+
+
+def cache_key(command: list, workdir: str, toolchain: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"command": command, "toolchain": toolchain}).encode("utf-8"))
+    sources = []
+    for current, dirs, files in os.walk(workdir):
+        dirs[:] = sorted(d for d in dirs if d not in CACHE_SKIPPED_DIRS and not d.startswith("."))
+        # Everything under a tests/ directory: test Config.toml files and tests/resources/*
+        in_tests = "tests" in os.path.relpath(current, workdir).split(os.sep)
+        for name in files:
+            if name.endswith(".bal") or in_tests or (current == workdir and name in CACHE_ROOT_FILES):
+                sources.append(os.path.join(current, name))
+    for path in sorted(sources):
+        digest.update(b"\0" + os.path.relpath(path, workdir).replace(os.sep, "/").encode("utf-8") + b"\0")
+        with open(path, "rb") as source:
+            for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def evict(cache_dir: str, max_entries: int, ttl_seconds: int) -> None:
+    entries = []
+    for entry in os.scandir(cache_dir):
+        marker = os.path.join(entry.path, "result.json")
+        if entry.is_dir() and os.path.isfile(marker):
+            entries.append((os.path.getmtime(marker), entry.path))
+    entries.sort(reverse=True)
+    cutoff = time.time() - ttl_seconds
+    for index, (used, path) in enumerate(entries):
+        if index >= max_entries or used < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_cached(entry: str, ttl_seconds: int):
+    marker = os.path.join(entry, "result.json")
+    try:
+        if time.time() - os.path.getmtime(marker) > ttl_seconds:
+            return None
+        with open(marker, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        os.utime(marker)
+    except (OSError, ValueError):
+        return None
+    return result
+
+
+def store_cached(cache_dir: str, key: str, command: list, returncode: int, stdout_spool: Spool,
+                 stderr_spool: Spool) -> None:
+    staging = tempfile.mkdtemp(prefix=f".{key}.", dir=cache_dir)
+    try:
+        for name, spool in (("stdout.txt", stdout_spool), ("stderr.txt", stderr_spool)):
+            with open(os.path.join(staging, name), "w", encoding="utf-8") as f:
+                spool.copy_to(f)
+        with open(os.path.join(staging, "result.json"), "w", encoding="utf-8") as f:
+            json.dump({"command": command, "returncode": returncode,
+                       "created": time.strftime("%Y-%m-%dT%H:%M:%S%z")}, f)
+        target = os.path.join(cache_dir, key)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    except OSError as exc:
+        shutil.rmtree(staging, ignore_errors=True)
+        print(f">>> WARNING: could not store cached result: {exc}", file=sys.stderr)
+
+
+def replay_cached(entry: str, result: dict) -> None:
+    print(f">>> [cached] Sources, Ballerina toolchain, and command unchanged since {result['created']}; "
+          f"replaying exit code {result['returncode']} without running the command")
+    for name, terminal in (("stdout.txt", sys.stdout), ("stderr.txt", sys.stderr)):
+        with open(os.path.join(entry, name), "r", encoding="utf-8") as f:
+            for line in f:
+                terminal.write(f"[cached] {line}" + ("" if line.endswith("\n") else "\n"))
+        terminal.flush()
+
+
+def save_failed_stderr(returncode: int, copy_stderr) -> None:
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix="_bal_build_stderr.txt", delete=False, encoding="utf-8"
+    ) as f:
+        copy_stderr(f)
+        stderr_path = f.name
+
+    print(f">>> Command failed with exit code {returncode}", file=sys.stderr)
+    print(f">>> stderr saved to: {stderr_path}", file=sys.stderr)
+
+
+def pump(stream, spool: Spool, terminal_name: str, clock: PhaseClock, started: float,
+         lock: threading.Lock) -> None:
+    for raw in iter(stream.readline, b""):
+        line = raw.decode("utf-8", errors="replace")
+        now = time.monotonic()
+        spool.write(line)
+        clock.observe(line, now)
+        terminal = getattr(sys, terminal_name)
+        with lock:
+            terminal.write(f"[{now - started:7.1f}s] {line}" + ("" if line.endswith("\n") else "\n"))
+            terminal.flush()
+    stream.close()
 
 
 def main() -> None:
     arguments = sys.argv[1:]
     workdir = os.getcwd()
-    if arguments[:1] == ["--cwd"]:
+    use_cache = os.environ.get("CONNECTOR_BAL_CACHE", "") not in {"", "0"}
+    while arguments[:1] in (["--cwd"], ["--cache"]):
+        if arguments[0] == "--cache":
+            use_cache = True
+            arguments = arguments[1:]
+            continue
         if len(arguments) < 3:
-            print("Usage: run_bal_command.py [--cwd <working-dir>] <command> [<argument>...]", file=sys.stderr)
+            print(USAGE, file=sys.stderr)
             sys.exit(2)
         workdir = arguments[1]
         arguments = arguments[2:]
 
     if not arguments:
-        print("Usage: run_bal_command.py [--cwd <working-dir>] <command> [<argument>...]", file=sys.stderr)
+        print(USAGE, file=sys.stderr)
         sys.exit(2)
 
     command = arguments
@@ -38,43 +284,98 @@ def main() -> None:
     print("")
     sys.stdout.flush()
 
+    timeout_seconds = positive_int_env("CONNECTOR_BAL_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS)
+    spool_max_bytes = positive_int_env("CONNECTOR_BAL_SPOOL_MAX_BYTES", DEFAULT_SPOOL_MAX_BYTES)
+    spool_segments = positive_int_env("CONNECTOR_BAL_SPOOL_SEGMENTS", DEFAULT_SPOOL_SEGMENTS)
+
+    cache_dir = key = None
+    if use_cache and command[1:2] and command[1] in CACHEABLE_SUBCOMMANDS:
+        cache_dir = os.environ.get("CONNECTOR_BAL_CACHE_DIR") or os.path.join(tempfile.gettempdir(),
+                                                                             "bal_command_cache")
+        max_entries = positive_int_env("CONNECTOR_BAL_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES)
+        ttl_seconds = positive_int_env("CONNECTOR_BAL_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)
+        toolchain = toolchain_fingerprint(command)
+        if toolchain:
+            os.makedirs(cache_dir, exist_ok=True)
+            key = cache_key(command, os.path.abspath(workdir), toolchain)
+            entry = os.path.join(cache_dir, key)
+            cached = load_cached(entry, ttl_seconds)
+            if cached is not None:
+                replay_cached(entry, cached)
+                returncode = cached["returncode"]
+                if returncode != 0:
+                    print("", file=sys.stderr)
+
+                    def copy_cached(target) -> None:
+                        with open(os.path.join(entry, "stderr.txt"), "r", encoding="utf-8") as source:
+                            shutil.copyfileobj(source, target)
+
+                    save_failed_stderr(returncode, copy_cached)
+                sys.exit(returncode)
+        else:
+            print(f">>> WARNING: {command[0]} not found on PATH; running without the result cache", file=sys.stderr)
+    elif use_cache:
+        print(">>> Result cache applies only to `bal build` and `bal test`; running uncached", file=sys.stderr)
+
+    spool_dir = tempfile.mkdtemp(prefix="bal_command_spool_")
+    stdout_spool = Spool(spool_dir, "stdout", spool_max_bytes, spool_segments)
+    stderr_spool = Spool(spool_dir, "stderr", spool_max_bytes, spool_segments)
     try:
-        timeout_seconds = int(os.environ.get("CONNECTOR_BAL_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS))
-        if timeout_seconds <= 0:
-            raise ValueError
-    except ValueError:
-        print("ERROR: CONNECTOR_BAL_TIMEOUT_SECONDS must be a positive integer.", file=sys.stderr)
-        sys.exit(2)
-    try:
-        result = subprocess.run(command, shell=False, cwd=workdir, capture_output=True, text=True,
-                                timeout=timeout_seconds)
-    except subprocess.TimeoutExpired as exc:
-        def text_output(value):
-            if isinstance(value, bytes):
-                return value.decode("utf-8", errors="replace")
-            return value or ""
-
-        stdout = text_output(exc.stdout)
-        stderr = text_output(exc.stderr) + f"\nCommand timed out after {timeout_seconds} seconds."
-        result = subprocess.CompletedProcess(command, 124, stdout, stderr)
-
-    if result.stdout:
-        print(result.stdout, end="")
-    if result.stderr:
-        print(result.stderr, end="", file=sys.stderr)
-
-    if result.returncode != 0:
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix="_bal_build_stderr.txt", delete=False, encoding="utf-8"
-        ) as f:
-            f.write(result.stderr or "")
-            stderr_path = f.name
+        started = time.monotonic()
+        clock = PhaseClock(started)
+        lock = threading.Lock()
+        timed_out = False
+        try:
+            process = subprocess.Popen(command, shell=False, cwd=workdir, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+        except OSError as exc:
+            stderr_spool.write(f"Failed to start command: {exc}\n")
+            print(f"Failed to start command: {exc}", file=sys.stderr)
+            returncode = 127
+        else:
+            readers = [
+                threading.Thread(target=pump, args=(process.stdout, stdout_spool, "stdout", clock, started, lock),
+                                 daemon=True),
+                threading.Thread(target=pump, args=(process.stderr, stderr_spool, "stderr", clock, started, lock),
+                                 daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+            try:
+                returncode = process.wait(timeout=timeout_seconds)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                returncode = 124
+                timed_out = True
+            for reader in readers:
+                # Grandchildren (the bal launcher's JVM) may still hold the pipes open after a kill
+                reader.join(5 if timed_out else None)
+            if timed_out:
+                message = f"Command timed out after {timeout_seconds} seconds."
+                stderr_spool.write(f"\n{message}\n")
+                print(f"\n{message}", file=sys.stderr)
+        finished = time.monotonic()
+        stdout_spool.close()
+        stderr_spool.close()
 
+        timings = clock.durations(finished)
+        summary = ", ".join(f"{phase} {seconds:.1f}s" for phase, seconds in timings)
         print("", file=sys.stderr)
-        print(f">>> Command failed with exit code {result.returncode}", file=sys.stderr)
-        print(f">>> stderr saved to: {stderr_path}", file=sys.stderr)
+        print(f">>> Total: {finished - started:.1f}s" + (f" ({summary})" if summary else ""), file=sys.stderr)
+
+        if key is not None and not timed_out and returncode != 127:
+            store_cached(cache_dir, key, command, returncode, stdout_spool, stderr_spool)
+            evict(cache_dir, max_entries, ttl_seconds)
+
+        if returncode != 0:
+            save_failed_stderr(returncode, stderr_spool.copy_to)
+    finally:
+        stdout_spool.close()
+        stderr_spool.close()
+        shutil.rmtree(spool_dir, ignore_errors=True)
 
-    sys.exit(result.returncode)
+    sys.exit(returncode)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,8 @@ import contextlib
 import importlib.util
 import io
 import json
+import os
+import re
 import subprocess
 import sys
 import tempfile
@@ -29,6 +31,39 @@ def load_script_module(script: str):
     return module
 
 
+class SpecDiscoveryTests(unittest.TestCase):
+    def touch(self, root: Path, *paths: str) -> None:
+        for relative in paths:
+            path = root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("{}", encoding="utf-8")
+
+    def find(self, root: Path, *args: str) -> list[str]:
+        result = subprocess.run([sys.executable, str(SCRIPTS / "find_spec_files.py"), *args], cwd=root,
+                                text=True, capture_output=True, check=True)
+        return [str(Path(line).relative_to(root.resolve())).replace("\\", "/")
+                for line in result.stdout.splitlines()]
+
+    def test_candidates_are_ranked_and_heavy_directories_pruned(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp).resolve()
+            self.touch(root, "z.yaml", "docs/spec/spec.json", "docs/spec/openapi.yaml", "a/b/c/openapi.json",
+                       "a/b/c/d/openapi.json", "a/b/c/other.yaml", ".claude/openapi.yml", ".claude/notes.json",
+                       "build/openapi.yaml", ".gradle/openapi.json", "vendor/openapi.yaml")
+            self.assertEqual(self.find(root), [
+                ".claude/openapi.yml", "a/b/c/openapi.json", "docs/spec/openapi.yaml", "vendor/openapi.yaml",
+                "docs/spec/spec.json", "z.yaml",
+            ])
+            self.assertNotIn("vendor/openapi.yaml", self.find(root, "--ignore", "vendor"))
+
+    def test_search_stops_at_max_named_results(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp).resolve()
+            self.touch(root, "extra.yaml", *[f"d{index}/openapi.yaml" for index in range(10)])
+            found = self.find(root)
+            self.assertEqual(found, [f"d{index}/openapi.yaml" for index in range(8)])
+
+
 class SchemaMappingTests(unittest.TestCase):
     def write_spec(self, directory: Path, schemas: dict) -> Path:
         path = directory / "aligned.json"
@@ -513,6 +548,114 @@ class MetadataTests(unittest.TestCase):
             self.assertEqual(metadata["securitySchemes"][0]["xBallerinaName"], "apiKey")
 
 
+@unittest.skipIf(sys.platform == "win32", "uses a POSIX shebang stand-in for bal")
+class MockStubTests(unittest.TestCase):
+    FAKE_BAL = """#!{python}
+import json, os, sys
+if sys.argv[1] == "version":
+    selected = os.path.join(os.path.expanduser("~"), ".ballerina", "ballerina-version")
+    print(open(selected).read().strip() if os.path.exists(selected) else "Ballerina 2201.12.0")
+    sys.exit(0)
+with open({calls!r}, "a", encoding="utf-8") as calls:
+    calls.write(json.dumps(sys.argv[1:]) + "\\n")
+arguments = sys.argv[1:]
+output = arguments[arguments.index("-o") + 1]
+selected = arguments[arguments.index("--operations") + 1].split(",") if "--operations" in arguments else None
+resources = {{
+    "listUsers": "    # List users\\n    resource function get users() returns http:Response {{\\n    }}\\n",
+    "getUser": "    resource function get users/[string id]() returns time:Utc {{\\n    }}\\n",
+    "createOrder": "    resource function post 'order(@http:Payload json payload) returns error? {{\\n    }}\\n",
+}}
+body = "".join(text for name, text in resources.items() if selected is None or name in selected)
+imports = "import ballerina/http;\\n" + ("import ballerina/time;\\n" if "time:" in body else "")
+for name in ("types.bal", "client.bal", "utils.bal"):
+    open(os.path.join(output, name), "w").close()
+with open(os.path.join(output, "aligned_ballerina_openapi_service.bal"), "w", encoding="utf-8") as service:
+    service.write(imports + "\\nlistener http:Listener ep0 = new (9090);\\n\\nservice /v1 on ep0 {{\\n" + body + "}}\\n")
+"""
+
+    def setUp(self) -> None:
+        self.temp = tempfile.TemporaryDirectory()
+        root = Path(self.temp.name)
+        self.calls = root / "calls.jsonl"
+        bin_dir = root / "bin"
+        bin_dir.mkdir()
+        fake_bal = bin_dir / "bal"
+        fake_bal.write_text(self.FAKE_BAL.format(python=sys.executable, calls=str(self.calls)), encoding="utf-8")
+        fake_bal.chmod(0o755)
+        self.spec = root / "aligned_ballerina_openapi.json"
+        self.spec.write_text(json.dumps({"openapi": "3.0.0", "paths": {
+            "/users": {"get": {"operationId": "listUsers"}},
+            "/users/{id}": {"get": {"operationId": "getUser"}},
+            "/order": {"post": {"operationId": "createOrder"}},
+        }}), encoding="utf-8")
+        self.package = root / "package"
+        self.home = root / "home"
+        self.env = {"PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}", "HOME": str(self.home),
+                    "CONNECTOR_MOCK_STUB_CACHE_DIR": str(root / "cache")}
+
+    def tearDown(self) -> None:
+        self.temp.cleanup()
+
+    def generate(self, operations: str) -> str:
+        subprocess.run([sys.executable, str(SCRIPTS / "generate_mock_stub.py"), str(self.spec), str(self.package),
+                        operations, ""], text=True, capture_output=True, check=True,
+                       env={**os.environ, **self.env})
+        return (self.package / "tests" / "mock_service.bal").read_text(encoding="utf-8")
+
+    def openapi_calls(self) -> list:
+        if not self.calls.exists():
+            return []
+        return [json.loads(line) for line in self.calls.read_text(encoding="utf-8").splitlines()]
+
+    def test_unchanged_inputs_replay_without_running_bal(self) -> None:
+        first = self.generate("")
+        second = self.generate("")
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.openapi_calls()), 1)
+        self.assertFalse((self.package / "tests" / "types.bal").exists())
+
+    def test_switching_distribution_regenerates_the_stub(self) -> None:
+        selected = self.home / ".ballerina" / "ballerina-version"
+        selected.parent.mkdir(parents=True)
+        selected.write_text("ballerina-2201.12.0", encoding="utf-8")
+        self.generate("")
+        self.generate("")
+        self.assertEqual(len(self.openapi_calls()), 1)
+        selected.write_text("ballerina-2201.13.0", encoding="utf-8")
+        self.generate("")
+        self.assertEqual(len(self.openapi_calls()), 2)
+
+    def test_changed_subset_only_generates_new_operations(self) -> None:
+        first = self.generate("listUsers")
+        self.assertNotIn("import ballerina/time;", first)
+        merged = self.generate("getUser,listUsers")
+        calls = self.openapi_calls()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[1][calls[1].index("--operations") + 1], "getUser")
+        self.assertIn("import ballerina/time;", merged)
+        self.assertLess(merged.index("get users()"), merged.index("get users/[string id]"))
+        self.assertIn("    # List users\n", merged)
+        subset = self.generate("listUsers")
+        self.assertEqual(subset, first)
+        self.assertEqual(len(self.openapi_calls()), 2)
+
+    def test_escaped_resource_paths_are_matched_to_operations(self) -> None:
+        self.generate("createOrder")
+        self.generate("createOrder,listUsers")
+        calls = self.openapi_calls()
+        self.assertEqual(calls[1][calls[1].index("--operations") + 1], "listUsers")
+
+    def test_unreadable_spec_warns_and_caches_the_stub_whole(self) -> None:
+        self.spec.write_text("{not json", encoding="utf-8")
+        command = [sys.executable, str(SCRIPTS / "generate_mock_stub.py"), str(self.spec), str(self.package),
+                   "listUsers", ""]
+        first = subprocess.run(command, text=True, capture_output=True, check=True, env={**os.environ, **self.env})
+        self.assertIn("could not read operations from", first.stderr)
+        subprocess.run(command, text=True, capture_output=True, check=True, env={**os.environ, **self.env})
+        self.assertEqual(len(self.openapi_calls()), 1)
+
+
 class VersionAndExampleTests(unittest.TestCase):
     def create_example(self, root: Path, name: str) -> Path:
         example = root / name
@@ -654,37 +797,184 @@ class VersionAndExampleTests(unittest.TestCase):
             self.assertTrue(any("restore failed" in failure for failure in result["failures"]))
             self.assertFalse((root / "first").exists())
 
-    def test_bal_runner_uses_argv_without_a_shell(self) -> None:
-        module = load_script_module("run_bal_command.py")
+    @unittest.skipIf(sys.platform == "win32", "uses a POSIX shebang stand-in for bal")
+    def test_example_verify_builds_concurrently_with_isolated_targets(self) -> None:
         with tempfile.TemporaryDirectory() as temp:
-            command = ["bal", "openapi", "-i", "spec with spaces.yaml"]
-            with patch.object(module.subprocess, "run", return_value=subprocess.CompletedProcess(command, 0, "", "")) as run_command:
-                with patch.object(sys, "argv", ["run_bal_command.py", "--cwd", temp, *command]):
+            root = Path(temp) / "examples"
+            root.mkdir()
+            for name in ("alpha", "beta", "gamma"):
+                self.create_example(root, name)
+            (root / "beta" / "main.bal").write_text("broken", encoding="utf-8")
+            builds = Path(temp) / "builds.txt"
+            bin_dir = Path(temp) / "bin"
+            bin_dir.mkdir()
+            fake_bal = bin_dir / "bal"
+            # Each build records its target dir and when it started and ended
+            fake_bal.write_text(
+                f"#!{sys.executable}\nimport os, sys, time\n"
+                "started = time.time()\ntime.sleep(1)\n"
+                f"open({str(builds)!r}, 'a').write("
+                "f\"{sys.argv[sys.argv.index('--target-dir') + 1]} {started} {time.time()}\\n\")\n"
+                "if open('main.bal').read() == 'broken':\n"
+                "    print('ERROR [main.bal:(1:1,1:7)] invalid token', file=sys.stderr)\n    sys.exit(1)\n",
+                encoding="utf-8")
+            fake_bal.chmod(0o755)
+            result = subprocess.run(
+                [sys.executable, str(SCRIPTS / "manage_examples.py"), "verify", str(root), "--jobs", "3"],
+                text=True, capture_output=True, env={**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}"})
+
+            self.assertEqual(result.returncode, 1, result.stderr)
+            report = json.loads(result.stdout)
+            self.assertEqual(report["failed"], ["beta"])
+            self.assertEqual([item["name"] for item in report["examples"]], ["alpha", "beta", "gamma"])
+            self.assertEqual(report["examples"][1]["errors"], [{
+                "errorType": "ERROR", "fileName": "main.bal", "line": 1, "col": 1, "message": "invalid token"}])
+            records = [line.split() for line in builds.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(len({target for target, _, _ in records}), 3)
+            # Every build started before any of them finished, so all three ran at once
+            self.assertLess(max(float(started) for _, started, _ in records),
+                            min(float(ended) for _, _, ended in records))
+
+    def run_bal_runner(self, module, workdir: str, command: list[str], env: dict | None = None):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch.dict(module.os.environ, env or {}):
+            with patch.object(sys, "argv", ["run_bal_command.py", "--cwd", workdir, *command]):
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
                     with self.assertRaises(SystemExit) as exit_info:
                         module.main()
+        return exit_info.exception.code, stdout.getvalue(), stderr.getvalue()
+
+    def test_bal_runner_uses_argv_without_a_shell(self) -> None:
+        module = load_script_module("run_bal_command.py")
+        with tempfile.TemporaryDirectory() as temp:
+            command = [sys.executable, "-c", "import sys; print(sys.argv[1:])", "spec with spaces.yaml", "$HOME"]
+            code, stdout, _ = self.run_bal_runner(module, temp, command)
 
-            self.assertEqual(exit_info.exception.code, 0)
-            run_command.assert_called_once_with(
-                command, shell=False, cwd=temp, capture_output=True, text=True,
-                timeout=module.DEFAULT_TIMEOUT_SECONDS,
-            )
+        self.assertEqual(code, 0)
+        self.assertIn("['spec with spaces.yaml', '$HOME']", stdout)
 
     def test_bal_runner_decodes_byte_timeout_output(self) -> None:
+        module = load_script_module("run_bal_command.py")
+        script = ("import sys, time; sys.stdout.buffer.write(b'stdout\\xff\\n'); sys.stdout.flush(); "
+                  "sys.stderr.buffer.write(b'stderr\\xff\\n'); sys.stderr.flush(); time.sleep(30)")
+        with tempfile.TemporaryDirectory() as temp:
+            code, stdout, stderr = self.run_bal_runner(
+                module, temp, [sys.executable, "-c", script], {"CONNECTOR_BAL_TIMEOUT_SECONDS": "1"})
+
+        self.assertEqual(code, 124)
+        self.assertIn("stdout\ufffd", stdout)
+        self.assertIn("stderr\ufffd", stderr)
+        self.assertIn("Command timed out after", stderr)
+
+    def test_bal_runner_streams_with_timestamps_and_reports_phases(self) -> None:
+        module = load_script_module("run_bal_command.py")
+        script = ("import sys, time; print('Compiling source', flush=True); time.sleep(0.2); "
+                  "print('Running Tests', flush=True); time.sleep(0.2); print('Creating bala', flush=True)")
+        with tempfile.TemporaryDirectory() as temp:
+            code, stdout, stderr = self.run_bal_runner(module, temp, [sys.executable, "-c", script])
+
+        self.assertEqual(code, 0)
+        self.assertRegex(stdout, r"\[\s*\d+\.\ds\] Compiling source")
+        self.assertRegex(stderr, r"Total: [\d.]+s \(compile [\d.]+s, test [\d.]+s, pack [\d.]+s\)")
+        self.assertNotIn("stderr saved to", stderr)
+
+    def test_bal_runner_saves_bounded_raw_stderr_on_failure(self) -> None:
+        module = load_script_module("run_bal_command.py")
+        script = ("import sys\nfor index in range(200): print(f'noise {index:04d}', file=sys.stderr)\n"
+                  "print('ERROR [main.bal:(1:2,1:3)] undefined symbol', file=sys.stderr)\nsys.exit(1)")
+        with tempfile.TemporaryDirectory() as temp:
+            code, _, stderr = self.run_bal_runner(
+                module, temp, [sys.executable, "-c", script],
+                {"CONNECTOR_BAL_SPOOL_MAX_BYTES": "256", "CONNECTOR_BAL_SPOOL_SEGMENTS": "2"})
+
+        self.assertEqual(code, 1)
+        saved = Path(re.search(r">>> stderr saved to: (.+)", stderr).group(1).strip())
+        try:
+            content = saved.read_text(encoding="utf-8")
+        finally:
+            saved.unlink()
+        self.assertTrue(content.startswith(module.TRUNCATED_NOTICE))
+        self.assertLess(len(content), 600)
+        self.assertIn("\nERROR [main.bal:(1:2,1:3)] undefined symbol\n", content)
+        self.assertNotIn("noise 0000", content)
+
+    @unittest.skipIf(sys.platform == "win32", "uses a POSIX shebang stand-in for bal")
+    def test_bal_runner_cache_replays_unchanged_build_and_invalidates_on_source_change(self) -> None:
+        module = load_script_module("run_bal_command.py")
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            package, cache = root / "package", root / "cache"
+            package.mkdir()
+            (package / "Ballerina.toml").write_text("[package]\n", encoding="utf-8")
+            (package / "main.bal").write_text("public function main() {}\n", encoding="utf-8")
+            runs = root / "runs.txt"
+            fake_bal = root / "bal"
+            fake_bal.write_text(
+                f"#!{sys.executable}\nimport sys\n"
+                f"open({str(runs)!r}, 'a').write(sys.argv[1] + '\\n')\n"
+                "print('Compiling source')\nprint('ERROR [main.bal:(1:1,1:2)] broken', file=sys.stderr)\n"
+                "sys.exit(1)\n", encoding="utf-8")
+            fake_bal.chmod(0o755)
+            env = {"CONNECTOR_BAL_CACHE_DIR": str(cache)}
+            command = ["--cache", str(fake_bal), "build"]
+
+            first = self.run_bal_runner(module, str(package), command, env)
+            second = self.run_bal_runner(module, str(package), command, env)
+            (package / "main.bal").write_text("public function main() { }\n", encoding="utf-8")
+            third = self.run_bal_runner(module, str(package), command, env)
+
+            self.assertEqual([first[0], second[0], third[0]], [1, 1, 1])
+            # The toolchain is fingerprinted from the launcher, never by running `bal version`
+            self.assertEqual(runs.read_text(encoding="utf-8").split(), ["build", "build"])
+            self.assertNotIn("[cached]", first[1])
+            self.assertIn("[cached] Compiling source", second[1])
+            self.assertIn("[cached] ERROR [main.bal:(1:1,1:2)] broken", second[2])
+            saved = Path(re.search(r">>> stderr saved to: (.+)", second[2]).group(1).strip())
+            self.assertEqual(saved.read_text(encoding="utf-8"), "ERROR [main.bal:(1:1,1:2)] broken\n")
+            saved.unlink()
+            self.assertNotIn("[cached]", third[1])
+
+            # Replacing the launcher (a new Ballerina install) invalidates the entry
+            later = fake_bal.stat().st_mtime + 10
+            os.utime(fake_bal, (later, later))
+            fourth = self.run_bal_runner(module, str(package), command, env)
+            self.assertNotIn("[cached]", fourth[1])
+            Path(re.search(r">>> stderr saved to: (.+)", fourth[2]).group(1).strip()).unlink()
+            self.assertEqual(runs.read_text(encoding="utf-8").split(), ["build"] * 3)
+
+    def test_bal_runner_cache_key_covers_config_and_test_resources(self) -> None:
+        module = load_script_module("run_bal_command.py")
+        with tempfile.TemporaryDirectory() as temp:
+            package = Path(temp)
+            (package / "Ballerina.toml").write_text("[package]\n", encoding="utf-8")
+            (package / "tests" / "resources").mkdir(parents=True)
+            (package / "target").mkdir()
+            keys = [module.cache_key(["bal", "test"], temp, "toolchain")]
+            for path, text in (("Config.toml", "port = 9090\n"), ("tests/resources/response.json", "{}"),
+                               ("tests/Config.toml", "url = \"x\"\n")):
+                (package / path).write_text(text, encoding="utf-8")
+                keys.append(module.cache_key(["bal", "test"], temp, "toolchain"))
+            (package / "target" / "report.json").write_text("{}", encoding="utf-8")
+            keys.append(module.cache_key(["bal", "test"], temp, "toolchain"))
+
+        self.assertEqual(len(set(keys[:4])), 4)
+        self.assertEqual(keys[4], keys[3])
+
+    def test_bal_runner_cache_evicts_least_recently_used_entries(self) -> None:
         module = load_script_module("run_bal_command.py")
         with tempfile.TemporaryDirectory() as temp:
-            command = ["bal", "build"]
-            timeout = subprocess.TimeoutExpired(command, 1, output=b"stdout\xff", stderr=b"stderr\xff")
-            stdout, stderr = io.StringIO(), io.StringIO()
-            with patch.object(module.subprocess, "run", side_effect=timeout):
-                with patch.object(sys, "argv", ["run_bal_command.py", "--cwd", temp, *command]):
-                    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
-                        with self.assertRaises(SystemExit) as exit_info:
-                            module.main()
-
-            self.assertEqual(exit_info.exception.code, 124)
-            self.assertIn("stdout�", stdout.getvalue())
-            self.assertIn("stderr�", stderr.getvalue())
-            self.assertIn("Command timed out after", stderr.getvalue())
+            cache = Path(temp)
+            for index, age in enumerate((30, 20, 10)):
+                entry = cache / f"entry{index}"
+                entry.mkdir()
+                marker = entry / "result.json"
+                marker.write_text("{}", encoding="utf-8")
+                used = module.time.time() - age
+                os.utime(marker, (used, used))
+            module.evict(str(cache), 2, 25)
+            self.assertEqual(sorted(path.name for path in cache.iterdir()), ["entry1", "entry2"])
+            module.evict(str(cache), 1, 3600)
+            self.assertEqual([path.name for path in cache.iterdir()], ["entry2"])
 
 
 if __name__ == "__main__":
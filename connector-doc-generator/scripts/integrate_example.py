@@ -7,9 +7,12 @@ import argparse
 import json
 import re
 import shutil
+import sys
 from pathlib import Path
 from typing import NoReturn
 
+DEFAULT_SCREENSHOT_BUDGET_KB = 2048
+
 
 def fail(message: str) -> NoReturn:
     """Raise an integration error while preserving type narrowing."""
@@ -32,6 +35,30 @@ def find_screenshots(artifacts: Path, expected: int) -> list[Path]:
     return files
 
 
+def place_screenshots(screenshots: list[Path], image_dir: Path, budget_kb: int) -> dict[str, object]:
+    """Copy screenshots (and any optimized .webp siblings) and report their size against the budget.
+
+    The example generator's optimize_screenshots.py stage has already recompressed the PNGs
+    in the artifacts directory, so placement stays a plain copy and needs no image library.
+    """
+    image_dir.mkdir(parents=True, exist_ok=True)
+    placed: list[Path] = []
+    for screenshot in screenshots:
+        for source in (screenshot, screenshot.with_suffix(".webp")):
+            if source.exists():
+                destination = image_dir / source.name
+                shutil.copy2(source, destination)
+                placed.append(destination)
+    png_bytes = sum(path.stat().st_size for path in placed if path.suffix == ".png")
+    return {
+        "placed": placed,
+        "pngBytes": png_bytes,
+        "webpBytes": sum(path.stat().st_size for path in placed if path.suffix == ".webp"),
+        "budgetBytes": budget_kb * 1024,
+        "overBudget": png_bytes > budget_kb * 1024,
+    }
+
+
 def connector_display_name(overview_text: str, fallback: str) -> str:
     """Extract the connector's own display name from overview.md's frontmatter title.
 
@@ -139,58 +166,86 @@ def reconcile_example_sidebar(sidebar: Path, category: str, module: str) -> None
     sidebar.write_text(updated, encoding="utf-8")
 
 
-def integrate(args: argparse.Namespace) -> dict[str, object]:
-    """Validate and copy example artifacts into docs-integrator."""
-    docs_repo = Path(args.docs_repo).resolve()
-    artifacts = Path(args.artifacts_dir).resolve()
-    target_dir = (
-        docs_repo / "en" / "docs" / "connectors" / "catalog"
-        / args.category / args.module
-    )
+def place_example(
+    docs_repo: Path,
+    category: str,
+    module: str,
+    content: str,
+    screenshots: list[Path],
+    budget_kb: int = DEFAULT_SCREENSHOT_BUDGET_KB,
+) -> dict[str, object]:
+    """Place a generated guide and its screenshots into docs-integrator.
+
+    Both the workflow (integrate()) and the example generator's local publish_docs.py place
+    through here, so the path guards, sidebar entry and overview link cannot drift apart.
+    """
+    target_dir = docs_repo / "en" / "docs" / "connectors" / "catalog" / category / module
     overview = target_dir / "overview.md"
     if not overview.exists():
         fail(f"Existing connector overview is required before example placement: {overview}")
 
-    source_doc = find_single_markdown(artifacts)
-    expected = 7 if args.mode == "trigger" else 6
-    screenshots = find_screenshots(artifacts, expected)
-    content = source_doc.read_text(encoding="utf-8")
     if re.search(r"(?:^|[\s(])/(?:home|Users|private|tmp)/", content):
         fail("Generated guide contains an unresolved local absolute path")
 
-    static_prefix = f"/img/connectors/catalog/{args.category}/{args.module}/"
+    static_prefix = f"/img/connectors/catalog/{category}/{module}/"
     content = content.replace("../screenshots/", static_prefix)
     if "../screenshots/" in content:
         fail("Generated guide contains unresolved screenshot paths")
 
-    display_name = connector_display_name(overview.read_text(encoding="utf-8"), args.module)
-    content = ensure_example_frontmatter(content, display_name, args.module)
+    display_name = connector_display_name(overview.read_text(encoding="utf-8"), module)
+    content = ensure_example_frontmatter(content, display_name, module)
+
+    sidebar = docs_repo / "en" / "sidebars.ts"
+    reconcile_example_sidebar(sidebar, category, module)
 
-    target_dir.mkdir(parents=True, exist_ok=True)
     target_doc = target_dir / "example.md"
     target_doc.write_text(content, encoding="utf-8")
 
-    image_dir = (
-        docs_repo / "en" / "static" / "img" / "connectors" / "catalog"
-        / args.category / args.module
-    )
-    image_dir.mkdir(parents=True, exist_ok=True)
-    copied: list[str] = []
-    for screenshot in screenshots:
-        destination = image_dir / screenshot.name
-        shutil.copy2(screenshot, destination)
-        copied.append(str(destination.relative_to(docs_repo)))
+    image_dir = docs_repo / "en" / "static" / "img" / "connectors" / "catalog" / category / module
+    placement = place_screenshots(screenshots, image_dir, budget_kb)
+    placed = placement.pop("placed")
+    if placement["overBudget"]:
+        print(
+            f"[WARN] Screenshots total {placement['pngBytes'] // 1024} KB, over the "
+            f"{budget_kb} KB budget",
+            file=sys.stderr,
+        )
+
+    return {
+        "page": target_doc,
+        "placed": placed,
+        "screenshotSize": placement,
+        "overviewUpdated": add_example_link_to_overview(overview, module),
+    }
 
-    sidebar = docs_repo / "en" / "sidebars.ts"
-    reconcile_example_sidebar(sidebar, args.category, args.module)
-    overview_updated = add_example_link_to_overview(overview, args.module)
+
+def integrate(args: argparse.Namespace) -> dict[str, object]:
+    """Validate and copy example artifacts into docs-integrator."""
+    docs_repo = Path(args.docs_repo).resolve()
+    artifacts = Path(args.artifacts_dir).resolve()
+
+    source_doc = find_single_markdown(artifacts)
+    expected = 7 if args.mode == "trigger" else 6
+    screenshots = find_screenshots(artifacts, expected)
+    placement = place_example(
+        docs_repo,
+        args.category,
+        args.module,
+        source_doc.read_text(encoding="utf-8"),
+        screenshots,
+        args.screenshot_budget_kb,
+    )
+    placed: list[Path] = placement["placed"]
+    copied = [str(path.relative_to(docs_repo)) for path in placed if path.suffix == ".png"]
 
     result: dict[str, object] = {
         "mode": args.mode,
-        "page": str(target_doc.relative_to(docs_repo)),
+        "page": str(placement["page"].relative_to(docs_repo)),
         "screenshots": copied,
         "screenshotCount": len(copied),
-        "overviewUpdated": overview_updated,
+        "webpScreenshots": [str(path.relative_to(docs_repo)) for path in placed if path.suffix == ".webp"],
+        "screenshotSize": placement["screenshotSize"],
+        "overviewUpdated": placement["overviewUpdated"],
     }
     if args.result:
         result_path = Path(args.result)
@@ -208,6 +263,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--module", required=True)
     parser.add_argument("--mode", choices=("connector", "trigger"), required=True)
     parser.add_argument("--result")
+    parser.add_argument(
+        "--screenshot-budget-kb",
+        type=int,
+        default=DEFAULT_SCREENSHOT_BUDGET_KB,
+        help=f"Total PNG size per connector reported as over budget (default: {DEFAULT_SCREENSHOT_BUDGET_KB})",
+    )
     return parser.parse_args()
 
 
@@ -6,7 +6,13 @@ from pathlib import Path
 SCRIPTS = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(SCRIPTS))
 
-from integrate_example import add_example_link_to_overview, connector_display_name, ensure_example_frontmatter
+from integrate_example import (
+    add_example_link_to_overview,
+    connector_display_name,
+    ensure_example_frontmatter,
+    place_example,
+    place_screenshots,
+)
 from validate_docs import validate
 
 
@@ -37,6 +43,80 @@ class EnsureExampleFrontmatterTests(unittest.TestCase):
         self.assertEqual(ensure_example_frontmatter(content, "HubSpot Events Completions", "hubspot.events.completions"), content)
 
 
+class PlaceScreenshotsTests(unittest.TestCase):
+    def test_copies_webp_siblings_and_reports_budget(self):
+        with tempfile.TemporaryDirectory() as temp:
+            artifacts = Path(temp) / "screenshots"
+            artifacts.mkdir()
+            first = artifacts / "mysql_screenshot_01_palette.png"
+            second = artifacts / "mysql_screenshot_02_form.png"
+            first.write_bytes(b"p" * 1024)
+            second.write_bytes(b"p" * 2048)
+            first.with_suffix(".webp").write_bytes(b"w" * 512)
+            image_dir = Path(temp) / "img"
+
+            placement = place_screenshots([first, second], image_dir, budget_kb=2)
+
+            self.assertEqual(
+                sorted(path.name for path in image_dir.iterdir()),
+                ["mysql_screenshot_01_palette.png", "mysql_screenshot_01_palette.webp", "mysql_screenshot_02_form.png"],
+            )
+            self.assertEqual(len(placement["placed"]), 3)
+            self.assertEqual(placement["pngBytes"], 3072)
+            self.assertEqual(placement["webpBytes"], 512)
+            self.assertTrue(placement["overBudget"])
+
+
+class PlaceExampleTests(unittest.TestCase):
+    SIDEBAR = (
+        "{\n"
+        "  type: 'category',\n"
+        "  label: 'MySQL',\n"
+        "  link: {type: 'doc', id: 'connectors/catalog/database/mysql/overview'},\n"
+        "  items: [\n"
+        "    'connectors/catalog/database/mysql/setup-guide',\n"
+        "  ],\n"
+        "},\n"
+    )
+
+    def _make_repo(self, temp: Path) -> Path:
+        repo = temp / "docs-integrator"
+        doc_dir = repo / "en/docs/connectors/catalog/database/mysql"
+        doc_dir.mkdir(parents=True)
+        (doc_dir / "overview.md").write_text(
+            '---\ntitle: "MySQL Overview"\n---\n\n## Documentation\n\n* **[Setup Guide](setup-guide.md)**: Guide.\n',
+            encoding="utf-8",
+        )
+        (repo / "en/sidebars.ts").write_text(self.SIDEBAR, encoding="utf-8")
+        return repo
+
+    def test_places_page_screenshots_sidebar_entry_and_overview_link(self):
+        with tempfile.TemporaryDirectory() as temp:
+            repo = self._make_repo(Path(temp))
+            screenshot = Path(temp) / "mysql_screenshot_01_palette.png"
+            screenshot.write_bytes(b"p")
+
+            placement = place_example(
+                repo, "database", "mysql", "# Example\n\n![Palette](../screenshots/mysql_screenshot_01_palette.png)\n",
+                [screenshot],
+            )
+
+            page = placement["page"].read_text(encoding="utf-8")
+            self.assertIn('title: "MySQL Example"', page)
+            self.assertIn("(/img/connectors/catalog/database/mysql/mysql_screenshot_01_palette.png)", page)
+            self.assertTrue((repo / "en/static/img/connectors/catalog/database/mysql/mysql_screenshot_01_palette.png").exists())
+            self.assertIn("'connectors/catalog/database/mysql/example',", (repo / "en/sidebars.ts").read_text(encoding="utf-8"))
+            self.assertTrue(placement["overviewUpdated"])
+
+    def test_rejects_local_absolute_paths_before_placing_anything(self):
+        with tempfile.TemporaryDirectory() as temp:
+            repo = self._make_repo(Path(temp))
+            with self.assertRaisesRegex(RuntimeError, "local absolute path"):
+                place_example(repo, "database", "mysql", "![Palette](/home/me/artifacts/shot.png)\n", [])
+            self.assertFalse((repo / "en/docs/connectors/catalog/database/mysql/example.md").exists())
+            self.assertEqual((repo / "en/sidebars.ts").read_text(encoding="utf-8"), self.SIDEBAR)
+
+
 class AddExampleLinkTests(unittest.TestCase):
     def test_uses_display_name_with_overview_suffix_stripped(self):
         # Regression: overview.md's title is now "<Name> Overview" (WSO2's own convention,
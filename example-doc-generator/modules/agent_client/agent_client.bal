@@ -40,10 +40,14 @@ public type AgentUsage record {
 
 # Poll response for a running or completed agent job.
 type JobStatus record {
-    # "running" or "done"
+    # "queued", "running", "done", "error", or "cancelled"
     string status;
-    # Accumulated log lines in "[LABEL] text" format
-    string[] logs;
+    # 1-based position in the agent server's job queue while the job is queued
+    int? queuePosition = ();
+    # Log lines in "[LABEL] text" format appended since the requested offset
+    string[] logs = [];
+    # Offset to pass as `since` on the next poll
+    int nextOffset;
     # Structured usage data — present only after the job completes
     AgentUsage? usage;
 };
@@ -71,15 +75,15 @@ public function runClaudeAgent(string promptPath, string agentUrl, string model)
     string jobId = startData.job_id;
     utils:log("\t[INFO] Job submitted: " + jobId);
 
-    // Poll every second; print new log lines as they arrive
+    // Poll every second; each poll fetches only the log lines appended since the last one.
     // Limit to 5400 attempts (90 minutes) to prevent infinite hangs.
-    int lastLogCount = 0;
+    int nextOffset = 0;
     int attempts = 0;
     int maxAttempts = 5400;
     while attempts < maxAttempts {
         runtime:sleep(1);
         attempts += 1;
-        http:Response pollResp = check agentClient->get(string `/jobs/${jobId}`);
+        http:Response pollResp = check agentClient->get(string `/jobs/${jobId}?since=${nextOffset}`);
         if pollResp.statusCode < 200 || pollResp.statusCode >= 300 {
             string|error errBody = pollResp.getTextPayload();
             string detail = errBody is string ? errBody : "(unable to read body)";
@@ -88,12 +92,10 @@ public function runClaudeAgent(string promptPath, string agentUrl, string model)
         json pollBody = check pollResp.getJsonPayload();
         JobStatus jobStatus = check pollBody.cloneWithType(JobStatus);
 
-        int i = lastLogCount;
-        while i < jobStatus.logs.length() {
-            utils:log("\t" + jobStatus.logs[i]);
-            i += 1;
+        foreach string line in jobStatus.logs {
+            utils:log("\t" + line);
         }
-        lastLogCount = jobStatus.logs.length();
+        nextOffset = jobStatus.nextOffset;
 
         if jobStatus.status == "done" {
             utils:log("\t[INFO] Claude agent finished.");
@@ -102,6 +104,9 @@ public function runClaudeAgent(string promptPath, string agentUrl, string model)
         if jobStatus.status == "error" {
             return error(string `Agent job ${jobId} failed. Check agent logs for details.`);
         }
+        if jobStatus.status == "cancelled" {
+            return error(string `Agent job ${jobId} was cancelled on the agent server.`);
+        }
     }
     return error(string `Agent job ${jobId} did not complete within ${maxAttempts} seconds.`);
 }
@@ -22,21 +22,84 @@ simple REST API so the Ballerina pipeline can submit jobs and stream logs.
 
 Routes
 ------
-POST /run          { "prompt_path": "<path>", "model": "<model>" }  → { "job_id": "<uuid>" }
-GET  /jobs/<id>    → { "status": "running|done", "logs": [...] }
-GET  /health       → { "status": "ok" }
-POST /shutdown     → { "status": "shutting down" }
+POST   /run        { "prompt_path": "<path>", "model": "<model>", "priority": 0 }
+                   → { "job_id": "<uuid>", "queuePosition": <n|null> }
+                   → 429 with Retry-After when the queue is full
+GET    /jobs/<id>  → { "status": "queued|running|done|error|cancelled",
+                       "queuePosition": <n|null>, "logCount": <n>, "usage": {...},
+                       "memory": {...} }
+GET    /jobs/<id>?since=<offset>
+                   → the same, plus "logs": lines [offset:] and "nextOffset"
+GET    /jobs/<id>/stream
+                   → text/event-stream: one "log" event per line (id = offset),
+                     then a final "status" event; resumes from ?since= or
+                     Last-Event-ID
+DELETE /jobs/<id>  → { "status": "cancelled" }  (409 once the job has finished)
+GET    /jobs/<id>/trace
+                   → Chrome trace-event JSON (model turns, tool calls with
+                     durations, message arrivals); open it in Perfetto
+GET    /metrics    → Prometheus text format: job durations, queue wait, tokens,
+                     turns, tool calls, errors, running/queued jobs
+GET    /health     → { "status": "ok", "running": <n>, "queued": <n> }
+POST   /shutdown   → { "status": "shutting down" }
+
+Scheduling
+----------
+Jobs wait in a priority queue (higher "priority" first, FIFO within a priority)
+and one agent runs at a time, with an isolated in-memory browser profile and
+its own Playwright MCP server. Above --max-queued-jobs waiting jobs, POST /run
+is rejected with HTTP 429.
+
+Jobs cannot run side by side yet: every job writes its screenshots and guide
+to the shared artifacts/screenshots/ and artifacts/workflow-docs/, which the
+doc pipeline collects by exact count, and all jobs drive the one code-server.
+--max-concurrent-jobs above 1 is therefore refused.
+
+Playwright MCP pool
+-------------------
+--mcp-pool-size pinned Playwright MCP HTTP servers (default: one per job slot)
+are started with the server and handed to jobs, so a job's first browser
+action does not wait for npx and Node start-up. Each instance is health-checked
+before use and restarted after every job, giving the next job a clean browser.
+With --mcp-pool-size 0 every job spawns its own stdio server instead. Either
+way Playwright MCP writes to artifacts/screenshots/, where the prompts name the
+screenshots and the doc pipeline collects them. See mcp_pool.py.
+
+Job store
+---------
+Job records and log lines are written through to --job-store (SQLite in WAL
+mode by default, or "memory"). Memory holds active jobs plus the most recently
+finished ones: a finished job is evicted after --job-cache-ttl seconds or once
+more than --job-cache-size finished jobs are cached, and later requests for it
+are answered from the store. On startup, jobs a previous process left queued or
+running are marked as errors and jobs older than --job-retention-days are
+deleted.
+
+Log memory
+----------
+Every log line is written in full to a per-job file under
+.cache/agent-server/logs/ (see job_log.py). The in-memory view cuts lines
+longer than --log-line-chars, pointing at the full text on disk, and keeps at
+most --log-memory-kb of view lines per job; older lines are read back from the
+job store (or the log file). "memory" in /jobs/<id> reports a job's usage.
+
+Polling clients pass the nextOffset of the previous response as ?since=, so each
+poll transfers only the lines appended since, instead of the whole log.
 
 Usage
 -----
-    uv run agent_server.py [--port 8765]
+    uv run agent_server.py [--port 8765] [--max-concurrent-jobs 1] [--max-queued-jobs 16]
 """
 
 import argparse
 import asyncio
+import heapq
+import itertools
 import json
 import os
+import time
 import uuid
+from typing import Callable, Coroutine
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -54,15 +117,240 @@ from claude_agent_sdk import (
     ResultMessage,
     SystemMessage,
     TextBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
     query,
 )
 
+from job_log import JobLog, prune_log_files, read_log_file
+from job_store import FINAL_STATUSES, JobStore, MemoryJobStore, evictable_jobs, open_job_store
+from job_trace import JobTrace
+from mcp_pool import McpPool, playwright_mcp_args, playwright_mcp_command
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, Counter, Gauge, Histogram, Registry
+
 # CWD for the Claude agent is the project root (one level above this file)
 CWD = str(Path(__file__).parent.parent)
 AI_MODEL = os.environ.get("AI_MODEL", "claude-sonnet-4-6")
-
+# Jobs share artifacts/screenshots, artifacts/workflow-docs and one code-server,
+# so no more than one may run at a time (see "Scheduling" above)
+SUPPORTED_CONCURRENT_JOBS = 1
+MAX_CONCURRENT_JOBS = int(os.environ.get("AGENT_MAX_CONCURRENT_JOBS", "1"))
+MAX_QUEUED_JOBS = int(os.environ.get("AGENT_MAX_QUEUED_JOBS", "16"))
+# Suggested client back-off (seconds) sent with a 429 when the queue is full
+RETRY_AFTER_SECONDS = 30
+# Comment line sent on idle event streams so proxies keep the connection open
+STREAM_KEEPALIVE_SECONDS = 15
+JOB_STORE = os.environ.get("AGENT_JOB_STORE", f"{CWD}/.cache/agent-server/jobs.sqlite3")
+# Finished jobs kept in memory; older ones are served from the job store
+JOB_CACHE_SIZE = int(os.environ.get("AGENT_JOB_CACHE_SIZE", "20"))
+JOB_CACHE_TTL_SECONDS = int(os.environ.get("AGENT_JOB_CACHE_TTL", "3600"))
+JOB_RETENTION_DAYS = float(os.environ.get("AGENT_JOB_RETENTION_DAYS", "7"))
+# Full per-job logs; memory only keeps a bounded, truncated view of them
+LOG_DIR = Path(CWD) / ".cache" / "agent-server" / "logs"
+LOG_MEMORY_KB = int(os.environ.get("AGENT_LOG_MEMORY_KB", "1024"))
+LOG_LINE_CHARS = int(os.environ.get("AGENT_LOG_LINE_CHARS", "8000"))
+# Playwright MCP output dir: the prompts give bare screenshot filenames, which land here
+SCREENSHOTS_DIR = Path(CWD) / "artifacts" / "screenshots"
+# Warm Playwright MCP servers; unset means one per concurrent job slot
+MCP_POOL_SIZE = os.environ.get("AGENT_MCP_POOL_SIZE")
+
+# Active and recently finished jobs; everything is also written through to `store`
 jobs: dict[str, dict] = {}
-running_tasks: set[asyncio.Task] = set()
+store: JobStore = MemoryJobStore()
+mcp_pool: McpPool | None = None
+# Per-job event replaced on every log line or status change; streams wait on it
+job_updates: dict[str, asyncio.Event] = {}
+# Timing of each started job; kept alongside `jobs` and evicted with it
+job_traces: dict[str, JobTrace] = {}
+
+# Process-lifetime metrics served by GET /metrics
+metrics = Registry()
+JOBS_FINISHED = metrics.add(Counter("agent_jobs_total", "Agent jobs that reached a final status.", ("status",)))
+JOB_ERRORS = metrics.add(Counter(
+    "agent_job_errors_total", "Failed agent runs, by exception type or 'result' for an error result.", ("type",)
+))
+JOB_DURATION = metrics.add(Histogram(
+    "agent_job_duration_seconds", "Time from a job starting to its final status.",
+    (60, 300, 600, 1200, 1800, 3600, 5400, 7200, 10800),
+))
+QUEUE_WAIT = metrics.add(Histogram(
+    "agent_job_queue_wait_seconds", "Time a job waited in the queue before starting.",
+    (1, 5, 30, 60, 300, 900, 1800, 3600),
+))
+TOKENS = metrics.add(Counter("agent_tokens_total", "Tokens reported by finished agent runs.", ("type",)))
+TURNS = metrics.add(Histogram(
+    "agent_job_turns", "Conversation turns per agent run.", (10, 25, 50, 100, 200, 400, 800)
+))
+TOOL_CALLS = metrics.add(Counter("agent_tool_calls_total", "Tool calls made by agents.", ("tool",)))
+COST = metrics.add(Counter("agent_cost_usd_total", "Cost reported by finished agent runs, in USD."))
+metrics.add(Gauge("agent_jobs_running", "Agent jobs running now.", lambda: len(scheduler.running)))
+metrics.add(Gauge("agent_jobs_queued", "Agent jobs waiting in the queue.", lambda: len(scheduler.pending)))
+
+
+def notify(job_id: str) -> None:
+    """Wake every stream waiting on this job."""
+    event = job_updates.get(job_id)
+    job_updates[job_id] = asyncio.Event()
+    if event is not None:
+        event.set()
+
+
+def set_status(job_id: str, status: str) -> None:
+    job = jobs[job_id]
+    job["status"] = status
+    if status == "running":
+        job["startedAt"] = time.time()
+        QUEUE_WAIT.observe(job["startedAt"] - job["createdAt"])
+        job_traces[job_id] = JobTrace(
+            job_id, LOG_DIR / f"{job_id}.trace.jsonl", job["log"].path,
+            job["startedAt"] - job["createdAt"],
+        )
+    elif status in FINAL_STATUSES:
+        job["finishedAt"] = time.time()
+        JOBS_FINISHED.inc(status=status)
+        if job["startedAt"] is not None:
+            JOB_DURATION.observe(job["finishedAt"] - job["startedAt"])
+        trace = job_traces.get(job_id)
+        if trace is not None:
+            trace.finish()
+            if job["usage"] is not None:
+                job["usage"]["toolLatency"] = trace.tool_latency()
+                job["usage"]["modelSeconds"] = round(trace.model_seconds, 3)
+            store.save_trace(job_id, trace.to_chrome())
+        job["log"].close()
+    store.update(job_id, status, job["usage"], job["finishedAt"])
+    notify(job_id)
+    if status in FINAL_STATUSES:
+        evict_finished()
+
+
+def append_log(job_id: str, line: str) -> None:
+    log = jobs[job_id]["log"]
+    offset = log.count
+    store.append_log(job_id, offset, log.append(line))
+    notify(job_id)
+
+
+def evict_finished() -> None:
+    """Drop finished jobs past the TTL, or beyond the newest JOB_CACHE_SIZE, from memory."""
+    finished = [(job["finishedAt"], job_id) for job_id, job in jobs.items() if job["status"] in FINAL_STATUSES]
+    # A job stays until its task's done-callback has run; that callback evicts it
+    for job_id in evictable_jobs(finished, JOB_CACHE_SIZE, JOB_CACHE_TTL_SECONDS, time.time(), scheduler.running):
+        del jobs[job_id]
+        job_updates.pop(job_id, None)
+        job_traces.pop(job_id, None)
+
+
+def job_summary(job_id: str, job: dict | None = None) -> dict | None:
+    """
+    Status response without the log lines; None for an unknown job. `job` is a
+    record held by the caller, used once the job has been evicted from memory.
+    """
+    job = jobs.get(job_id, job)
+    if job is None:
+        stored = store.load(job_id)
+        if stored is None:
+            return None
+        return {
+            "status": stored["status"],
+            "usage": stored["usage"],
+            "queuePosition": None,
+            "logCount": stored["logCount"],
+        }
+    return {
+        "status": job["status"],
+        "usage": job["usage"],
+        "queuePosition": scheduler.position(job_id),
+        "logCount": job["log"].count,
+        "memory": job["log"].memory(),
+    }
+
+
+def job_logs(job_id: str, since: int) -> list[str]:
+    job = jobs.get(job_id)
+    if job is not None:
+        lines = job["log"].lines_since(since)
+        if lines is not None:
+            return lines
+    if store.persistent:
+        return store.read_logs(job_id, since)
+    return read_log_file(LOG_DIR / f"{job_id}.jsonl", since, LOG_LINE_CHARS)
+
+
+class JobScheduler:
+    """
+    Priority queue of pending jobs with a fixed number of run slots.
+
+    Nothing polls the queue: a job is started on submit when a slot is free,
+    and the next one is started from the done-callback of a finished job.
+    """
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.pending: list[tuple[int, int, str]] = []  # heap of (-priority, seq, job_id)
+        self.factories: dict[str, Callable[[], Coroutine]] = {}
+        self.running: dict[str, asyncio.Task] = {}
+        self._seq = itertools.count()
+
+    def is_full(self) -> bool:
+        """True when a new job could neither start nor wait in the queue."""
+        return len(self.running) >= self.max_concurrent and len(self.pending) >= self.max_queued
+
+    def submit(self, job_id: str, start: Callable[[], Coroutine], priority: int = 0) -> None:
+        heapq.heappush(self.pending, (-priority, next(self._seq), job_id))
+        self.factories[job_id] = start
+        self._dispatch()
+
+    def position(self, job_id: str) -> int | None:
+        """1-based place in the queue, or None when the job is not waiting."""
+        if job_id not in self.factories:
+            return None
+        return next(rank for rank, entry in enumerate(sorted(self.pending), 1) if entry[2] == job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Drop a queued job or cancel a running one; False if it already finished."""
+        if job_id in self.factories:
+            del self.factories[job_id]
+            self.pending = [entry for entry in self.pending if entry[2] != job_id]
+            heapq.heapify(self.pending)
+            set_status(job_id, "cancelled")
+            return True
+        task = self.running.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def cancel_all(self) -> list[asyncio.Task]:
+        for job_id in list(self.factories):
+            self.cancel(job_id)
+        tasks = list(self.running.values())
+        for task in tasks:
+            task.cancel()
+        return tasks
+
+    def _dispatch(self) -> None:
+        while self.pending and len(self.running) < self.max_concurrent:
+            _, _, job_id = heapq.heappop(self.pending)
+            task = asyncio.create_task(self.factories.pop(job_id)())
+            self.running[job_id] = task
+            task.add_done_callback(lambda task, job_id=job_id: self._finished(job_id, task))
+
+    def _finished(self, job_id: str, task: asyncio.Task) -> None:
+        self.running.pop(job_id, None)
+        try:
+            # A task cancelled before its first step never reaches run_agent's handler
+            job = jobs.get(job_id)
+            if task.cancelled() and job is not None and job["status"] in ("queued", "running"):
+                set_status(job_id, "cancelled")
+            evict_finished()
+        finally:
+            self._dispatch()
+
+
+scheduler = JobScheduler(MAX_CONCURRENT_JOBS, MAX_QUEUED_JOBS)
 
 AGENT_SYSTEM_PROMPT = """
 You are a WSO2 Integrator documentation automation agent.
@@ -120,6 +408,12 @@ Do not select a connection or operation until the opened palette is verified.
 """.strip()
 
 
+def usage_count(usage: object, key: str) -> int:
+    """Token count from ResultMessage.usage, which the SDK reports as a plain dict."""
+    value = usage.get(key) if isinstance(usage, dict) else getattr(usage, key, 0)
+    return value or 0
+
+
 def truncate_tool_input(tool_input: any, max_length: int = 500) -> str:
     """
     Truncate large tool inputs for readable logging.
@@ -140,11 +434,13 @@ def truncate_tool_input(tool_input: any, max_length: int = 500) -> str:
 
 
 async def run_agent(job_id: str, prompt_path: str, model: str) -> None:
-    jobs[job_id]["status"] = "running"
+    set_status(job_id, "running")
+    trace = job_traces[job_id]
 
     def log(label: str, text: str) -> None:
-        jobs[job_id]["logs"].append(f"[{label}] {text}")
+        append_log(job_id, f"[{label}] {text}")
 
+    instance = None
     try:
         prompt = Path(prompt_path).read_text()
 
@@ -152,6 +448,15 @@ async def run_agent(job_id: str, prompt_path: str, model: str) -> None:
         for subdir in ["screenshots", "workflow-docs"]:
             (Path(CWD) / "artifacts" / subdir).mkdir(parents=True, exist_ok=True)
 
+        if mcp_pool is not None:
+            waited = time.monotonic()
+            instance = await mcp_pool.acquire()
+            log("MCP", f"playwright instance {instance.index} ready after {time.monotonic() - waited:.1f}s")
+            playwright = instance.config
+        else:
+            command, *command_args = playwright_mcp_command()
+            playwright = {"command": command, "args": [*command_args, *playwright_mcp_args(SCREENSHOTS_DIR)]}
+
         async for message in query(
             prompt=prompt,
             options=ClaudeAgentOptions(
@@ -194,23 +499,12 @@ async def run_agent(job_id: str, prompt_path: str, model: str) -> None:
                 # (e.g. failing to locate the "+" icon inside automation entry point
                 # nodes).
                 disallowed_tools=["Task", "Agent"],
-                mcp_servers={
-                    "playwright": {
-                        "command": "npx",
-                        "args": [
-                            "@playwright/mcp@latest",
-                            "--headless",
-                            "--viewport-size=1720,968",
-                            f"--output-dir={CWD}/artifacts/screenshots",
-                            "--output-mode",
-                            "stdout",
-                        ],
-                    }
-                },
+                mcp_servers={"playwright": playwright},
                 permission_mode="acceptEdits",
                 max_buffer_size=32 * 1024 * 1024,  # 32 MB — screenshots at 1920x1080 can be 1.5–3 MB as base64
             ),
         ):
+            now = trace.message(type(message).__name__)
             if isinstance(message, SystemMessage):
                 session_id = getattr(message, "session_id", None)
                 subtype = getattr(message, "subtype", "unknown")
@@ -227,6 +521,17 @@ async def run_agent(job_id: str, prompt_path: str, model: str) -> None:
                         tool_input = getattr(block, "input", "")
                         truncated_input = truncate_tool_input(tool_input)
                         log("TOOL", f"{tool_name} → {truncated_input}")
+                        if isinstance(block, ToolUseBlock):
+                            TOOL_CALLS.inc(tool=block.name)
+                            trace.tool_use(block.id, block.name, jobs[job_id]["log"].count - 1, now)
+
+            elif isinstance(message, UserMessage):
+                # Tool results go back to the model as a user turn
+                if isinstance(message.content, list):
+                    for block in message.content:
+                        if isinstance(block, ToolResultBlock):
+                            trace.tool_result(block.tool_use_id, block.is_error, now)
+                trace.model_input(now)
 
             elif isinstance(message, ResultMessage):
                 log("RESULT", message.result)
@@ -235,10 +540,10 @@ async def run_agent(job_id: str, prompt_path: str, model: str) -> None:
                 turns = getattr(message, "num_turns", None)
 
                 if usage:
-                    input_tokens = getattr(usage, "input_tokens", 0)
-                    output_tokens = getattr(usage, "output_tokens", 0)
-                    cache_read = getattr(usage, "cache_read_input_tokens", 0)
-                    cache_write = getattr(usage, "cache_creation_input_tokens", 0)
+                    input_tokens = usage_count(usage, "input_tokens")
+                    output_tokens = usage_count(usage, "output_tokens")
+                    cache_read = usage_count(usage, "cache_read_input_tokens")
+                    cache_write = usage_count(usage, "cache_creation_input_tokens")
                     log(
                         "USAGE",
                         f"input={input_tokens} output={output_tokens} "
@@ -249,6 +554,15 @@ async def run_agent(job_id: str, prompt_path: str, model: str) -> None:
 
                 if turns is not None:
                     log("USAGE", f"turns={turns}")
+                    TURNS.observe(turns)
+                TOKENS.inc(input_tokens, type="input")
+                TOKENS.inc(output_tokens, type="output")
+                TOKENS.inc(cache_read, type="cache_read")
+                TOKENS.inc(cache_write, type="cache_write")
+                if getattr(message, "total_cost_usd", None) is not None:
+                    COST.inc(message.total_cost_usd)
+                if getattr(message, "is_error", False):
+                    JOB_ERRORS.inc(type="result")
 
                 # Store structured usage so it is returned in /jobs/<id> response.
                 jobs[job_id]["usage"] = {
@@ -259,18 +573,29 @@ async def run_agent(job_id: str, prompt_path: str, model: str) -> None:
                     "numTurns": turns,
                 }
 
-        jobs[job_id]["status"] = "done"
+        set_status(job_id, "done")
+    except asyncio.CancelledError:
+        log("CANCELLED", "job cancelled")
+        set_status(job_id, "cancelled")
+        raise
     except Exception as exc:
         log("ERROR", str(exc))
-        jobs[job_id]["status"] = "error"
+        JOB_ERRORS.inc(type=type(exc).__name__)
+        set_status(job_id, "error")
+    finally:
+        if instance is not None:
+            mcp_pool.release(instance)
 
 
 async def post_run(request: web.Request) -> web.Response:
     data = await request.json()
     prompt_path = data.get("prompt_path")
     model = data.get("model", AI_MODEL)
+    priority = data.get("priority", 0)
     if not prompt_path:
         return web.json_response({"error": "prompt_path required"}, status=400)
+    if not isinstance(priority, int):
+        return web.json_response({"error": "priority must be an integer"}, status=400)
     # Resolve relative paths against the project root (CWD) so callers can
     # pass paths like "./artifacts/execution-prompt/..." regardless of which
     # directory the server process was started from.
@@ -281,50 +606,232 @@ async def post_run(request: web.Request) -> web.Response:
         return web.json_response(
             {"error": f"prompt file not found: {resolved}"}, status=404
         )
+    if scheduler.is_full():
+        return web.json_response(
+            {"error": f"job queue is full ({scheduler.max_queued} waiting)"},
+            status=429,
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+    evict_finished()
     job_id = str(uuid.uuid4())
-    jobs[job_id] = {"logs": [], "status": "queued", "usage": None}
-    task = asyncio.create_task(run_agent(job_id, str(resolved), model))
-    running_tasks.add(task)
-    task.add_done_callback(running_tasks.discard)
-    return web.json_response({"job_id": job_id})
+    created_at = time.time()
+    jobs[job_id] = {
+        "log": JobLog(LOG_DIR / f"{job_id}.jsonl", LOG_MEMORY_KB * 1024, LOG_LINE_CHARS),
+        "status": "queued",
+        "usage": None,
+        "createdAt": created_at,
+        "startedAt": None,
+        "finishedAt": None,
+    }
+    job_updates[job_id] = asyncio.Event()
+    store.create(job_id, created_at)
+    scheduler.submit(job_id, lambda: run_agent(job_id, str(resolved), model), priority)
+    return web.json_response({"job_id": job_id, "queuePosition": scheduler.position(job_id)})
+
+
+def log_offset(value: str | None) -> int | None:
+    """Parse a ?since= / Last-Event-ID cursor; raises ValueError when malformed."""
+    if value is None or value == "":
+        return None
+    offset = int(value)
+    if offset < 0:
+        raise ValueError("offset must be non-negative")
+    return offset
 
 
 async def get_job(request: web.Request) -> web.Response:
     job_id = request.match_info["job_id"]
-    if job_id not in jobs:
+    response = job_summary(job_id)
+    if response is None:
+        return web.json_response({"error": "not found"}, status=404)
+    try:
+        since = log_offset(request.query.get("since"))
+    except ValueError:
+        return web.json_response({"error": "since must be a non-negative integer"}, status=400)
+    if since is not None:
+        response["logs"] = job_logs(job_id, since) if since < response["logCount"] else []
+        response["nextOffset"] = response["logCount"]
+    return web.json_response(response)
+
+
+async def stream_job(request: web.Request) -> web.StreamResponse:
+    job_id = request.match_info["job_id"]
+    if job_summary(job_id) is None:
         return web.json_response({"error": "not found"}, status=404)
-    return web.json_response(jobs[job_id])
+    # Held so the stream can finish if the job is evicted from memory meanwhile
+    job = jobs.get(job_id)
+    try:
+        # Last-Event-ID is the offset of the last line the client saw
+        last_seen = log_offset(request.headers.get("Last-Event-ID"))
+        offset = last_seen + 1 if last_seen is not None else log_offset(request.query.get("since")) or 0
+    except ValueError:
+        return web.json_response({"error": "since must be a non-negative integer"}, status=400)
+
+    response = web.StreamResponse(
+        headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+    )
+    await response.prepare(request)
+    while True:
+        # Grab the event before reading so an append between the two is not missed
+        updated = job_updates.get(job_id)
+        summary = job_summary(job_id, job)
+        if summary is None:
+            break
+        chunks = []
+        for index, line in enumerate(job_logs(job_id, offset), offset):
+            data = "".join(f"data: {part}\n" for part in line.split("\n"))
+            chunks.append(f"id: {index}\nevent: log\n{data}\n")
+        offset = max(offset, summary["logCount"])
+        if chunks:
+            await response.write("".join(chunks).encode("utf-8"))
+        if summary["status"] in FINAL_STATUSES:
+            await response.write(f"event: status\ndata: {json.dumps(summary)}\n\n".encode("utf-8"))
+            break
+        try:
+            await asyncio.wait_for(updated.wait(), STREAM_KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            await response.write(b": keepalive\n\n")
+    await response.write_eof()
+    return response
+
+
+async def delete_job(request: web.Request) -> web.Response:
+    job_id = request.match_info["job_id"]
+    summary = job_summary(job_id)
+    if summary is None:
+        return web.json_response({"error": "not found"}, status=404)
+    if not scheduler.cancel(job_id):
+        return web.json_response({"error": f"job already {summary['status']}"}, status=409)
+    return web.json_response({"status": "cancelled"})
+
+
+async def get_trace(request: web.Request) -> web.Response:
+    job_id = request.match_info["job_id"]
+    trace = job_traces.get(job_id)
+    data = trace.to_chrome() if trace is not None else store.load_trace(job_id)
+    if data is None:
+        return web.json_response({"error": "no trace for this job"}, status=404)
+    return web.json_response(data)
+
+
+async def get_metrics(request: web.Request) -> web.Response:
+    return web.Response(body=metrics.render().encode("utf-8"), headers={"Content-Type": METRICS_CONTENT_TYPE})
 
 
 async def get_health(request: web.Request) -> web.Response:
-    return web.json_response({"status": "ok"})
+    return web.json_response(
+        {
+            "status": "ok",
+            "running": len(scheduler.running),
+            "queued": len(scheduler.pending),
+            "cachedJobs": len(jobs),
+            "idleMcpServers": mcp_pool.idle.qsize() if mcp_pool is not None else None,
+        }
+    )
 
 
 async def post_shutdown(request: web.Request) -> web.Response:
-    for task in list(running_tasks):
-        task.cancel()
+    tasks = scheduler.cancel_all()
 
     async def stop_later() -> None:
-        if running_tasks:
-            await asyncio.gather(*running_tasks, return_exceptions=True)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if mcp_pool is not None:
+            await mcp_pool.close()
+        store.close()
         asyncio.get_event_loop().stop()
 
     asyncio.create_task(stop_later())
     return web.json_response({"status": "shutting down"})
 
 
+async def start_mcp_pool(app: web.Application) -> None:
+    if mcp_pool is not None:
+        await mcp_pool.start()
+
+
 def main() -> None:
+    global store, mcp_pool, JOB_CACHE_SIZE, JOB_CACHE_TTL_SECONDS, LOG_MEMORY_KB, LOG_LINE_CHARS
     parser = argparse.ArgumentParser(description="Claude Agent SDK HTTP server")
     parser.add_argument(
         "--port", type=int,
         default=int(os.environ.get("AGENT_SERVER_PORT", 8765)),
         help="Port to listen on (default: AGENT_SERVER_PORT env var, then 8765)",
     )
+    parser.add_argument(
+        "--max-concurrent-jobs", type=int, default=MAX_CONCURRENT_JOBS,
+        help="Agent jobs allowed to run at once; only 1 is supported while jobs share the "
+             "artifacts directories and code-server (default: AGENT_MAX_CONCURRENT_JOBS env var, then 1)",
+    )
+    parser.add_argument(
+        "--max-queued-jobs", type=int, default=MAX_QUEUED_JOBS,
+        help="Waiting jobs before POST /run returns 429 (default: AGENT_MAX_QUEUED_JOBS env var, then 16)",
+    )
+    parser.add_argument(
+        "--job-store", default=JOB_STORE,
+        help='SQLite file for job records and logs, or "memory" (default: AGENT_JOB_STORE env var, '
+             "then .cache/agent-server/jobs.sqlite3 in the project root)",
+    )
+    parser.add_argument(
+        "--job-cache-size", type=int, default=JOB_CACHE_SIZE,
+        help="Finished jobs kept in memory (default: AGENT_JOB_CACHE_SIZE env var, then 20)",
+    )
+    parser.add_argument(
+        "--job-cache-ttl", type=int, default=JOB_CACHE_TTL_SECONDS,
+        help="Seconds a finished job stays in memory (default: AGENT_JOB_CACHE_TTL env var, then 3600)",
+    )
+    parser.add_argument(
+        "--job-retention-days", type=float, default=JOB_RETENTION_DAYS,
+        help="Days finished jobs are kept in the job store (default: AGENT_JOB_RETENTION_DAYS env var, then 7)",
+    )
+    parser.add_argument(
+        "--mcp-pool-size", type=int, default=int(MCP_POOL_SIZE) if MCP_POOL_SIZE else None,
+        help="Warm Playwright MCP servers to keep running; 0 spawns one per job "
+             "(default: AGENT_MCP_POOL_SIZE env var, then --max-concurrent-jobs)",
+    )
+    parser.add_argument(
+        "--log-memory-kb", type=int, default=LOG_MEMORY_KB,
+        help="In-memory log view budget per job in KB (default: AGENT_LOG_MEMORY_KB env var, then 1024)",
+    )
+    parser.add_argument(
+        "--log-line-chars", type=int, default=LOG_LINE_CHARS,
+        help="Longest log line kept in memory before it is truncated "
+             "(default: AGENT_LOG_LINE_CHARS env var, then 8000)",
+    )
     args = parser.parse_args()
+    if args.max_concurrent_jobs < 1 or args.max_queued_jobs < 0:
+        parser.error("--max-concurrent-jobs must be >= 1 and --max-queued-jobs >= 0")
+    if args.max_concurrent_jobs > SUPPORTED_CONCURRENT_JOBS:
+        parser.error(
+            f"--max-concurrent-jobs {args.max_concurrent_jobs} is not supported: every job writes to the "
+            "shared artifacts/screenshots and artifacts/workflow-docs and drives the one code-server, "
+            "so concurrent jobs would mix their artifacts"
+        )
+    if args.job_cache_size < 0 or args.job_cache_ttl < 0:
+        parser.error("--job-cache-size and --job-cache-ttl must be >= 0")
+    if args.log_memory_kb < 1 or args.log_line_chars < 1:
+        parser.error("--log-memory-kb and --log-line-chars must be >= 1")
+    scheduler.max_concurrent = args.max_concurrent_jobs
+    scheduler.max_queued = args.max_queued_jobs
+    JOB_CACHE_SIZE = args.job_cache_size
+    JOB_CACHE_TTL_SECONDS = args.job_cache_ttl
+    LOG_MEMORY_KB = args.log_memory_kb
+    LOG_LINE_CHARS = args.log_line_chars
+    store = open_job_store(args.job_store, args.job_retention_days)
+    if LOG_DIR.is_dir():
+        prune_log_files(LOG_DIR, args.job_retention_days)
+    pool_size = args.max_concurrent_jobs if args.mcp_pool_size is None else args.mcp_pool_size
+    if pool_size > 0:
+        mcp_pool = McpPool(pool_size, SCREENSHOTS_DIR, Path(CWD) / ".cache" / "agent-server")
 
     app = web.Application()
+    app.on_startup.append(start_mcp_pool)
     app.router.add_post("/run", post_run)
     app.router.add_get("/jobs/{job_id}", get_job)
+    app.router.add_delete("/jobs/{job_id}", delete_job)
+    app.router.add_get("/jobs/{job_id}/stream", stream_job)
+    app.router.add_get("/jobs/{job_id}/trace", get_trace)
+    app.router.add_get("/metrics", get_metrics)
     app.router.add_get("/health", get_health)
     app.router.add_post("/shutdown", post_shutdown)
 
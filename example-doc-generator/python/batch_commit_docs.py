@@ -18,12 +18,19 @@
 """
 batch_commit_docs.py
 
-Commits one connector's generated docs to a shared batch branch without
-creating a PR. Run this once per connector after each pipeline run; then
-use batch_pr_docs.py to open a single PR covering all committed connectors.
+Commits generated connector docs to a shared batch branch without creating
+a PR. Run it after each pipeline run, or once with one --artifacts-dir per
+connector (e.g. the artifacts_archive/ entries of a batch run); then use
+batch_pr_docs.py to open a single PR covering all committed connectors.
+
+All connectors of one run share a batch session (batch_session.py): origin
+and upstream are fetched once, each connector becomes one local commit (or
+all of them one commit with --squash), and the branch is pushed once at the
+end. If a placement fails, re-running the same command resumes after the
+connectors already committed.
 
 If the batch branch does not yet exist on origin it is created from
-upstream/{base_branch}. If it already exists the commit is appended to it.
+upstream/{base_branch}. If it already exists the commits are appended to it.
 
 Usage:
     python python/batch_commit_docs.py --branch docs/batch-april-2026
@@ -36,14 +43,18 @@ Optional:
     --fork OWNER/REPO       Fork slug (default: DOCS_INTEGRATOR_FORK env var)
     --upstream OWNER/REPO   Upstream repo (default: wso2/docs-integrator)
     --base-branch BRANCH    Upstream branch to seed the batch branch from (default: main)
-    --category CATEGORY     Override auto-detected connector category
-    --artifacts-dir PATH    Pipeline artifacts directory (default: ./artifacts)
+    --category CATEGORY     Override auto-detected connector category (one connector only)
+    --artifacts-dir PATH    Pipeline artifacts directory; repeat for several connectors (default: ./artifacts)
+    --squash                Commit all connectors of this run as one commit
+    --claude-placement      Place docs with Claude Code instead of deterministically
+    --no-optimize           Place screenshots without recompressing them first
+    --quantize-screenshots  Allow lossy palette quantization of screenshots
+    --webp                  Also place lossless .webp siblings of screenshots
     --dry-run               Print planned actions without making any changes
 """
 
 import argparse
 import os
-import subprocess
 import sys
 from pathlib import Path
 
@@ -57,108 +68,21 @@ from publish_docs import (
     DEFAULT_BASE_BRANCH,
     DEFAULT_DOCS_REPO,
     DEFAULT_UPSTREAM,
-    commit_and_push,
+    add_placement_args,
+    add_screenshot_optimization_args,
     detect_category,
-    dry,
     extract_connector_info,
     fail,
     find_latest_doc,
     find_screenshots,
     info,
     infer_fork,
-    run,
-    run_claude_code_placement,
+    optimize_artifact_screenshots,
+    place_docs,
+    placed_doc_paths,
     validate_docs_repo,
-    warn,
 )
-
-
-# ── Branch helpers ────────────────────────────────────────────────────────────
-
-def branch_exists_on_origin(docs_repo: Path, branch: str) -> bool:
-    """Return True if the branch already exists on the origin remote."""
-    try:
-        result = run(
-            ["git", "ls-remote", "--heads", "origin", branch],
-            cwd=docs_repo,
-        )
-        return bool(result.strip())
-    except subprocess.CalledProcessError:
-        return False
-
-
-def checkout_or_create_batch_branch(
-    docs_repo: Path,
-    branch: str,
-    dry_run: bool,
-    upstream_slug: str = DEFAULT_UPSTREAM,
-    base_branch: str = "main",
-) -> None:
-    """
-    Check out the batch branch, creating it from upstream/{base_branch} if it
-    doesn't exist yet on origin.
-    """
-    remotes = run(["git", "remote"], cwd=docs_repo).split()
-    if "upstream" not in remotes:
-        fail(
-            "'upstream' remote not found in docs repo.\n"
-            f"Add it with: git remote add upstream https://github.com/{upstream_slug}.git"
-        )
-
-    if dry_run:
-        dry(f"git fetch origin upstream  (in {docs_repo})")
-        if branch_exists_on_origin(docs_repo, branch):
-            dry(f"Branch '{branch}' exists on origin — git checkout -B {branch} origin/{branch}")
-        else:
-            dry(f"Branch '{branch}' not found on origin — create from upstream/{base_branch}")
-            dry(f"git checkout {base_branch} && git merge upstream/{base_branch} --ff-only")
-            dry(f"git checkout -b {branch}")
-        dry(f"git merge upstream/{base_branch} --no-edit  (sync latest upstream into batch branch)")
-        dry(f"git push origin {branch}")
-        return
-
-    info("Fetching origin and upstream...")
-    subprocess.run(["git", "fetch", "origin"], cwd=str(docs_repo), check=True)
-    subprocess.run(["git", "fetch", "upstream"], cwd=str(docs_repo), check=True)
-
-    if branch_exists_on_origin(docs_repo, branch):
-        info(f"Batch branch '{branch}' already exists — checking out...")
-        subprocess.run(
-            ["git", "checkout", "-B", branch, f"origin/{branch}"],
-            cwd=str(docs_repo),
-            check=True,
-        )
-    else:
-        info(f"Batch branch '{branch}' not found on origin — creating from upstream/{base_branch}...")
-        subprocess.run(["git", "checkout", base_branch], cwd=str(docs_repo), check=True)
-        try:
-            subprocess.run(
-                ["git", "merge", f"upstream/{base_branch}", "--ff-only"],
-                cwd=str(docs_repo),
-                check=True,
-            )
-        except subprocess.CalledProcessError:
-            fail(
-                f"Could not fast-forward fork's {base_branch} to upstream/{base_branch}.\n"
-                "Your fork has diverged. Resolve manually before running this script."
-            )
-        info(f"Creating batch branch: {branch}")
-        subprocess.run(["git", "checkout", "-b", branch], cwd=str(docs_repo), check=True)
-
-    # Always merge latest upstream into the batch branch before adding a new commit
-    info(f"Merging upstream/{base_branch} into '{branch}' to stay up to date...")
-    try:
-        subprocess.run(
-            ["git", "merge", f"upstream/{base_branch}", "--no-edit"],
-            cwd=str(docs_repo),
-            check=True,
-        )
-    except subprocess.CalledProcessError:
-        fail(
-            f"Merge conflict when pulling upstream/{base_branch} into '{branch}'.\n"
-            "Resolve conflicts manually, then re-run."
-        )
-    subprocess.run(["git", "push", "origin", branch], cwd=str(docs_repo), check=True)
+from batch_session import BatchSession
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
@@ -178,6 +102,10 @@ def parse_args() -> argparse.Namespace:
             "  # Second connector — appends to the same branch:\n"
             "  python python/batch_commit_docs.py --branch docs/batch-april-2026\n"
             "\n"
+            "  # Several archived connectors in one session, one push:\n"
+            "  python python/batch_commit_docs.py --branch docs/batch-april-2026 \\\n"
+            "    --artifacts-dir artifacts_archive/mysql --artifacts-dir artifacts_archive/kafka\n"
+            "\n"
             "  # Dry run:\n"
             "  python python/batch_commit_docs.py --branch docs/batch-april-2026 --dry-run\n"
         ),
@@ -215,14 +143,27 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--category",
         metavar="CATEGORY",
-        help=f"Override auto-detected category. Choices: {', '.join(AVAILABLE_CATEGORIES)}",
+        help=(
+            "Override auto-detected category; only with a single --artifacts-dir. "
+            f"Choices: {', '.join(AVAILABLE_CATEGORIES)}"
+        ),
     )
     parser.add_argument(
         "--artifacts-dir",
-        default="./artifacts",
+        action="append",
         metavar="PATH",
-        help="Pipeline artifacts directory (default: ./artifacts)",
+        help=(
+            "Pipeline artifacts directory; repeat to commit several connectors "
+            "in one session (default: ./artifacts)"
+        ),
+    )
+    parser.add_argument(
+        "--squash",
+        action="store_true",
+        help="Commit all connectors of this run as a single commit",
     )
+    add_placement_args(parser)
+    add_screenshot_optimization_args(parser)
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -235,53 +176,78 @@ def main() -> None:
     args = parse_args()
 
     docs_repo = Path(args.docs_repo).resolve()
-    artifacts_dir = Path(args.artifacts_dir).resolve()
+    artifacts_dirs = [Path(path).resolve() for path in args.artifacts_dir or ["./artifacts"]]
+    if args.category and len(artifacts_dirs) > 1:
+        fail(
+            f"--category would apply to all {len(artifacts_dirs)} connectors. "
+            "Drop it to auto-detect each category, or commit that connector in its own run."
+        )
 
     if args.dry_run:
         print("=" * 79)
         print("DRY RUN — no changes will be made")
         print("=" * 79)
 
-    # ── 1. Read artifacts ─────────────────────────────────────────────────────
-    source_doc_path, doc_content = find_latest_doc(artifacts_dir)
-    connector_name, connector_slug, _ = extract_connector_info(doc_content, artifacts_dir)
-    screenshot_files = find_screenshots(artifacts_dir)
+    # ── 1. Read artifacts and detect categories, before touching git ──────────
+    connectors = []
+    for artifacts_dir in artifacts_dirs:
+        source_doc_path, doc_content = find_latest_doc(artifacts_dir)
+        connector_name, connector_slug, _ = extract_connector_info(doc_content, artifacts_dir)
+        connectors.append({
+            "artifacts_dir": artifacts_dir,
+            "source_doc_path": source_doc_path,
+            "name": connector_name,
+            "slug": connector_slug,
+            "screenshots": find_screenshots(artifacts_dir),
+            "category": detect_category(connector_slug, args.category),
+        })
 
     # ── 2. Validate docs repo ─────────────────────────────────────────────────
     validate_docs_repo(docs_repo)
     fork = args.fork or infer_fork(docs_repo)
     info(f"Fork: {fork}  |  Upstream: {args.upstream}  |  Base branch: {args.base_branch}")
 
-    # ── 3. Detect category ────────────────────────────────────────────────────
-    category = detect_category(connector_slug, args.category)
-
-    # ── 4. Check out or create the batch branch ───────────────────────────────
+    # ── 4. Open the batch session (one fetch, branch checked out) ─────────────
     info(f"Batch branch: {args.branch}")
-    checkout_or_create_batch_branch(
-        docs_repo, args.branch, args.dry_run,
-        upstream_slug=args.upstream, base_branch=args.base_branch,
+    session = BatchSession(
+        docs_repo, args.branch, args.upstream, args.base_branch, args.squash, args.dry_run
     )
+    session.open()
+
+    for connector in connectors:
+        category, connector_slug = connector["category"], connector["slug"]
+        info(f"── {connector['name']} ({category}/{connector_slug})")
+
+        def place(connector: dict = connector) -> None:
+            screenshot_files = connector["screenshots"]
+            # ── 4b. Optimize screenshots ──────────────────────────────────────
+            if not args.no_optimize:
+                screenshot_files = optimize_artifact_screenshots(
+                    connector["artifacts_dir"], screenshot_files,
+                    args.quantize_screenshots, args.webp, args.dry_run,
+                )
+            # ── 5–8. Place example.md, copy screenshots, update sidebar ───────
+            place_docs(
+                docs_repo, connector["category"], connector["slug"], connector["name"],
+                connector["source_doc_path"], screenshot_files, args.claude_placement, args.dry_run,
+            )
 
-    # ── 5–8. Place example.md, copy screenshots, update sidebar ───────────────
-    run_claude_code_placement(
-        docs_repo, category, connector_slug, connector_name,
-        source_doc_path, screenshot_files, args.dry_run,
-    )
+        # ── 9. Commit locally ─────────────────────────────────────────────────
+        generated_paths = placed_doc_paths(docs_repo, category, connector_slug)
+        session.commit(
+            connector_slug, f"docs: add {connector['name']} connector example guide", generated_paths, place
+        )
 
-    # ── 9. Commit and push ────────────────────────────────────────────────────
-    generated_paths = [
-        docs_repo / "en" / "docs" / "connectors" / "catalog" / category / connector_slug / "example.md",
-        docs_repo / "en" / "static" / "img" / "connectors" / "catalog" / category / connector_slug,
-        docs_repo / "en" / "sidebars.ts",
-    ]
-    commit_and_push(docs_repo, connector_name, args.branch, args.dry_run, generated_paths)
+    # ── 10. Squash (optional) and push once ───────────────────────────────────
+    session.finish(f"docs: add connector example guides for {len(connectors)} connectors")
 
+    names = ", ".join(connector["name"] for connector in connectors)
     print()
     print("=" * 79)
     if args.dry_run:
         print("Dry run complete. Remove --dry-run to execute.")
     else:
-        print(f"Done!  '{connector_name}' committed to branch: {args.branch}")
+        print(f"Done!  {names} committed to branch: {args.branch}")
         print("Run 'make batch-pr-docs' when all connectors are committed.")
     print("=" * 79)
 
@@ -18,15 +18,22 @@
 """
 batch_commit_sample.py
 
-Commits one connector's generated Ballerina sample to a shared batch branch
-without creating a PR. Run this once per connector after each pipeline run;
-then use batch_pr_samples.py to open a single PR covering all committed samples.
-
-After committing, deletes the local project and closes VS Code editor tabs —
+Commits generated Ballerina samples to a shared batch branch without creating
+a PR. Run it after each pipeline run, or once with one --project-path per
+project; then use batch_pr_samples.py to open a single PR covering all
+committed samples.
+
+All projects of one run share a batch session (batch_session.py): origin and
+upstream are fetched once, each project becomes one local commit (or all of
+them one commit with --squash), and the branch is pushed once at the end. If
+a project fails, re-running the same command resumes after the projects
+already committed.
+
+After pushing, deletes the local projects and closes VS Code editor tabs —
 same cleanup as publish_sample.py.
 
 If the batch branch does not yet exist on origin it is created from
-upstream/{base_branch}. If it already exists the commit is appended to it.
+upstream/{base_branch}. If it already exists the commits are appended to it.
 
 Usage:
     python python/batch_commit_sample.py
@@ -38,13 +45,14 @@ Optional:
     --upstream OWNER/REPO   Upstream repo (default: wso2/integration-samples)
     --base-branch BRANCH    Upstream branch to seed the batch branch from (default: main)
     --url URL               code-server URL for closing editor tabs (default: http://localhost:8080)
-    --project-path PATH     Manual project path override (writes created-project.txt)
+    --project-path PATH     Manual project path override; repeat for several projects
+                            (a single one is written to created-project.txt)
+    --squash                Commit all projects of this run as one commit
     --dry-run               Print planned actions without making any changes
 """
 
 import argparse
 import os
-import subprocess
 import sys
 from pathlib import Path
 
@@ -60,102 +68,17 @@ from publish_sample import (
     DEFAULT_UPSTREAM_REPO,
     PROJECT_PATH_FILE,
     close_editor_tabs,
-    commit_and_push,
     copy_sample,
     delete_project,
-    dry,
     fail,
     find_ballerina_project,
     info,
     infer_fork,
     patch_ballerina_toml,
     read_project_path,
-    run,
-    warn,
     write_sample_log,
 )
-
-
-# ── Branch helpers ────────────────────────────────────────────────────────────
-
-def branch_exists_on_origin(samples_repo: Path, branch: str) -> bool:
-    """Return True if the branch already exists on the origin remote."""
-    result = run(["git", "ls-remote", "--heads", "origin", branch], cwd=samples_repo)
-    return bool(result.strip())
-
-def checkout_or_create_batch_branch(
-    samples_repo: Path,
-    branch: str,
-    dry_run: bool,
-    upstream_slug: str = DEFAULT_UPSTREAM_REPO,
-    base_branch: str = "main",
-) -> None:
-    """
-    Check out the batch branch (creating it from upstream/{base_branch} if absent),
-    then always merge upstream/{base_branch} to ensure the branch is up to date
-    with the latest upstream changes before adding a new connector commit.
-    """
-    remotes = run(["git", "remote"], cwd=samples_repo).split()
-    if "upstream" not in remotes:
-        fail(
-            "'upstream' remote not found in integration-samples repo.\n"
-            f"Add it with: git remote add upstream https://github.com/{upstream_slug}.git"
-        )
-
-    if dry_run:
-        dry(f"git fetch origin upstream  (in {samples_repo})")
-        if branch_exists_on_origin(samples_repo, branch):
-            dry(f"Branch '{branch}' exists on origin — git checkout -B {branch} origin/{branch}")
-        else:
-            dry(f"Branch '{branch}' not on origin — create from upstream/{base_branch}")
-            dry(f"git checkout {base_branch} && git merge upstream/{base_branch} --ff-only")
-            dry(f"git checkout -b {branch}")
-        dry(f"git merge upstream/{base_branch} --no-edit  (sync latest upstream into batch branch)")
-        dry(f"git push origin {branch}")
-        return
-
-    info("Fetching origin and upstream...")
-    subprocess.run(["git", "fetch", "origin"], cwd=str(samples_repo), check=True)
-    subprocess.run(["git", "fetch", "upstream"], cwd=str(samples_repo), check=True)
-
-    if branch_exists_on_origin(samples_repo, branch):
-        info(f"Batch branch '{branch}' already exists — checking out...")
-        subprocess.run(
-            ["git", "checkout", "-B", branch, f"origin/{branch}"],
-            cwd=str(samples_repo),
-            check=True,
-        )
-    else:
-        info(f"Batch branch '{branch}' not found on origin — creating from upstream/{base_branch}...")
-        subprocess.run(["git", "checkout", base_branch], cwd=str(samples_repo), check=True)
-        try:
-            subprocess.run(
-                ["git", "merge", f"upstream/{base_branch}", "--ff-only"],
-                cwd=str(samples_repo),
-                check=True,
-            )
-        except subprocess.CalledProcessError:
-            fail(
-                f"Could not fast-forward fork's {base_branch} to upstream/{base_branch}.\n"
-                "Your fork has diverged. Resolve manually before running this script."
-            )
-        info(f"Creating batch branch: {branch}")
-        subprocess.run(["git", "checkout", "-b", branch], cwd=str(samples_repo), check=True)
-
-    # Always merge latest upstream into the batch branch before adding a new commit
-    info(f"Merging upstream/{base_branch} into '{branch}' to stay up to date...")
-    try:
-        subprocess.run(
-            ["git", "merge", f"upstream/{base_branch}", "--no-edit"],
-            cwd=str(samples_repo),
-            check=True,
-        )
-    except subprocess.CalledProcessError:
-        fail(
-            f"Merge conflict when pulling upstream/{base_branch} into '{branch}'.\n"
-            "Resolve conflicts manually, then re-run."
-        )
-    subprocess.run(["git", "push", "origin", branch], cwd=str(samples_repo), check=True)
+from batch_session import BatchSession
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
@@ -210,12 +133,18 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--project-path",
+        action="append",
         metavar="PATH",
         help=(
-            "Absolute path to the created integration project. "
-            "When provided, writes it to created-project.txt before proceeding."
+            "Absolute path to a created integration project; repeat to commit several "
+            "projects in one session. A single path is written to created-project.txt."
         ),
     )
+    parser.add_argument(
+        "--squash",
+        action="store_true",
+        help="Commit all projects of this run as a single commit",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -227,67 +156,86 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     samples_repo = Path(args.samples_repo).resolve()
+    project_paths = args.project_path or []
 
     if args.dry_run:
         print("=" * 79)
         print("DRY RUN — no changes will be made")
         print("=" * 79)
 
-    # ── 0. Write project path file if supplied manually ───────────────────────
-    if args.project_path:
+    # ── 0. Write project path file if a single one is supplied manually ───────
+    if len(project_paths) == 1:
         path_file = Path(PROJECT_PATH_FILE)
         if args.dry_run:
             info(f"[dry-run] Would write project path to {PROJECT_PATH_FILE}")
         else:
             path_file.parent.mkdir(parents=True, exist_ok=True)
-            path_file.write_text(args.project_path.strip(), encoding="utf-8")
+            path_file.write_text(project_paths[0].strip(), encoding="utf-8")
             info(f"Written project path to {PROJECT_PATH_FILE}")
 
-    # ── 1. Read project path ──────────────────────────────────────────────────
-    project = read_project_path()
+    # ── 1. Read project paths ─────────────────────────────────────────────────
+    if len(project_paths) > 1:
+        projects = [Path(path.strip()) for path in project_paths]
+        for project in projects:
+            if not project.exists():
+                fail(f"Project directory not found: {project}")
+    else:
+        projects = [read_project_path()]
 
     # ── 2. Validate samples repo ──────────────────────────────────────────────
     if not (samples_repo / ".git").exists():
         fail(f"{samples_repo} is not a git repository.")
     fork = infer_fork(samples_repo)
 
-    # ── 3. Resolve actual Ballerina project + derive name ─────────────────────
-    actual_project = find_ballerina_project(project)
-    project_name = actual_project.name
-    info(f"Fork: {fork}  |  Upstream: {args.upstream}  |  Project: {project_name}")
+    # ── 3. Resolve actual Ballerina projects + derive names ───────────────────
+    actual_projects = [find_ballerina_project(project) for project in projects]
+    project_names = [actual.name for actual in actual_projects]
+    info(f"Fork: {fork}  |  Upstream: {args.upstream}  |  Projects: {', '.join(project_names)}")
 
-    # ── 4. Check out or create the batch branch ───────────────────────────────
+    # ── 4. Open the batch session (one fetch, branch checked out) ─────────────
     info(f"Batch branch: {args.branch}")
-    checkout_or_create_batch_branch(
-        samples_repo, args.branch, args.dry_run,
-        upstream_slug=args.upstream, base_branch=args.base_branch,
+    session = BatchSession(
+        samples_repo, args.branch, args.upstream, args.base_branch, args.squash, args.dry_run
     )
+    session.open()
+
+    for actual_project, project_name in zip(actual_projects, project_names):
+        info(f"── {project_name}")
+
+        def place(actual_project: Path = actual_project, project_name: str = project_name) -> None:
+            # ── 5. Patch org in Ballerina.toml ────────────────────────────────
+            patch_ballerina_toml(actual_project, args.dry_run)
+            # ── 6. Copy sample ────────────────────────────────────────────────
+            copy_sample(samples_repo, actual_project, project_name, args.dry_run)
+
+        # ── 7. Commit locally ─────────────────────────────────────────────────
+        session.commit(
+            project_name,
+            f"samples: add {project_name} connector integration sample",
+            [samples_repo / "connectors" / project_name],
+            place,
+        )
 
-    # ── 5. Patch org in Ballerina.toml ────────────────────────────────────────
-    patch_ballerina_toml(actual_project, args.dry_run)
-
-    # ── 6. Copy sample ────────────────────────────────────────────────────────
-    copy_sample(samples_repo, actual_project, project_name, args.dry_run)
-
-    # ── 7. Commit and push ────────────────────────────────────────────────────
-    commit_and_push(samples_repo, project_name, args.branch, args.dry_run)
+    # ── 8. Squash (optional) and push once ────────────────────────────────────
+    session.finish(f"samples: add connector integration samples for {len(project_names)} projects")
 
-    # ── 8. Write sample log ───────────────────────────────────────────────────
-    write_sample_log(project_name, args.dry_run)
+    # ── 9. Write sample log ───────────────────────────────────────────────────
+    write_sample_log(project_names, args.dry_run)
 
     print()
     print("=" * 79)
     if args.dry_run:
         print("Dry run complete. Remove --dry-run to execute.")
     else:
-        print(f"Done!  '{project_name}' committed to branch: {args.branch}")
+        print(f"Done!  {', '.join(project_names)} committed to branch: {args.branch}")
         print("Run 'make batch-pr-samples' when all connectors are committed.")
     print("=" * 79)
 
-    # ── 9. Delete local project ───────────────────────────────────────────────
-    delete_project(project, args.dry_run)
+    # ── 10. Delete local projects ─────────────────────────────────────────────
+    for project in projects:
+        delete_project(project, args.dry_run)
 
-    # ── 10. Close editor tabs ─────────────────────────────────────────────────
+    # ── 11. Close editor tabs ─────────────────────────────────────────────────
     close_editor_tabs(args.url, args.dry_run)
 
 
@@ -22,7 +22,8 @@ Creates a single pull request from a shared batch branch that already has
 multiple connector docs committed to it by batch_commit_docs.py.
 
 Reads the git log of the branch to discover which connectors were committed
-and builds a combined PR body listing all of them.
+and builds a combined PR body listing all of them, with preview screenshots of
+every example page on the branch, captured concurrently from one preview server.
 
 Usage:
     python python/batch_pr_docs.py --branch docs/batch-april-2026
@@ -35,6 +36,11 @@ Optional:
     --fork OWNER/REPO       Fork slug (default: DOCS_INTEGRATOR_FORK env var)
     --upstream OWNER/REPO   Upstream repo to target (default: wso2/docs-integrator)
     --base-branch BRANCH    Target branch for the PR (default: main)
+    --artifacts-dir PATH    Output directory for preview screenshots (default: ./artifacts)
+    --no-preview            Skip preview screenshots
+    --preview-url URL       Reuse a running preview server (default: DOCS_PREVIEW_URL env var)
+    --preview-mode MODE     Server to start otherwise: dev or static (default: dev)
+    --preview-capture MODE  tiled (viewport-height slices) or full (one image) (default: tiled)
     --dry-run               Print planned actions without making any changes
 """
 
@@ -54,12 +60,16 @@ from publish_docs import (
     DEFAULT_BASE_BRANCH,
     DEFAULT_DOCS_REPO,
     DEFAULT_UPSTREAM,
+    add_preview_args,
     create_pr,
     dry,
     fail,
     info,
     infer_fork,
     run,
+    shared_preview_server,
+    take_batch_preview_screenshots,
+    upload_preview_as_release,
     validate_docs_repo,
     warn,
 )
@@ -68,42 +78,45 @@ from pr_preview import checkout_branch
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def read_connectors_from_branch(docs_repo: Path, base_branch: str) -> list[str]:
+def branch_log_range(docs_repo: Path, base_branch: str) -> str:
     """
-    Parse the git log of the current branch since its merge base with the
-    remote base branch and return the
-    list of connector names found in commit messages of the form
-    "docs: add {ConnectorName} connector example guide".
-
-    If no merge base is found, falls back to commits since
-    origin/{base_branch}.
+    The commits of the current branch since its merge base with
+    upstream/{base_branch}, which batch sessions merge into the branch. The
+    fork's origin/{base_branch} is not moved by that merge, so a merge base
+    with it would also take in pages other people added upstream; it is only
+    used when the docs repo has no upstream remote. If no merge base is found,
+    falls back to commits since origin/{base_branch}.
     """
-    merge_base = ""
-    try:
-        merge_base = run(
-            ["git", "merge-base", f"origin/{base_branch}", "HEAD"],
-            cwd=docs_repo,
-        ).strip()
-    except subprocess.CalledProcessError:
-        pass
+    for base in (f"upstream/{base_branch}", f"origin/{base_branch}"):
+        try:
+            merge_base = run(["git", "merge-base", base, "HEAD"], cwd=docs_repo).strip()
+        except subprocess.CalledProcessError:
+            continue
+        if merge_base:
+            info(f"Reading connectors committed since merge base {merge_base[:8]} with {base}")
+            return f"{merge_base}..HEAD"
 
-    if merge_base:
-        info(f"Reading connectors committed since merge base {merge_base[:8]}")
-        log_range = f"{merge_base}..HEAD"
-    else:
-        info(f"No merge base found on branch; using origin/{base_branch}..HEAD")
-        log_range = f"origin/{base_branch}..HEAD"
+    info(f"No merge base found on branch; using origin/{base_branch}..HEAD")
+    return f"origin/{base_branch}..HEAD"
 
+
+def read_connectors_from_branch(docs_repo: Path, log_range: str) -> list[str]:
+    """
+    Parse the git log of `log_range` and return the list of connector names
+    found in commit messages of the form
+    "docs: add {ConnectorName} connector example guide".
+    """
     try:
         log = run(
-            ["git", "log", log_range, "--pretty=format:%s"],
+            ["git", "log", log_range, "--pretty=format:%B"],
             cwd=docs_repo,
         )
     except subprocess.CalledProcessError:
         warn(f"Could not read git log for {log_range}. Trying HEAD~20...")
-        log = run(["git", "log", "HEAD~20..HEAD", "--pretty=format:%s"], cwd=docs_repo)
+        log = run(["git", "log", "HEAD~20..HEAD", "--pretty=format:%B"], cwd=docs_repo)
 
     connectors: list[str] = []
+    # Full messages: a --squash commit lists each connector's subject in its body
     for subject in log.splitlines():
         m = re.match(r"docs: add (.+) connector example guide", subject, re.IGNORECASE)
         if m:
@@ -117,11 +130,35 @@ def read_connectors_from_branch(docs_repo: Path, base_branch: str) -> list[str]:
     return connectors
 
 
+def read_example_pages_from_branch(docs_repo: Path, log_range: str) -> list[tuple[str, str]]:
+    """
+    Return the (connector_slug, category) of every example.md added or changed
+    in `log_range`, i.e. the pages the batch PR adds to the docs site.
+    """
+    try:
+        changed = run(
+            ["git", "diff", "--name-only", "--diff-filter=AM", log_range,
+             "--", "en/docs/connectors/catalog"],
+            cwd=docs_repo,
+        )
+    except subprocess.CalledProcessError:
+        warn(f"Could not list the example pages changed in {log_range}.")
+        return []
+
+    pages: list[tuple[str, str]] = []
+    for path in changed.splitlines():
+        m = re.fullmatch(r"en/docs/connectors/catalog/([^/]+)/([^/]+)/example\.md", path)
+        if m:
+            pages.append((m.group(2), m.group(1)))
+    return pages
+
+
 def build_batch_pr_body(
     connector_names: list[str],
     branch: str,
     base_branch: str,
     upstream: str,
+    preview_urls: dict[str, list[str]] | None = None,
 ) -> str:
     """Build a PR description that lists all connectors included in the batch."""
     if connector_names:
@@ -131,6 +168,21 @@ def build_batch_pr_body(
         connector_list = "- (could not detect connector names from git log)"
         connector_summary = "multiple connectors"
 
+    preview_section = ""
+    if preview_urls:
+        previews = "\n\n".join(
+            f"### {connector_slug}\n\n" + "\n\n".join(
+                f"![{connector_slug} desktop preview {i + 1:02d}]({url})"
+                for i, url in enumerate(urls)
+            )
+            for connector_slug, urls in preview_urls.items()
+        )
+        preview_section = (
+            "\n\n## Doc page previews (desktop)\n\n"
+            "> Playwright screenshots of the rendered example pages taken locally.\n\n"
+            f"{previews}"
+        )
+
     return f"""\
 ## Purpose
 
@@ -162,6 +214,7 @@ Added connector example guides for: {", ".join(connector_names) if connector_nam
 
 - Followed secure coding standards: N/A (documentation only)
 - Ran FindSecurityBugs plugin: N/A (documentation only)
+{preview_section}
 """
 
 
@@ -210,6 +263,18 @@ def parse_args() -> argparse.Namespace:
         metavar="BRANCH",
         help=f"Target branch in the upstream repo (default: {DEFAULT_BASE_BRANCH})",
     )
+    parser.add_argument(
+        "--artifacts-dir",
+        default="./artifacts",
+        metavar="PATH",
+        help="Output directory for preview screenshots (default: ./artifacts)",
+    )
+    parser.add_argument(
+        "--no-preview",
+        action="store_true",
+        help="Skip Playwright preview screenshots",
+    )
+    add_preview_args(parser)
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -222,6 +287,7 @@ def main() -> None:
     args = parse_args()
 
     docs_repo = Path(args.docs_repo).resolve()
+    artifacts_dir = Path(args.artifacts_dir).resolve()
 
     if args.dry_run:
         print("=" * 79)
@@ -238,8 +304,11 @@ def main() -> None:
 
     # ── 3. Discover connectors from git log ────────────────────────────────────
     connector_names: list[str] = []
+    example_pages: list[tuple[str, str]] = []
     if not args.dry_run:
-        connector_names = read_connectors_from_branch(docs_repo, args.base_branch)
+        log_range = branch_log_range(docs_repo, args.base_branch)
+        connector_names = read_connectors_from_branch(docs_repo, log_range)
+        example_pages = read_example_pages_from_branch(docs_repo, log_range)
         if connector_names:
             info(f"Found {len(connector_names)} connector(s) in branch log:")
             for name in connector_names:
@@ -249,12 +318,27 @@ def main() -> None:
     else:
         dry(f"Read git log {args.branch} since origin/{args.base_branch} to find connector names")
 
-    # ── 4. Build PR body ───────────────────────────────────────────────────────
+    # ── 4. Preview screenshots of every example page (not committed) ───────────
+    preview_urls: dict[str, list[str]] = {}
+    if not args.no_preview and (example_pages or args.dry_run):
+        try:
+            preview_files = take_batch_preview_screenshots(
+                docs_repo, example_pages, artifacts_dir, args.dry_run,
+                shared_preview_server(args.preview_url), args.preview_mode, args.preview_capture,
+            )
+            for connector_slug, files in preview_files.items():
+                urls = upload_preview_as_release(files, connector_slug, connector_slug, args.branch, fork)
+                if urls:
+                    preview_urls[connector_slug] = urls
+        except Exception as exc:
+            warn(f"Preview step failed (continuing to PR creation): {exc}")
+
+    # ── 5. Build PR body ───────────────────────────────────────────────────────
     pr_body = build_batch_pr_body(
-        connector_names, args.branch, args.base_branch, args.upstream
+        connector_names, args.branch, args.base_branch, args.upstream, preview_urls
     )
 
-    # ── 5. Create PR ───────────────────────────────────────────────────────────
+    # ── 6. Create PR ───────────────────────────────────────────────────────────
     pr_title = f"docs: adding docs from {args.branch}"
 
     fork_owner = fork.split("/")[0]
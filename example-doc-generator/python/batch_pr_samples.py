@@ -99,14 +99,15 @@ def read_samples_from_branch(samples_repo: Path, base_branch: str) -> list[str]:
 
     try:
         log = run(
-            ["git", "log", log_range, "--pretty=format:%s"],
+            ["git", "log", log_range, "--pretty=format:%B"],
             cwd=samples_repo,
         )
     except subprocess.CalledProcessError:
         warn(f"Could not read git log for {log_range}. Trying HEAD~20...")
-        log = run(["git", "log", "HEAD~20..HEAD", "--pretty=format:%s"], cwd=samples_repo)
+        log = run(["git", "log", "HEAD~20..HEAD", "--pretty=format:%B"], cwd=samples_repo)
 
     samples: list[str] = []
+    # Full messages: a --squash commit lists each connector's subject in its body
     for subject in log.splitlines():
         m = re.match(r"samples: add (.+) connector integration sample", subject, re.IGNORECASE)
         if m:
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+batch_session.py
+
+One git session for committing a batch of connectors to a shared branch,
+used by batch_commit_docs.py and batch_commit_sample.py.
+
+  - open()    fetches origin and upstream once, checks out the batch branch
+              (creating it from upstream/{base_branch} if origin lacks it) and
+              merges upstream/{base_branch} into it.
+  - commit()  runs one connector's placement and commits its paths locally.
+  - finish()  optionally squashes the session's commits into one, then pushes
+              the branch once.
+
+Progress is recorded in a manifest under .cache/batch-sessions/: the session
+base, every connector committed (with its commit) and, if a placement fails,
+the connector it failed on. The failed placement's paths are restored to HEAD.
+Running the same batch again resumes on the local branch: committed connectors
+are skipped, and nothing is fetched again.
+"""
+
+import datetime
+import json
+import subprocess
+import sys
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from publish_helpers import dry, fail, info, run, warn
+
+MANIFEST_DIR = Path(__file__).parent.parent / ".cache" / "batch-sessions"
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+class BatchSession:
+    def __init__(
+        self,
+        repo: Path,
+        branch: str,
+        upstream_slug: str,
+        base_branch: str,
+        squash: bool = False,
+        dry_run: bool = False,
+    ):
+        self.repo = repo
+        self.branch = branch
+        self.upstream_slug = upstream_slug
+        self.base_branch = base_branch
+        self.squash = squash
+        self.dry_run = dry_run
+        self.manifest_path = MANIFEST_DIR / f"{repo.name}--{branch.replace('/', '_')}.json"
+        self.manifest: dict = {}
+
+    # ── Manifest ──────────────────────────────────────────────────────────────
+
+    def _save(self) -> None:
+        self.manifest["updatedAt"] = _now()
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self.manifest_path.write_text(json.dumps(self.manifest, indent=2) + "\n", encoding="utf-8")
+
+    def _load_open_manifest(self) -> dict | None:
+        """The manifest of an unfinished session on this branch, if there is one."""
+        if not self.manifest_path.exists():
+            return None
+        manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        return manifest if manifest.get("state") == "open" else None
+
+    def committed(self) -> list[dict]:
+        return [item for item in self.manifest.get("items", []) if item["status"] == "committed"]
+
+    def _git(self, *args: str, check: bool = True, quiet: bool = False) -> subprocess.CompletedProcess:
+        output = subprocess.DEVNULL if quiet else None
+        return subprocess.run(["git", *args], cwd=str(self.repo), check=check, stdout=output, stderr=output)
+
+    def _head(self) -> str:
+        return run(["git", "rev-parse", "HEAD"], cwd=self.repo)
+
+    # ── Session ───────────────────────────────────────────────────────────────
+
+    def open(self) -> None:
+        remotes = run(["git", "remote"], cwd=self.repo).split()
+        if "upstream" not in remotes:
+            fail(
+                f"'upstream' remote not found in {self.repo}.\n"
+                f"Add it with: git remote add upstream https://github.com/{self.upstream_slug}.git"
+            )
+
+        if self.dry_run:
+            dry(f"git fetch --multiple origin upstream  (once, in {self.repo})")
+            dry(f"git checkout -B {self.branch} origin/{self.branch}  (or create it from upstream/{self.base_branch})")
+            dry(f"git merge upstream/{self.base_branch} --no-edit")
+            dry(f"Record batch manifest: {self.manifest_path}")
+            return
+
+        staged = subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=str(self.repo))
+        if staged.returncode != 0:
+            fail(f"{self.repo} has staged changes; commit or unstage them before a batch session.")
+
+        previous = self._load_open_manifest()
+        if previous and self._resume(previous):
+            return
+
+        info("Fetching origin and upstream...")
+        self._git("fetch", "--multiple", "origin", "upstream")
+        on_origin = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"refs/remotes/origin/{self.branch}"],
+            cwd=str(self.repo),
+            capture_output=True,
+        ).returncode == 0
+
+        if on_origin:
+            info(f"Batch branch '{self.branch}' already exists — checking out...")
+            self._git("checkout", "-B", self.branch, f"origin/{self.branch}")
+        else:
+            info(f"Batch branch '{self.branch}' not found on origin — creating from upstream/{self.base_branch}...")
+            self._git("checkout", self.base_branch)
+            try:
+                self._git("merge", f"upstream/{self.base_branch}", "--ff-only")
+            except subprocess.CalledProcessError:
+                fail(
+                    f"Could not fast-forward fork's {self.base_branch} to upstream/{self.base_branch}.\n"
+                    "Your fork has diverged. Resolve manually before running this script."
+                )
+            self._git("checkout", "-b", self.branch)
+
+        info(f"Merging upstream/{self.base_branch} into '{self.branch}' to stay up to date...")
+        try:
+            self._git("merge", f"upstream/{self.base_branch}", "--no-edit")
+        except subprocess.CalledProcessError:
+            fail(
+                f"Merge conflict when pulling upstream/{self.base_branch} into '{self.branch}'.\n"
+                "Resolve conflicts manually, then re-run."
+            )
+
+        head = self._head()
+        self.manifest = {
+            "repo": str(self.repo),
+            "branch": self.branch,
+            "base": head,
+            "head": head,
+            "state": "open",
+            "createdAt": _now(),
+            "items": [],
+        }
+        self._save()
+
+    def _resume(self, previous: dict) -> bool:
+        """Continue an unfinished session if the local branch is where it was left."""
+        local = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"refs/heads/{self.branch}"],
+            cwd=str(self.repo),
+            capture_output=True,
+            text=True,
+        )
+        if local.returncode != 0 or local.stdout.strip() != previous["head"]:
+            warn(
+                f"Unfinished batch session in {self.manifest_path} no longer matches "
+                f"local branch '{self.branch}' — starting a new session."
+            )
+            return False
+        self._git("checkout", self.branch)
+        self.manifest = previous
+        self.manifest.pop("failed", None)
+        done = ", ".join(item["key"] for item in self.committed()) or "none"
+        info(f"Resuming batch session on '{self.branch}' (already committed: {done})")
+        return True
+
+    def commit(self, key: str, message: str, paths: Sequence[Path], place: Callable[[], None]) -> bool:
+        """
+        Run one connector's placement and commit its paths. Returns False when
+        the connector was already committed in this session (resume).
+        """
+        if any(item["key"] == key for item in self.manifest.get("items", [])):
+            info(f"'{key}' already committed in this batch session — skipping.")
+            return False
+        if self.dry_run:
+            place()
+            dry(f"git add -- {' '.join(map(str, paths))}")
+            dry(f"git commit -m '{message}'")
+            return True
+
+        try:
+            place()
+            self._git("add", "--", *map(str, paths))
+            if subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=str(self.repo)).returncode == 0:
+                warn(f"Nothing new to commit for '{key}' — already up to date on '{self.branch}'.")
+                status = "unchanged"
+            else:
+                self._git("commit", "-m", message)
+                status = "committed"
+        except (Exception, SystemExit) as exc:
+            self._discard(paths)
+            # fail() exits after printing its message; record where to look for it
+            error = f"exited with status {exc.code}; see the output above" if isinstance(exc, SystemExit) else str(exc)
+            self.manifest["failed"] = {"key": key, "error": error, "at": _now()}
+            self._save()
+            warn(
+                f"Placement of '{key}' failed; {len(self.committed())} connector(s) are committed "
+                f"locally. Re-run the same batch to resume from '{key}'."
+            )
+            raise
+
+        head = self._head()
+        self.manifest["items"].append(
+            {"key": key, "message": message, "commit": head, "status": status, "at": _now()}
+        )
+        self.manifest["head"] = head
+        self._save()
+        return True
+
+    def _discard(self, paths: Sequence[Path]) -> None:
+        """Restore a failed placement's paths to HEAD so the next one starts clean."""
+        names = [str(path) for path in paths]
+        # One path at a time: a path new in this placement is unknown to HEAD
+        # and would make git reject the whole list
+        for name in names:
+            self._git("reset", "-q", "--", name, check=False, quiet=True)
+            self._git("checkout", "--", name, check=False, quiet=True)
+        self._git("clean", "-fdq", "--", *names, check=False, quiet=True)
+
+    def finish(self, squash_subject: str) -> None:
+        """Squash the session's commits if asked, then push the branch once."""
+        if self.dry_run:
+            if self.squash:
+                dry(f"git reset --soft <session base> && git commit -m '{squash_subject}'")
+            dry(f"git push origin {self.branch}")
+            return
+
+        items = self.committed()
+        if self.squash and len(items) > 1:
+            info(f"Squashing {len(items)} commit(s) into one...")
+            body = "\n".join(item["message"] for item in items)
+            self._git("reset", "--soft", self.manifest["base"])
+            self._git("commit", "-m", squash_subject, "-m", body)
+            self.manifest["squashed"] = self._head()
+            self.manifest["head"] = self.manifest["squashed"]
+            self._save()
+
+        info(f"Pushing branch '{self.branch}' to origin...")
+        self._git("push", "origin", self.branch)
+        self.manifest["state"] = "pushed"
+        self.manifest["pushedAt"] = _now()
+        self._save()
+        info(f"Batch manifest: {self.manifest_path}")
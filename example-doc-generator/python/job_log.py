@@ -0,0 +1,118 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+job_log.py — Per-job log with a bounded in-memory view for agent_server.py.
+
+Every log line is appended in full to the job's log file, one JSON record per
+line ({"offset": n, "text": ...}), as soon as it is logged. Memory only holds
+the view the API serves:
+
+  - A line longer than the line limit is cut short in the view, and the view
+    names the log file and offset that hold the full text.
+  - Once the view lines of a job exceed its byte budget, the oldest lines are
+    dropped from memory. Reads before that point are served from the job
+    store, or from the log file when the store keeps nothing.
+"""
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+
+
+def view_line(line: str, offset: int, path: Path, max_chars: int) -> str:
+    if len(line) <= max_chars:
+        return line
+    return f"{line[:max_chars]}… [truncated {len(line)} chars; full text: {path} offset {offset}]"
+
+
+class JobLog:
+    def __init__(self, path: Path, budget_bytes: int, max_line_chars: int):
+        self.path = path
+        self.budget_bytes = budget_bytes
+        self.max_line_chars = max_line_chars
+        self.lines: deque[str] = deque()
+        self.sizes: deque[int] = deque()
+        self.base = 0  # offset of lines[0]; everything before it lives only on disk
+        self.count = 0
+        self.memory_bytes = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = path.open("a", encoding="utf-8")
+
+    def append(self, line: str) -> str:
+        """Record a line; returns its in-memory view."""
+        offset = self.count
+        if self.file is not None:
+            self.file.write(json.dumps({"offset": offset, "text": line}) + "\n")
+            self.file.flush()
+        view = view_line(line, offset, self.path, self.max_line_chars)
+        size = len(view.encode("utf-8"))
+        self.lines.append(view)
+        self.sizes.append(size)
+        self.memory_bytes += size
+        self.count += 1
+        # Always keep the newest line, even when it alone is over budget
+        while self.memory_bytes > self.budget_bytes and len(self.lines) > 1:
+            self.lines.popleft()
+            self.memory_bytes -= self.sizes.popleft()
+            self.base += 1
+        return view
+
+    def lines_since(self, since: int) -> list[str] | None:
+        """View lines from `since`, or None when some of them are no longer in memory."""
+        if since < self.base:
+            return None
+        return list(self.lines)[since - self.base:]
+
+    def memory(self) -> dict:
+        return {
+            "logBytes": self.memory_bytes,
+            "logBudgetBytes": self.budget_bytes,
+            "linesInMemory": len(self.lines),
+            "linesOnDiskOnly": self.base,
+            "logFile": str(self.path),
+        }
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def read_log_file(path: Path, since: int, max_line_chars: int) -> list[str]:
+    """View lines from offset `since`, read back from a job's log file."""
+    lines = []
+    try:
+        with path.open(encoding="utf-8") as log:
+            for record in log:
+                entry = json.loads(record)
+                if entry["offset"] >= since:
+                    lines.append(view_line(entry["text"], entry["offset"], path, max_line_chars))
+    except FileNotFoundError:
+        pass
+    return lines
+
+
+def prune_log_files(directory: Path, retention_days: float) -> int:
+    """Delete job log files not written to within the retention window."""
+    cutoff = time.time() - retention_days * 86400
+    removed = 0
+    for path in directory.glob("*.jsonl"):
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
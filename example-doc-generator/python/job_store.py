@@ -0,0 +1,223 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+job_store.py — Durable storage for agent_server.py jobs.
+
+The server keeps active and recently finished jobs in memory; a JobStore is the
+write-through copy behind that cache. Every job record, status change and log
+line is written as it happens, and a job's trace once it finishes, so a job
+that has been evicted from memory (or outlived a server restart) can still be
+answered from disk. evictable_jobs() picks which finished jobs leave that
+memory cache.
+
+Stores
+------
+memory          No persistence. Evicted jobs are gone (the pre-store behaviour).
+<path>.sqlite3  SQLite in WAL mode. Appends are single-row autocommit inserts,
+                and readers never block the writer.
+"""
+
+import json
+import sqlite3
+import time
+from collections.abc import Collection, Iterable
+from pathlib import Path
+
+FINAL_STATUSES = ("done", "error", "cancelled")
+
+
+def evictable_jobs(
+    finished: Iterable[tuple[float, str]],
+    cache_size: int,
+    ttl_seconds: float,
+    now: float,
+    busy: Collection[str] = (),
+) -> list[str]:
+    """
+    Finished jobs, as (finishedAt, job_id), to drop from memory: those past the
+    TTL and the oldest beyond the newest `cache_size`. Busy jobs (whose task has
+    not yet run its done-callback) are kept and do not count toward the size.
+    """
+    candidates = sorted(entry for entry in finished if entry[1] not in busy)
+    excess = len(candidates) - cache_size
+    expired = now - ttl_seconds
+    return [
+        job_id
+        for index, (finished_at, job_id) in enumerate(candidates)
+        if index < excess or finished_at < expired
+    ]
+
+
+class JobStore:
+    """Interface shared by the stores; the memory store implements it as no-ops."""
+
+    persistent = False
+
+    def create(self, job_id: str, created_at: float) -> None:
+        pass
+
+    def update(self, job_id: str, status: str, usage: dict | None, finished_at: float | None) -> None:
+        pass
+
+    def append_log(self, job_id: str, offset: int, line: str) -> None:
+        pass
+
+    def load(self, job_id: str) -> dict | None:
+        """Stored summary of a job ({status, usage, createdAt, finishedAt, logCount}) or None."""
+        return None
+
+    def read_logs(self, job_id: str, since: int = 0) -> list[str]:
+        return []
+
+    def save_trace(self, job_id: str, trace: dict) -> None:
+        pass
+
+    def load_trace(self, job_id: str) -> dict | None:
+        return None
+
+    def recover(self, finished_at: float) -> list[str]:
+        """Mark jobs left queued or running by a previous process as errors; returns their ids."""
+        return []
+
+    def prune(self, finished_before: float) -> int:
+        """Delete jobs that finished before `finished_before`; returns how many were removed."""
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryJobStore(JobStore):
+    pass
+
+
+class SqliteJobStore(JobStore):
+    persistent = True
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id      TEXT PRIMARY KEY,
+            status      TEXT NOT NULL,
+            usage       TEXT,
+            created_at  REAL NOT NULL,
+            finished_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS logs (
+            job_id TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            line   TEXT NOT NULL,
+            PRIMARY KEY (job_id, offset)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS traces (
+            job_id TEXT PRIMARY KEY,
+            trace  TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit: each write is durable on its own, with no transaction left open
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last commits on power loss, never corruption
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+
+    def create(self, job_id: str, created_at: float) -> None:
+        self.db.execute(
+            "INSERT INTO jobs (job_id, status, created_at) VALUES (?, 'queued', ?)", (job_id, created_at)
+        )
+
+    def update(self, job_id: str, status: str, usage: dict | None, finished_at: float | None) -> None:
+        self.db.execute(
+            "UPDATE jobs SET status = ?, usage = ?, finished_at = ? WHERE job_id = ?",
+            (status, json.dumps(usage) if usage is not None else None, finished_at, job_id),
+        )
+
+    def append_log(self, job_id: str, offset: int, line: str) -> None:
+        self.db.execute("INSERT INTO logs (job_id, offset, line) VALUES (?, ?, ?)", (job_id, offset, line))
+
+    def load(self, job_id: str) -> dict | None:
+        row = self.db.execute(
+            "SELECT status, usage, created_at, finished_at,"
+            " (SELECT COUNT(*) FROM logs WHERE logs.job_id = jobs.job_id)"
+            " FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        status, usage, created_at, finished_at, log_count = row
+        return {
+            "status": status,
+            "usage": json.loads(usage) if usage else None,
+            "createdAt": created_at,
+            "finishedAt": finished_at,
+            "logCount": log_count,
+        }
+
+    def read_logs(self, job_id: str, since: int = 0) -> list[str]:
+        rows = self.db.execute(
+            "SELECT line FROM logs WHERE job_id = ? AND offset >= ? ORDER BY offset", (job_id, since)
+        )
+        return [line for (line,) in rows]
+
+    def save_trace(self, job_id: str, trace: dict) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO traces (job_id, trace) VALUES (?, ?)", (job_id, json.dumps(trace))
+        )
+
+    def load_trace(self, job_id: str) -> dict | None:
+        row = self.db.execute("SELECT trace FROM traces WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def recover(self, finished_at: float) -> list[str]:
+        job_ids = [
+            job_id for (job_id,) in self.db.execute(
+                "SELECT job_id FROM jobs WHERE status NOT IN (?, ?, ?)", FINAL_STATUSES
+            )
+        ]
+        for job_id in job_ids:
+            (offset,) = self.db.execute("SELECT COUNT(*) FROM logs WHERE job_id = ?", (job_id,)).fetchone()
+            self.append_log(job_id, offset, "[ERROR] agent server restarted before the job finished")
+            self.db.execute(
+                "UPDATE jobs SET status = 'error', finished_at = ? WHERE job_id = ?", (finished_at, job_id)
+            )
+        return job_ids
+
+    def prune(self, finished_before: float) -> int:
+        with self.db:
+            self.db.execute("BEGIN")
+            for table in ("logs", "traces"):
+                self.db.execute(
+                    f"DELETE FROM {table} WHERE job_id IN (SELECT job_id FROM jobs WHERE finished_at < ?)",
+                    (finished_before,),
+                )
+            removed = self.db.execute("DELETE FROM jobs WHERE finished_at < ?", (finished_before,)).rowcount
+        return removed
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def open_job_store(spec: str, retention_days: float) -> JobStore:
+    """Open the store named by --job-store and drop jobs past the retention window."""
+    if spec == "memory":
+        return MemoryJobStore()
+    store = SqliteJobStore(Path(spec))
+    now = time.time()
+    store.recover(now)
+    store.prune(now - retention_days * 86400)
+    return store
@@ -0,0 +1,178 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+job_trace.py — Timing of one agent run, exported as Chrome trace events.
+
+Every SDK message is stamped with time.monotonic() on arrival. A tool use is
+paired with its result by tool_use_id to give the tool's duration, and the time
+from the model receiving input (job start or a tool result) to its last
+assistant message before the next input is recorded as a model turn.
+
+Events are appended to the job's trace file as they happen, one JSON record per
+line, like the job log. Memory only holds the tool calls still in flight (name,
+start and the job log offset of their TOOL line) and the per-tool durations.
+
+to_chrome() reads the events back and returns the JSON object format of the
+Trace Event spec, loadable in Perfetto (ui.perfetto.dev) or chrome://tracing.
+Timestamps are microseconds from the job's start. A tool span's input preview
+is taken from its line in the job log.
+"""
+
+import json
+import time
+from pathlib import Path
+
+# Trace "threads", one row each in Perfetto
+MODEL_TID = 1
+TOOLS_TID = 2
+MESSAGES_TID = 3
+THREAD_NAMES = {MODEL_TID: "model", TOOLS_TID: "tools", MESSAGES_TID: "messages"}
+
+
+def log_previews(log_path: Path, offsets: set[int]) -> dict[int, str]:
+    """Tool input previews at the given job log offsets ("[TOOL] name → input" lines)."""
+    previews = {}
+    try:
+        with log_path.open(encoding="utf-8") as log:
+            for record in log:
+                entry = json.loads(record)
+                if entry["offset"] in offsets:
+                    previews[entry["offset"]] = entry["text"].partition(" → ")[2]
+    except FileNotFoundError:
+        pass
+    return previews
+
+
+class JobTrace:
+    def __init__(self, job_id: str, path: Path, log_path: Path, queued_seconds: float = 0.0):
+        self.job_id = job_id
+        self.path = path
+        self.log_path = log_path
+        self.started_wall = time.time()
+        self.started = time.monotonic()
+        self.queued_seconds = queued_seconds
+        self.pending_tools: dict[str, tuple[str, float, int]] = {}
+        self.tool_durations: dict[str, list[float]] = {}
+        self.model_seconds = 0.0
+        self.model_start: float | None = self.started
+        self.model_end: float | None = None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = path.open("w", encoding="utf-8")
+
+    def _us(self, moment: float) -> int:
+        return round((moment - self.started) * 1_000_000)
+
+    def _write(self, event: dict) -> None:
+        if self.file is not None:
+            self.file.write(json.dumps(event) + "\n")
+            self.file.flush()
+
+    def _span(self, name: str, tid: int, start: float, end: float, args: dict | None = None) -> None:
+        event = {
+            "name": name, "ph": "X", "pid": 1, "tid": tid,
+            "ts": self._us(start), "dur": self._us(end) - self._us(start),
+        }
+        if args:
+            event["args"] = args
+        self._write(event)
+
+    def message(self, kind: str) -> float:
+        """Stamp an SDK message; returns its monotonic arrival time."""
+        now = time.monotonic()
+        self._write({"name": kind, "ph": "i", "s": "t", "pid": 1, "tid": MESSAGES_TID, "ts": self._us(now)})
+        if kind == "AssistantMessage":
+            self.model_end = now
+        return now
+
+    def model_input(self, now: float) -> None:
+        """The model received new input (tool results): close its current turn."""
+        if self.model_start is not None and self.model_end is not None:
+            self._span("model turn", MODEL_TID, self.model_start, self.model_end)
+            self.model_seconds += self.model_end - self.model_start
+            self.model_end = None
+        self.model_start = now
+
+    def tool_use(self, tool_use_id: str, name: str, log_offset: int, now: float) -> None:
+        """A tool call whose TOOL line is at `log_offset` in the job log."""
+        self.pending_tools[tool_use_id] = (name, now, log_offset)
+
+    def tool_result(self, tool_use_id: str, is_error: bool, now: float) -> None:
+        pending = self.pending_tools.pop(tool_use_id, None)
+        if pending is None:
+            return
+        name, started, log_offset = pending
+        self._span(name, TOOLS_TID, started, now, {"logOffset": log_offset, "error": bool(is_error)})
+        self.tool_durations.setdefault(name, []).append(now - started)
+
+    def finish(self) -> None:
+        now = time.monotonic()
+        self.model_input(now)
+        self.model_start = None
+        for name, started, log_offset in self.pending_tools.values():
+            self._span(name, TOOLS_TID, started, now, {"logOffset": log_offset, "unfinished": True})
+        self.pending_tools.clear()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def tool_latency(self) -> dict:
+        """Per-tool call count and latency, for the job's usage block."""
+        latency = {}
+        for name, durations in sorted(self.tool_durations.items()):
+            ordered = sorted(durations)
+            latency[name] = {
+                "calls": len(ordered),
+                "totalMs": round(sum(ordered) * 1000),
+                "meanMs": round(sum(ordered) * 1000 / len(ordered)),
+                "p50Ms": round(ordered[len(ordered) // 2] * 1000),
+                "maxMs": round(ordered[-1] * 1000),
+            }
+        return latency
+
+    def read_events(self) -> list[dict]:
+        """The events written so far, with tool input previews from the job log."""
+        try:
+            with self.path.open(encoding="utf-8") as trace:
+                events = [json.loads(record) for record in trace]
+        except FileNotFoundError:
+            return []
+        offsets = {event["args"]["logOffset"] for event in events if "logOffset" in event.get("args", {})}
+        previews = log_previews(self.log_path, offsets) if offsets else {}
+        for event in events:
+            args = event.get("args", {})
+            if "logOffset" in args:
+                args["input"] = previews.get(args["logOffset"], "")
+        return events
+
+    def to_chrome(self) -> dict:
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"agent job {self.job_id}"}},
+            *(
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+                for tid, name in THREAD_NAMES.items()
+            ),
+        ]
+        return {
+            "traceEvents": metadata + self.read_events(),
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "jobId": self.job_id,
+                "startedAt": self.started_wall,
+                "queuedSeconds": round(self.queued_seconds, 3),
+                "modelSeconds": round(self.model_seconds, 3),
+            },
+        }
@@ -0,0 +1,207 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+mcp_pool.py — Pre-started Playwright MCP servers for agent_server.py jobs.
+
+Spawning `npx @playwright/mcp@latest` per job pays npm registry resolution,
+package unpacking and Node start-up before the agent's first browser action.
+The pool instead keeps one Playwright MCP HTTP server per job slot running
+ahead of time and hands each job the URL of an idle one.
+
+  - The package is pinned (PLAYWRIGHT_MCP_VERSION) and run from the local
+    install made by `make setup`; npx with the same pin is only the fallback.
+  - Every server runs with --isolated, so browser profiles live in memory.
+  - After a job the instance is restarted in the background, so the next job
+    gets a fresh process and browser, with no cookies, tabs or storage left
+    over from the previous one.
+  - An instance is health-checked (process alive, HTTP endpoint answering)
+    before it is handed out, and restarted if the check fails.
+  - All instances write to the same output dir, artifacts/screenshots/, since
+    the prompts name screenshots by bare filename (prefixed per connector).
+  - If some instances fail to start, the pool runs with the ones that did;
+    if none start, the ones already running are stopped and start() raises.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+PLAYWRIGHT_MCP_VERSION = os.environ.get("PLAYWRIGHT_MCP_VERSION", "0.0.78")
+# Populated by `make setup`: npm install --prefix python/.venv/playwright-mcp
+LOCAL_INSTALL = Path(__file__).parent / ".venv/playwright-mcp/node_modules/.bin/mcp-server-playwright"
+VIEWPORT = "1720,968"
+START_TIMEOUT_SECONDS = 120  # the npx fallback may still have to download the package
+HEALTH_TIMEOUT_SECONDS = 5
+
+
+def playwright_mcp_command() -> list[str]:
+    """Command that starts the pinned Playwright MCP server, preferring the local install."""
+    if LOCAL_INSTALL.exists():
+        return [str(LOCAL_INSTALL)]
+    return ["npx", "-y", f"@playwright/mcp@{PLAYWRIGHT_MCP_VERSION}"]
+
+
+def playwright_mcp_args(output_dir: Path) -> list[str]:
+    return [
+        "--headless",
+        # In-memory profile: concurrent browsers must not share one user data dir
+        "--isolated",
+        f"--viewport-size={VIEWPORT}",
+        f"--output-dir={output_dir}",
+        "--output-mode",
+        "stdout",
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class McpInstance:
+    def __init__(self, index: int, output_dir: Path, log_dir: Path):
+        self.index = index
+        self.output_dir = output_dir
+        self.log_path = log_dir / f"playwright-mcp-{index}.log"
+        self.port = 0
+        self.process: asyncio.subprocess.Process | None = None
+        self.ready_seconds = 0.0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/mcp"
+
+    @property
+    def config(self) -> dict:
+        """mcp_servers entry for ClaudeAgentOptions."""
+        return {"type": "http", "url": self.url}
+
+    async def start(self) -> None:
+        started = time.monotonic()
+        self.port = free_port()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("ab") as log:
+            self.process = await asyncio.create_subprocess_exec(
+                *playwright_mcp_command(),
+                *playwright_mcp_args(self.output_dir),
+                "--host", "127.0.0.1",
+                "--port", str(self.port),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+            )
+        deadline = started + START_TIMEOUT_SECONDS
+        while not await self.healthy():
+            if self.process.returncode is not None or time.monotonic() > deadline:
+                await self.stop()
+                raise RuntimeError(
+                    f"Playwright MCP instance {self.index} did not start; see {self.log_path}"
+                )
+            await asyncio.sleep(0.25)
+        self.ready_seconds = time.monotonic() - started
+
+    async def healthy(self) -> bool:
+        if self.process is None or self.process.returncode is not None:
+            return False
+        try:
+            async with ClientSession(timeout=ClientTimeout(total=HEALTH_TIMEOUT_SECONDS)) as session:
+                # Any HTTP answer (a bare GET is rejected without a session) means it is serving
+                async with session.get(self.url) as response:
+                    return response.status < 500
+        except (ClientError, asyncio.TimeoutError, OSError):
+            return False
+
+    async def stop(self) -> None:
+        process, self.process = self.process, None
+        if process is None or process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), 10)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+
+class McpPool:
+    """Fixed set of warm Playwright MCP servers; each job holds one for its whole run."""
+
+    def __init__(self, size: int, output_dir: Path, log_dir: Path):
+        self.instances = [McpInstance(index, output_dir, log_dir) for index in range(size)]
+        self.idle: asyncio.Queue[McpInstance] = asyncio.Queue()
+        self.recycling: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        try:
+            results = await asyncio.gather(
+                *(instance.start() for instance in self.instances), return_exceptions=True
+            )
+        except BaseException:
+            # Cancelled while starting: leave no node processes behind
+            await asyncio.gather(*(instance.stop() for instance in self.instances))
+            raise
+        started = [instance for instance, result in zip(self.instances, results) if result is None]
+        failed = [(instance, result) for instance, result in zip(self.instances, results) if result is not None]
+        if not started:
+            await asyncio.gather(*(instance.stop() for instance in self.instances))
+            raise RuntimeError(f"No Playwright MCP instance started: {failed[0][1]}") from failed[0][1]
+        for instance, error in failed:
+            print(f"[WARN] {error}; running with {len(started)} of {len(self.instances)} instances",
+                  file=sys.stderr)
+        self.instances = started
+        for instance in started:
+            self.idle.put_nowait(instance)
+
+    async def acquire(self) -> McpInstance:
+        instance = await self.idle.get()
+        if not await instance.healthy():
+            await instance.stop()
+            try:
+                await instance.start()
+            except BaseException:
+                # Keep the slot: the next acquire retries the start
+                self.idle.put_nowait(instance)
+                raise
+        return instance
+
+    def release(self, instance: McpInstance) -> None:
+        """Restart the instance in the background so the next job gets a clean browser."""
+        task = asyncio.create_task(self._recycle(instance))
+        self.recycling.add(task)
+        task.add_done_callback(self.recycling.discard)
+
+    async def _recycle(self, instance: McpInstance) -> None:
+        await instance.stop()
+        try:
+            await instance.start()
+        except RuntimeError:
+            pass  # acquire() finds it unhealthy and retries the start
+        finally:
+            self.idle.put_nowait(instance)
+
+    async def close(self) -> None:
+        for task in list(self.recycling):
+            task.cancel()
+        await asyncio.gather(*self.recycling, return_exceptions=True)
+        await asyncio.gather(*(instance.stop() for instance in self.instances))
@@ -0,0 +1,213 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+optimize_screenshots.py — Shrink workflow screenshots before they are placed
+into docs-integrator.
+
+Runs in place on artifacts/screenshots/*_screenshot_*.png:
+  - Lossless recompression (zlib level 9 with Pillow's optimizer). A flat UI
+    screenshot with at most 256 distinct colours is also tried as an exact
+    palette image, which is still pixel-identical.
+  - --quantize: allow lossy 256-colour palette quantization (no dithering) for
+    screenshots with more colours. Kept only when it is smaller.
+  - --webp: write a lossless <name>.webp sibling next to each PNG.
+
+A file is only replaced when the new encoding is smaller, and always through a
+temporary file + atomic rename. The per-connector size report is printed and,
+with --report, written as JSON.
+
+Budget: SCREENSHOT_BUDGET_KB (default 2048) — total PNG bytes per connector.
+Exceeding it is reported as a warning; it never fails the run.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SCREENSHOTS_DIR = Path("artifacts/screenshots")
+DEFAULT_BUDGET_KB = int(os.environ.get("SCREENSHOT_BUDGET_KB", "2048"))
+
+
+def _atomic_write(path: Path, data: bytes, mode: int = 0o644) -> None:
+    handle, temporary = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=path.suffix, dir=path.parent)
+    try:
+        with os.fdopen(handle, "wb") as output:
+            output.write(data)
+        # mkstemp creates 0600 files; keep the screenshot readable like its original
+        os.chmod(temporary, mode)
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+
+def _encode_png(image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _palette_candidates(image, quantize: bool) -> list[tuple[str, object]]:
+    """Return palette versions of `image` worth encoding, labelled lossless or lossy."""
+    from PIL import Image
+
+    if image.mode not in ("RGB", "RGBA"):
+        return []
+    # MEDIANCUT reproduces <= 256 colours exactly but ignores alpha; FASTOCTREE keeps alpha
+    method = Image.Quantize.FASTOCTREE if image.mode == "RGBA" else Image.Quantize.MEDIANCUT
+    if image.getcolors(256) is not None:
+        palette = image.quantize(colors=256, method=method, dither=Image.Dither.NONE)
+        # Verify instead of trusting the quantizer: only a pixel-identical result counts as lossless
+        if palette.convert(image.mode).tobytes() == image.tobytes():
+            return [("palette", palette)]
+    if quantize:
+        return [("quantized", image.quantize(colors=256, method=method, dither=Image.Dither.NONE))]
+    return []
+
+
+def optimize_image(job: tuple[Path, bool, bool]) -> dict:
+    """Optimize one PNG in place; returns its entry for the size report."""
+    from PIL import Image
+
+    path, quantize, webp = job
+    stat = path.stat()
+    before = stat.st_size
+    with Image.open(path) as image:
+        image.load()
+        if image.mode == "RGBA" and image.getextrema()[3] == (255, 255):
+            # Browser captures carry a fully opaque alpha channel; dropping it is lossless
+            image = image.convert("RGB")
+        candidates = [("recompressed", _encode_png(image))]
+        candidates += [(label, _encode_png(palette)) for label, palette in _palette_candidates(image, quantize)]
+        webp_bytes = None
+        if webp:
+            webp_path = path.with_suffix(".webp")
+            buffer = io.BytesIO()
+            # quality is the lossless effort here; method 6 is ~40x slower for a few percent
+            image.save(buffer, format="WEBP", lossless=True, quality=80, method=4)
+            _atomic_write(webp_path, buffer.getvalue())
+            webp_bytes = webp_path.stat().st_size
+    encoding, data = min(candidates, key=lambda candidate: len(candidate[1]))
+    if len(data) < before:
+        _atomic_write(path, data, stat.st_mode & 0o777)
+    else:
+        encoding = "original"
+    return {
+        "name": path.name,
+        "before": before,
+        "after": path.stat().st_size,
+        "encoding": encoding,
+        "webp": webp_bytes,
+    }
+
+
+def optimize_directory(
+    screenshots_dir: Path,
+    quantize: bool = False,
+    webp: bool = False,
+    budget_kb: int = DEFAULT_BUDGET_KB,
+    jobs: int | None = None,
+) -> dict:
+    """Optimize every workflow screenshot in `screenshots_dir` and return the size report."""
+    try:
+        from PIL import features
+    except ImportError as exc:
+        raise RuntimeError("Pillow is not installed. Run: pip install Pillow") from exc
+    if webp and not features.check("webp"):
+        raise RuntimeError("This Pillow build has no WebP support; rerun without --webp")
+
+    pngs = sorted(screenshots_dir.glob("*_screenshot_*.png"))
+    work = [(png, quantize, webp) for png in pngs]
+    if len(work) <= 1:
+        entries = [optimize_image(job) for job in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or min(len(work), os.cpu_count() or 1)) as pool:
+            entries = list(pool.map(optimize_image, work))
+    before = sum(entry["before"] for entry in entries)
+    after = sum(entry["after"] for entry in entries)
+    return {
+        "screenshots": entries,
+        "before": before,
+        "after": after,
+        "saved": before - after,
+        "webp": sum(entry["webp"] or 0 for entry in entries) if webp else None,
+        "budget": budget_kb * 1024,
+        "overBudget": after > budget_kb * 1024,
+    }
+
+
+def print_report(report: dict) -> None:
+    print("── Screenshot Optimization ───────────────────────")
+    for entry in report["screenshots"]:
+        webp = f"  webp {entry['webp'] / 1024:.0f} KB" if entry["webp"] is not None else ""
+        print(
+            f"  {entry['name']}: {entry['before'] / 1024:.0f} KB → {entry['after'] / 1024:.0f} KB "
+            f"({entry['encoding']}){webp}"
+        )
+    print(
+        f"  Total           : {report['before'] / 1024:.0f} KB → {report['after'] / 1024:.0f} KB "
+        f"({report['saved'] / 1024:.0f} KB saved)"
+    )
+    print(f"  Budget          : {report['budget'] / 1024:.0f} KB{'  (exceeded)' if report['overBudget'] else ''}")
+    print("──────────────────────────────────────────────────")
+    if report["overBudget"]:
+        print(
+            f"[WARN]  Screenshots total {report['after'] / 1024:.0f} KB, over the "
+            f"{report['budget'] / 1024:.0f} KB budget — consider --quantize.",
+            file=sys.stderr,
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Losslessly shrink pipeline screenshots in place before docs placement."
+    )
+    parser.add_argument("--screenshots-dir", type=Path, default=SCREENSHOTS_DIR,
+                        help=f"Directory of *_screenshot_*.png files (default: {SCREENSHOTS_DIR})")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Allow lossy 256-colour palette quantization when it is smaller.")
+    parser.add_argument("--webp", action="store_true",
+                        help="Also write a lossless .webp sibling for each screenshot.")
+    parser.add_argument("--budget-kb", type=int, default=DEFAULT_BUDGET_KB,
+                        help=f"Total PNG size budget per connector in KB (default: {DEFAULT_BUDGET_KB})")
+    parser.add_argument("--report", type=Path, help="Also write the size report as JSON to this path.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.screenshots_dir.exists():
+        print(f"[INFO] {args.screenshots_dir} does not exist — no screenshots to optimize.")
+        sys.exit(0)
+    try:
+        report = optimize_directory(args.screenshots_dir, args.quantize, args.webp, args.budget_kb)
+    except (RuntimeError, OSError) as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        sys.exit(1)
+    print_report(report)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,9 @@ Optional:
     --artifacts-dir PATH    Output directory for preview screenshots (default: ./artifacts)
     --no-pr                 Take screenshots but skip PR creation
     --no-preview            Skip screenshots, create PR only
+    --preview-url URL       Reuse a running preview server (default: DOCS_PREVIEW_URL env var)
+    --preview-mode MODE     Server to start otherwise: dev or static (default: dev)
+    --preview-capture MODE  tiled (viewport-height slices) or full (one image) (default: tiled)
     --dry-run               Print planned actions without making any changes
 """
 
@@ -57,6 +60,7 @@ from publish_docs import (
     DEFAULT_BASE_BRANCH,
     DEFAULT_DOCS_REPO,
     DEFAULT_UPSTREAM,
+    add_preview_args,
     build_pr_body,
     create_pr,
     detect_category,
@@ -64,6 +68,7 @@ from publish_docs import (
     fail,
     info,
     infer_fork,
+    shared_preview_server,
     take_preview_screenshots,
     upload_preview_as_release,
     validate_docs_repo,
@@ -201,6 +206,7 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip Playwright preview screenshots, create PR only",
     )
+    add_preview_args(parser)
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -263,7 +269,8 @@ def main() -> None:
     if not args.no_preview:
         try:
             preview_files = take_preview_screenshots(
-                docs_repo, connector_slug, category, artifacts_dir, args.dry_run
+                docs_repo, connector_slug, category, artifacts_dir, args.dry_run,
+                shared_preview_server(args.preview_url), args.preview_mode, args.preview_capture,
             )
             if preview_files and not args.dry_run:
                 preview_urls = upload_preview_as_release(
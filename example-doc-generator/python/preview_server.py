@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+preview_server.py
+
+Docusaurus server for the preview screenshots taken by publish_docs.py and
+pr_preview.py. One server can serve any number of screenshot calls, so a batch
+of connectors pays the Docusaurus start-up once instead of once per connector.
+
+Modes
+-----
+dev      `npm run start`. Readiness is read from the server's own output, and
+         the dev server recompiles on its own when the docs checkout changes
+         (e.g. the next connector's branch), so it can stay up across runs.
+static   `npm run build` once, then `npm run serve` of the build output. Slower
+         to start, but pages are served without compiling. A page missing from
+         the build (checked out after it) triggers one rebuild, so only a run
+         that starts its own static server (--preview-mode static) uses it.
+
+Page readiness
+--------------
+The dev server answers every route with HTTP 200 (history-API fallback), even
+while a page is still missing or being rebuilt, so a 200 proves nothing there.
+Instead wait_for_page() waits until the file watcher has had time to see the
+page's source; from then on webpack-dev-middleware holds bundle requests until
+the rebuild is done. The capture then checks the rendered page's title against
+page_title() of that source, reloading until they match, so the client-side
+NotFound page or an older page is never captured.
+
+Run it standalone to keep a dev server up for several publish runs, then point
+them at it with --preview-url (or DOCS_PREVIEW_URL). The server must serve the
+same docs-integrator checkout the publish scripts write to.
+
+Usage:
+    python python/preview_server.py [options]
+
+Optional:
+    --docs-repo PATH    Path to local docs-integrator fork (default: from .env)
+    --port PORT         Port to serve on (default: 3333)
+
+Examples:
+    python python/preview_server.py
+    DOCS_PREVIEW_URL=http://localhost:3333 python python/publish_docs.py
+"""
+
+import argparse
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from pathlib import Path
+
+PREVIEW_PORT = 3333
+PREVIEW_MODES = ("dev", "static")
+START_TIMEOUT_SECONDS = 180  # a cold dev-server compile of the whole docs site
+BUILD_TIMEOUT_SECONDS = 900
+PAGE_TIMEOUT_SECONDS = 120  # recompiles after a checkout change
+# Time for the dev server's file watcher to notice a written page (webpack's
+# aggregateTimeout plus polling slack)
+WATCH_SETTLE_SECONDS = 3.0
+LOG_DIR = Path(__file__).parent.parent / ".cache" / "docs-preview"
+
+# Lines printed once Docusaurus is accepting requests
+READY_PATTERN = re.compile(
+    r"Docusaurus website is running at|Compiled successfully|Serving \"build\" directory at"
+)
+FAILED_PATTERN = re.compile(r"Failed to compile|\[ERROR\]")
+
+
+class PreviewError(RuntimeError):
+    """Raised when the preview step cannot complete. Callers should warn and continue."""
+
+
+def preview_page_path(category: str, connector_slug: str) -> str:
+    return f"/docs/connectors/catalog/{category}/{connector_slug}/example"
+
+
+def page_title(markdown: str) -> str | None:
+    """
+    The title Docusaurus gives a page (the start of document.title): the
+    frontmatter title, else the first level-1 heading.
+    """
+    body = markdown
+    frontmatter = re.match(r"---\n(.*?)\n---\n", markdown, re.DOTALL)
+    if frontmatter:
+        body = markdown[frontmatter.end():]
+        title = re.search(r"^title:\s*(.+?)\s*$", frontmatter.group(1), re.MULTILINE)
+        if title:
+            return title.group(1).strip("\"'")
+    heading = re.search(r"^#\s+(.+?)\s*#*\s*$", body, re.MULTILINE)
+    return heading.group(1) if heading else None
+
+
+def http_status(url: str, timeout: float = 5) -> int | None:
+    """HTTP status of a GET, or None when nothing answers."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+class PreviewServer:
+    """
+    A Docusaurus server started for the docs repo, or attached to one already
+    running. Use as a context manager; an attached server is never stopped.
+    """
+
+    def __init__(self, docs_repo: Path, mode: str = "dev", port: int = PREVIEW_PORT):
+        if mode not in PREVIEW_MODES:
+            raise ValueError(f"mode must be one of {PREVIEW_MODES}, got {mode!r}")
+        self.en_dir = docs_repo / "en"
+        self.mode = mode
+        self.port = port
+        self.base_url = f"http://localhost:{port}"
+        self.owned = True
+        self.process: subprocess.Popen | None = None
+        self.ready = threading.Event()
+        self.failed = threading.Event()
+        self.output: deque[str] = deque(maxlen=40)
+        self.log_path = LOG_DIR / f"{mode}-{port}.log"
+        self.rebuilt = False
+
+    @classmethod
+    def attach(cls, url: str) -> "PreviewServer":
+        """A server someone else started, e.g. `make preview-server`."""
+        server = cls(Path("."), "dev")
+        server.base_url = url.rstrip("/")
+        server.owned = False
+        return server
+
+    def __enter__(self) -> "PreviewServer":
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def page_url(self, category: str, connector_slug: str) -> str:
+        return self.base_url + preview_page_path(category, connector_slug)
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> "PreviewServer":
+        if not self.owned:
+            return self
+        if not (self.en_dir / "node_modules").exists():
+            raise PreviewError(
+                f"node_modules not found in {self.en_dir}.\n"
+                f"Run: cd {self.en_dir} && npm install"
+            )
+        if http_status(self.base_url) is not None:
+            raise PreviewError(
+                f"Port {self.port} is already in use. Stop that server, or reuse it with "
+                f"--preview-url {self.base_url}."
+            )
+        if self.mode == "static":
+            self.build()
+            command = ["npm", "run", "serve", "--", f"--port={self.port}", "--no-open"]
+        else:
+            command = ["npm", "run", "start", "--", f"--port={self.port}", "--no-open"]
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.process = subprocess.Popen(
+            command,
+            cwd=str(self.en_dir),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            # Own process group: npm's node children are stopped with it
+            start_new_session=True,
+        )
+        threading.Thread(target=self._read_output, daemon=True).start()
+        self._wait_ready()
+        return self
+
+    def _read_output(self) -> None:
+        assert self.process is not None and self.process.stdout is not None
+        with self.log_path.open("a", encoding="utf-8") as log:
+            for line in self.process.stdout:
+                log.write(line)
+                log.flush()
+                self.output.append(line.rstrip())
+                if READY_PATTERN.search(line):
+                    self.ready.set()
+                elif FAILED_PATTERN.search(line) and not self.ready.is_set():
+                    self.failed.set()
+        # Output closed: the process is gone; wake anyone still waiting
+        self.failed.set()
+
+    def _wait_ready(self) -> None:
+        deadline = time.monotonic() + START_TIMEOUT_SECONDS
+        while not self.ready.is_set():
+            if self.failed.is_set() or time.monotonic() > deadline:
+                self.stop()
+                tail = "\n".join(self.output)
+                raise PreviewError(
+                    f"Docusaurus {self.mode} server did not start on port {self.port}.\n"
+                    f"Log: {self.log_path}\n{tail}"
+                )
+            self.ready.wait(0.25)
+
+    def build(self) -> None:
+        """Run `docusaurus build` into en/build, for the static mode."""
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("a", encoding="utf-8") as log:
+            try:
+                result = subprocess.run(
+                    ["npm", "run", "build"],
+                    cwd=str(self.en_dir),
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    timeout=BUILD_TIMEOUT_SECONDS,
+                )
+            except subprocess.TimeoutExpired:
+                raise PreviewError(f"Docusaurus build timed out. Log: {self.log_path}")
+        if result.returncode != 0:
+            raise PreviewError(f"Docusaurus build failed (exit {result.returncode}). Log: {self.log_path}")
+
+    def stop(self) -> None:
+        if not self.owned:
+            return
+        process, self.process = self.process, None
+        if process is None or process.poll() is not None:
+            return
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+    # ── Pages ─────────────────────────────────────────────────────────────────
+
+    def wait_for_page(self, url: str, source: Path | None = None) -> None:
+        """
+        Wait until the page at `url`, written to `source`, can be captured.
+
+        Static: the page must answer 200. A build that predates the page is
+        rebuilt once; a server this process did not start cannot be rebuilt,
+        so a missing page fails at once.
+        Dev: the server only has to answer, then the watcher is given time to
+        see `source` (see Page readiness above).
+        """
+        deadline = time.monotonic() + PAGE_TIMEOUT_SECONDS
+        while True:
+            status = http_status(url, timeout=PAGE_TIMEOUT_SECONDS)
+            if status is None and not self.owned:
+                raise PreviewError(f"No preview server answering at {self.base_url}.")
+            if status == 404 and not self.owned:
+                raise PreviewError(
+                    f"{url} is not served by the preview server at {self.base_url}. A static "
+                    "server cannot serve pages placed after its build; use `make preview-server`."
+                )
+            if status == 200 or (status is not None and self.mode == "dev"):
+                break
+            if status == 404 and self.mode == "static" and not self.rebuilt:
+                self.rebuilt = True
+                self.build()
+                continue
+            if time.monotonic() > deadline:
+                raise PreviewError(f"Preview page not served (HTTP {status}): {url}")
+            time.sleep(1)
+
+        if self.mode == "dev" and source is not None and source.exists():
+            unseen = source.stat().st_mtime + WATCH_SETTLE_SECONDS - time.time()
+            if unseen > 0:
+                time.sleep(unseen)
+
+
+def parse_args() -> argparse.Namespace:
+    from publish_docs import DEFAULT_DOCS_REPO
+
+    parser = argparse.ArgumentParser(
+        description="Keep a Docusaurus dev server running for publish_docs.py and pr_preview.py.",
+    )
+    parser.add_argument(
+        "--docs-repo",
+        default=str(DEFAULT_DOCS_REPO),
+        help=f"Path to local docs-integrator fork (default: {DEFAULT_DOCS_REPO})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=PREVIEW_PORT,
+        help=f"Port to serve on (default: {PREVIEW_PORT})",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    from publish_docs import fail, info
+
+    args = parse_args()
+    # The server runs in its own process group, so stop it on SIGTERM as well
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    # Only the dev server picks up pages placed after it started
+    server = PreviewServer(Path(args.docs_repo).resolve(), "dev", args.port)
+    info(f"Starting Docusaurus dev server for {server.en_dir} ...")
+    try:
+        with server:
+            info(f"Preview server ready at {server.base_url}  (log: {server.log_path})")
+            info(f"Reuse it with: DOCS_PREVIEW_URL={server.base_url} or --preview-url {server.base_url}")
+            info("Press Ctrl-C to stop.")
+            while server.process is not None and server.process.poll() is None:
+                time.sleep(1)
+            fail(f"Preview server exited unexpectedly. Log: {server.log_path}")
+    except PreviewError as exc:
+        fail(str(exc))
+    except KeyboardInterrupt:
+        info("Preview server stopped.")
+
+
+if __name__ == "__main__":
+    main()
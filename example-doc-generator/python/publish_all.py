@@ -18,8 +18,20 @@
 """
 publish_all.py
 
-Convenience wrapper: runs publish_docs.py then publish_sample.py in sequence,
-streams each script's output live, and prints both PR links at the end.
+Convenience wrapper: runs publish_docs.py and publish_sample.py side by side,
+streams each script's output live, and prints every PR link at the end.
+
+The two scripts write to different repositories (docs-integrator and
+integration-samples), so they run concurrently. Each output line is printed
+whole, prefixed with its script's label; stderr is captured separately and
+printed when a script fails. The exit status is non-zero if any script failed.
+
+For a batch, repeat --artifacts-dir and --project-path once per connector
+(paired by position). Each repository checkout publishes one connector at a
+time, since every publish switches branches in it, so at most two scripts
+(one per repository) ever run at once; --jobs 1 runs them one after the other.
+The docs runs of a batch share one Docusaurus dev server, started here unless
+--preview-url points at a running one, instead of each compiling the site.
 
 Usage:
     python python/publish_all.py [options]
@@ -28,20 +40,25 @@ Optional:
     --no-pr             Push both branches but skip PR creation
     --dry-run           Print planned actions without making any changes
     --open              Open both PR links in the browser after creation
+    --jobs N            Publish scripts to run at once: 1 or 2 (default: 2)
 
 Docs options (forwarded to publish_docs.py):
-    --artifacts-dir PATH
+    --artifacts-dir PATH  (repeatable, one per connector)
     --docs-repo PATH
     --docs-fork OWNER/REPO
     --docs-upstream OWNER/REPO
     --docs-base-branch BRANCH
     --category CATEGORY
     --no-preview
+    --preview-url URL
+    --preview-mode MODE
+    --preview-capture MODE
+    --claude-placement
 
 Samples options (forwarded to publish_sample.py):
     --url URL
     --samples-repo PATH
-    --project-path PATH
+    --project-path PATH   (repeatable, one per connector)
     --samples-upstream OWNER/REPO
     --samples-base-branch BRANCH
     --no-publish
@@ -51,14 +68,20 @@ Examples:
     python python/publish_all.py --dry-run
     python python/publish_all.py --no-preview --open
     python python/publish_all.py --no-pr
+    python python/publish_all.py --artifacts-dir ./a/mysql --project-path /p/mysql \\
+                                 --artifacts-dir ./a/kafka --project-path /p/kafka
 """
 
 import argparse
+import contextlib
 import os
 import re
 import subprocess
 import sys
+import threading
 import webbrowser
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -66,61 +89,124 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 SCRIPTS_DIR = Path(__file__).parent
+# One script per repository checkout runs at a time, and there are two
+MAX_JOBS = 2
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+from preview_server import PREVIEW_MODES, PreviewError, PreviewServer  # noqa: E402
+from publish_docs import DEFAULT_DOCS_REPO, DEFAULT_PREVIEW_URL, PREVIEW_CAPTURES  # noqa: E402
 
 
 # ── Logging helpers ───────────────────────────────────────────────────────────
 
+# Scripts print from their own reader threads; one lock keeps every line whole
+OUTPUT_LOCK = threading.Lock()
+
+def emit(msg: str = "", file=None) -> None:
+    with OUTPUT_LOCK:
+        print(msg, file=file or sys.stdout, flush=True)
+
 def info(msg: str) -> None:
-    print(f"[INFO]  {msg}")
+    emit(f"[INFO]  {msg}")
 
 def dry(msg: str) -> None:
-    print(f"[DRY]   {msg}")
+    emit(f"[DRY]   {msg}")
 
 
 # ── Script runner ─────────────────────────────────────────────────────────────
 
-def run_script(label: str, cmd: list[str]) -> str | None:
+PR_URL_PATTERN = re.compile(r"https://github\.com/\S+/pull/\d+")
+
+
+@dataclass
+class ScriptResult:
+    label: str
+    returncode: int | None = None  # None: never started (an earlier script in its repo failed)
+    pr_url: str | None = None
+    stderr: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+def run_script(label: str, cmd: list[str]) -> ScriptResult:
     """
-    Run a publish script, stream its stdout live with a label prefix,
-    and return the GitHub PR URL found in the output (or None).
+    Run a publish script, stream its stdout live with a label prefix, and
+    return its exit status, the GitHub PR URL found in its output (or None)
+    and its captured stderr.
     """
-    print()
-    print("=" * 79)
-    print(f"[{label}] Starting ...")
-    print("=" * 79)
+    emit(f"[{label}] Starting ...")
+    result = ScriptResult(label)
 
     proc = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
+        bufsize=1,
     )
 
-    pr_url: str | None = None
+    # Drain stderr on its own thread so neither pipe can fill up and block the script
+    stderr_reader = threading.Thread(target=lambda: result.stderr.extend(proc.stderr), daemon=True)
+    stderr_reader.start()
+
     for line in proc.stdout:
         stripped = line.rstrip()
-        print(f"[{label}] {stripped}")
-        m = re.search(r"https://github\.com/\S+/pull/\d+", stripped)
+        emit(f"[{label}] {stripped}")
+        m = PR_URL_PATTERN.search(stripped)
         if m:
-            pr_url = m.group(0)
+            result.pr_url = m.group(0)
 
-    # Read stderr only after stdout is drained (avoids pipe deadlock)
-    stderr_output = proc.stderr.read()
-    proc.wait()
+    stderr_reader.join()
+    result.returncode = proc.wait()
 
-    if proc.returncode != 0:
-        print(f"\n[ERROR] {label} failed (exit {proc.returncode}).", file=sys.stderr)
-        if stderr_output.strip():
-            print(stderr_output.strip(), file=sys.stderr)
+    if not result.ok:
+        stderr_output = "".join(result.stderr).strip()
+        with OUTPUT_LOCK:
+            print(f"\n[ERROR] {label} failed (exit {result.returncode}).", file=sys.stderr)
+            for stderr_line in stderr_output.splitlines():
+                print(f"[{label}] {stderr_line}", file=sys.stderr)
+            sys.stderr.flush()
+    else:
+        emit(f"[{label}] Done.")
 
-    return pr_url
+    return result
+
+
+def run_lanes(lanes: list[list[tuple[str, list[str]]]], jobs: int) -> list[ScriptResult]:
+    """
+    Run each lane's scripts in order, with the lanes side by side and at most
+    `jobs` scripts running at once. A lane is one repository checkout: its
+    scripts switch branches in it, so they must not overlap. A failed script
+    stops the rest of its lane. Results come back in lane order.
+    """
+    slots = threading.Semaphore(jobs)
+    results = [[ScriptResult(label) for label, _cmd in lane] for lane in lanes]
+
+    def run_lane(index: int) -> None:
+        for position, (label, cmd) in enumerate(lanes[index]):
+            with slots:
+                results[index][position] = run_script(label, cmd)
+            if not results[index][position].ok:
+                skipped = [label for label, _cmd in lanes[index][position + 1:]]
+                if skipped:
+                    emit(f"[ERROR] Skipping {', '.join(skipped)} after {label} failed.", file=sys.stderr)
+                return
+
+    threads = [threading.Thread(target=run_lane, args=(index,)) for index in range(len(lanes))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [result for lane in results for result in lane]
 
 
 # ── Command builders ──────────────────────────────────────────────────────────
 
-def build_docs_cmd(args: argparse.Namespace) -> list[str]:
+def build_docs_cmd(args: argparse.Namespace, artifacts_dir: str) -> list[str]:
     cmd = [sys.executable, "-u", str(SCRIPTS_DIR / "publish_docs.py")]
-    cmd += ["--artifacts-dir", args.artifacts_dir]
+    cmd += ["--artifacts-dir", artifacts_dir]
     if args.docs_repo:
         cmd += ["--docs-repo", args.docs_repo]
     if args.docs_fork:
@@ -131,6 +217,11 @@ def build_docs_cmd(args: argparse.Namespace) -> list[str]:
         cmd += ["--category", args.category]
     if args.no_preview:
         cmd.append("--no-preview")
+    if args.preview_url:
+        cmd += ["--preview-url", args.preview_url]
+    cmd += ["--preview-mode", args.preview_mode, "--preview-capture", args.preview_capture]
+    if args.claude_placement:
+        cmd.append("--claude-placement")
     if args.no_pr:
         cmd.append("--no-pr")
     if args.dry_run:
@@ -138,13 +229,13 @@ def build_docs_cmd(args: argparse.Namespace) -> list[str]:
     return cmd
 
 
-def build_samples_cmd(args: argparse.Namespace) -> list[str]:
+def build_samples_cmd(args: argparse.Namespace, project_path: str | None) -> list[str]:
     cmd = [sys.executable, "-u", str(SCRIPTS_DIR / "publish_sample.py")]
     cmd += ["--url", args.url]
     if args.samples_repo:
         cmd += ["--samples-repo", args.samples_repo]
-    if args.project_path:
-        cmd += ["--project-path", args.project_path]
+    if project_path:
+        cmd += ["--project-path", project_path]
     cmd += ["--upstream", args.samples_upstream]
     cmd += ["--base-branch", args.samples_base_branch]
     if args.no_publish:
@@ -156,12 +247,67 @@ def build_samples_cmd(args: argparse.Namespace) -> list[str]:
     return cmd
 
 
+def build_lanes(args: argparse.Namespace) -> tuple[list[tuple[str, list[str]]], list[tuple[str, list[str]]]]:
+    """The docs and samples lanes: one (label, command) per connector in each."""
+    artifacts_dirs = args.artifacts_dir or ["./artifacts"]
+    project_paths = args.project_path or []
+    if len(artifacts_dirs) > 1 and len(project_paths) != len(artifacts_dirs):
+        print(
+            f"[ERROR] {len(artifacts_dirs)} --artifacts-dir given but {len(project_paths)} --project-path; "
+            "a batch needs one project path per connector, in the same order.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    if len(project_paths) > len(artifacts_dirs):
+        print("[ERROR] More --project-path than --artifacts-dir given.", file=sys.stderr)
+        sys.exit(1)
+    if args.category and len(artifacts_dirs) > 1:
+        print("[ERROR] --category applies to a single connector; drop it for a batch.", file=sys.stderr)
+        sys.exit(1)
+
+    batch = len(artifacts_dirs) > 1
+    docs_lane, samples_lane = [], []
+    for position, artifacts_dir in enumerate(artifacts_dirs):
+        suffix = f" {Path(artifacts_dir).name}" if batch else ""
+        project_path = project_paths[position] if project_paths else None
+        docs_lane.append((f"DOCS{suffix}", build_docs_cmd(args, artifacts_dir)))
+        samples_lane.append((f"SAMPLES{suffix}", build_samples_cmd(args, project_path)))
+    return docs_lane, samples_lane
+
+
+@contextlib.contextmanager
+def batch_preview_server(args: argparse.Namespace, connectors: int) -> Iterator[PreviewServer | None]:
+    """
+    A Docusaurus dev server for the docs runs of a batch to share, or None when
+    each run should use --preview-url or start its own: a single connector, no
+    previews, a dry run, or --preview-mode static (a static build cannot serve
+    pages placed after it). If it fails to start, each run starts its own.
+    """
+    if connectors < 2 or args.no_preview or args.dry_run or args.preview_url or args.preview_mode != "dev":
+        yield None
+        return
+    docs_repo = Path(args.docs_repo).resolve() if args.docs_repo else DEFAULT_DOCS_REPO
+    info("Starting one Docusaurus dev server for the batch's docs runs...")
+    server = PreviewServer(docs_repo, "dev")
+    try:
+        server.start()
+    except PreviewError as exc:
+        server.stop()
+        emit(f"[WARN]  Shared preview server failed to start; each docs run starts its own: {exc}", file=sys.stderr)
+        yield None
+        return
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
 # ── CLI ───────────────────────────────────────────────────────────────────────
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
-            "Run publish_docs.py then publish_sample.py and display both PR links."
+            "Run publish_docs.py and publish_sample.py concurrently and display both PR links."
         ),
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=(
@@ -170,6 +316,8 @@ def parse_args() -> argparse.Namespace:
             "  python python/publish_all.py --dry-run\n"
             "  python python/publish_all.py --no-preview --open\n"
             "  python python/publish_all.py --no-pr\n"
+            "  python python/publish_all.py --artifacts-dir ./a/mysql --project-path /p/mysql \\\n"
+            "                               --artifacts-dir ./a/kafka --project-path /p/kafka\n"
         ),
     )
 
@@ -189,14 +337,28 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Open both PR links in the browser after creation",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=2,
+        metavar="N",
+        help=(
+            "Publish scripts to run at once: 2 runs docs and samples side by side (default), "
+            "1 runs them one after the other. Each repository publishes one connector at a "
+            "time, so more than 2 is refused."
+        ),
+    )
 
     # ── publish_docs.py ───────────────────────────────────────────────────────
     docs = parser.add_argument_group("publish_docs.py options")
     docs.add_argument(
         "--artifacts-dir",
-        default="./artifacts",
+        action="append",
         metavar="PATH",
-        help="Path to pipeline artifacts directory (default: ./artifacts)",
+        help=(
+            "Path to pipeline artifacts directory (default: ./artifacts). "
+            "Repeat once per connector to publish a batch."
+        ),
     )
     docs.add_argument(
         "--docs-repo",
@@ -225,13 +387,39 @@ def parse_args() -> argparse.Namespace:
     docs.add_argument(
         "--category",
         metavar="CATEGORY",
-        help="Connector category — skip auto-detection",
+        help="Connector category — skip auto-detection (single connector only)",
     )
     docs.add_argument(
         "--no-preview",
         action="store_true",
         help="Skip Playwright preview screenshots",
     )
+    docs.add_argument(
+        "--preview-url",
+        default=DEFAULT_PREVIEW_URL,
+        metavar="URL",
+        help=(
+            "Running preview server for every docs run (default: DOCS_PREVIEW_URL env var; "
+            "otherwise a batch starts one dev server for all its docs runs)"
+        ),
+    )
+    docs.add_argument(
+        "--preview-mode",
+        choices=PREVIEW_MODES,
+        default="dev",
+        help="Server a docs run starts when --preview-url is unset (default: dev)",
+    )
+    docs.add_argument(
+        "--preview-capture",
+        choices=PREVIEW_CAPTURES,
+        default="tiled",
+        help="tiled: viewport-height images; full: one full-page image (default: tiled)",
+    )
+    docs.add_argument(
+        "--claude-placement",
+        action="store_true",
+        help="Place docs with Claude Code instead of deterministically",
+    )
 
     # ── publish_sample.py ─────────────────────────────────────────────────────
     samples = parser.add_argument_group("publish_sample.py options")
@@ -248,8 +436,12 @@ def parse_args() -> argparse.Namespace:
     )
     samples.add_argument(
         "--project-path",
+        action="append",
         metavar="PATH",
-        help="Absolute path to the created integration project",
+        help=(
+            "Absolute path to the created integration project. "
+            "In a batch, repeat once per --artifacts-dir, in the same order."
+        ),
     )
     samples.add_argument(
         "--samples-upstream",
@@ -274,47 +466,70 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
+    if not 1 <= args.jobs <= MAX_JOBS:
+        print(
+            f"[ERROR] --jobs must be 1 or {MAX_JOBS}: each repository publishes one connector at a time.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
-    docs_cmd = build_docs_cmd(args)
-    samples_cmd = build_samples_cmd(args)
+    docs_lane, samples_lane = build_lanes(args)
 
     if args.dry_run:
         print("=" * 79)
         print("DRY RUN — no changes will be made")
         print("=" * 79)
-        dry(f"publish_docs:   {' '.join(docs_cmd)}")
-        dry(f"publish_sample: {' '.join(samples_cmd)}")
+        for label, cmd in docs_lane + samples_lane:
+            dry(f"{label}: {' '.join(cmd)}")
+        dry(f"Docs and samples lanes run side by side, at most {args.jobs} script(s) at once")
         print()
         print("=" * 79)
         print("Dry run complete. Remove --dry-run to execute.")
         print("=" * 79)
         return
 
-    docs_pr = run_script("DOCS", docs_cmd)
-    samples_pr = run_script("SAMPLES", samples_cmd)
+    with batch_preview_server(args, len(docs_lane)) as server:
+        if server is not None:
+            info(f"Docs runs share the preview server at {server.base_url}")
+            args.preview_url = server.base_url
+            docs_lane, samples_lane = build_lanes(args)
+        results = run_lanes([docs_lane, samples_lane], args.jobs)
 
     # ── Summary ───────────────────────────────────────────────────────────────
+    failed = [result for result in results if result.returncode not in (0, None)]
+    skipped = [result for result in results if result.returncode is None]
+    # Connectors in one batch branch share a PR; list each link once
+    pr_urls = list(dict.fromkeys(result.pr_url for result in results if result.pr_url))
+    width = max(len(result.label) for result in results)
     print()
     print("=" * 79)
-    print("ALL DONE")
+    if failed:
+        print(f"DONE WITH {len(failed)} FAILED SCRIPT(S)" + (f", {len(skipped)} SKIPPED" if skipped else ""))
+    else:
+        print("ALL DONE")
     print("=" * 79)
-    print(f"  Docs PR    : {docs_pr or '(not created)'}")
-    print(f"  Samples PR : {samples_pr or '(not created)'}")
-    print()
-    print("Open in browser:")
-    if docs_pr:
-        print(f"  open \"{docs_pr}\"")
-    if samples_pr:
-        print(f"  open \"{samples_pr}\"")
+    for result in results:
+        if result.returncode is None:
+            status = "skipped"
+        elif result.ok:
+            status = result.pr_url or "(no PR created)"
+        else:
+            status = f"FAILED (exit {result.returncode})" + (f" — {result.pr_url}" if result.pr_url else "")
+        print(f"  {result.label:<{width}} : {status}")
+    if pr_urls:
+        print()
+        print("Open in browser:")
+        for pr_url in pr_urls:
+            print(f"  open \"{pr_url}\"")
     print("=" * 79)
 
     if args.open:
-        if docs_pr:
-            info(f"Opening docs PR ...")
-            webbrowser.open(docs_pr)
-        if samples_pr:
-            info(f"Opening samples PR ...")
-            webbrowser.open(samples_pr)
+        for pr_url in pr_urls:
+            info(f"Opening {pr_url} ...")
+            webbrowser.open(pr_url)
+
+    if failed or skipped:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
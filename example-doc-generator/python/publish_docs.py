@@ -22,6 +22,11 @@ Post-pipeline script: places generated connector documentation into the
 WSO2 Integrator docs-integrator fork, creates a feature branch and PR,
 and adds Playwright screenshots of the rendered docs page to the PR body.
 
+Placement (example.md, screenshots, sidebars.ts entry) uses the same
+deterministic engine as the GitHub workflow,
+connector-doc-generator/scripts/integrate_example.py. --claude-placement
+hands it to Claude Code instead, for sidebars the engine cannot edit.
+
 Preview screenshots are uploaded as pre-release assets on the fork repo —
 they are NOT committed to the docs-integrator repository.
 
@@ -33,6 +38,13 @@ Optional:
     --category CATEGORY     Connector category — required if not in the built-in map
     --no-pr                 Push the branch but skip creating a pull request
     --no-preview            Skip Playwright preview screenshots
+    --preview-url URL       Reuse a running preview server (default: DOCS_PREVIEW_URL env var)
+    --preview-mode MODE     Server to start otherwise: dev or static (default: dev)
+    --preview-capture MODE  tiled (viewport-height slices) or full (one image) (default: tiled)
+    --claude-placement      Place docs with Claude Code instead of deterministically
+    --no-optimize           Place screenshots without recompressing them first
+    --quantize-screenshots  Allow lossy palette quantization of screenshots
+    --webp                  Also place lossless .webp siblings of screenshots
     --dry-run               Print planned actions without making any changes
 
 Defaults for repo paths and GitHub identifiers are read from .env (see .env.example).
@@ -46,21 +58,24 @@ Prerequisites:
 """
 
 import argparse
+import asyncio
 import datetime
-from collections.abc import Sequence
+import json
 import os
 import re
-import signal
 import subprocess
 import sys
 import time
-import urllib.request
+from collections.abc import Sequence
 from pathlib import Path
 
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
+sys.path.insert(0, str(Path(__file__).parent))
+from preview_server import PAGE_TIMEOUT_SECONDS, PREVIEW_MODES, PreviewError, PreviewServer, page_title
+
 # Path to the connector name file written by the Ballerina pipeline at startup
 CONNECTOR_NAME_FILE = Path("artifacts/run-log/connector-name.txt")
 
@@ -197,9 +212,18 @@ AVAILABLE_CATEGORIES = sorted(set(CATEGORY_MAP.values()))
 
 DEFAULT_UPSTREAM = os.environ.get("DOCS_INTEGRATOR_UPSTREAM", "wso2/docs-integrator")
 DEFAULT_BASE_BRANCH = os.environ.get("DOCS_INTEGRATOR_BASE_BRANCH", "main")
-PREVIEW_PORT = 3333
+DEFAULT_PREVIEW_URL = os.environ.get("DOCS_PREVIEW_URL")
 VIEWPORT_WIDTH = 1440
 VIEWPORT_HEIGHT = 900
+PREVIEW_CAPTURES = ("tiled", "full")
+PREVIEW_CONCURRENCY = 4  # browser contexts capturing at once
+PREVIEW_SETTLE_TIMEOUT_MS = 60_000
+
+# True once every <img> has loaded (or failed) and web fonts are in
+PAGE_SETTLED_JS = (
+    "() => Array.from(document.images).every(img => img.complete)"
+    " && document.fonts.status === 'loaded'"
+)
 
 # Default docs-integrator path: env var, then sibling of this workspace
 # Layout: <workspace>/connector-docs-automations/python/publish_docs.py
@@ -228,10 +252,6 @@ def fail(msg: str) -> None:
     sys.exit(1)
 
 
-class PreviewError(RuntimeError):
-    """Raised when optional preview screenshot generation cannot continue."""
-
-
 # ── Subprocess helper ─────────────────────────────────────────────────────────
 
 def run(cmd: list[str], cwd: Path | None = None, check: bool = True) -> str:
@@ -414,7 +434,142 @@ def sync_and_branch(
     subprocess.run(["git", "checkout", "-b", branch_name], cwd=str(docs_repo), check=True)
 
 
-# ── Steps 5–8: Place docs and update sidebar via Claude Code ──────────────────
+# ── Step 4b: Optimize screenshots before placement ───────────────────────────
+
+def optimize_artifact_screenshots(
+    artifacts_dir: Path,
+    screenshot_files: list[Path],
+    quantize: bool,
+    webp: bool,
+    dry_run: bool,
+) -> list[Path]:
+    """
+    Shrink the artifact screenshots in place so the docs site ships smaller images.
+
+    Returns the files to place: the (optimized) PNGs plus any .webp siblings.
+    The size report is also written to artifacts/run-log/screenshot-optimization.json.
+    """
+    if not screenshot_files:
+        return screenshot_files
+    if dry_run:
+        dry(
+            f"Optimize {len(screenshot_files)} screenshot(s) in place"
+            f"{' with palette quantization' if quantize else ' losslessly'}"
+            f"{' and write .webp siblings' if webp else ''}"
+        )
+        return screenshot_files
+
+    from optimize_screenshots import optimize_directory, print_report
+
+    info("Optimizing screenshots before placement...")
+    try:
+        report = optimize_directory(artifacts_dir / "screenshots", quantize=quantize, webp=webp)
+    except (RuntimeError, OSError) as exc:
+        warn(f"Screenshot optimization skipped — placing originals: {exc}")
+        return screenshot_files
+    print_report(report)
+    report_path = artifacts_dir / "run-log" / "screenshot-optimization.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    siblings = [f.with_suffix(".webp") for f in screenshot_files if f.with_suffix(".webp").exists()]
+    return screenshot_files + siblings
+
+
+# ── Steps 5–8: Place docs and update sidebar ──────────────────────────────────
+
+# connector-doc-generator/scripts/integrate_example.py is the placement engine
+# the GitHub workflow uses; publishing locally places docs the same way.
+INTEGRATE_SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "connector-doc-generator" / "scripts"
+
+
+def place_example_docs(
+    docs_repo: Path,
+    category: str,
+    connector_slug: str,
+    connector_name: str,
+    source_doc_path: Path,
+    screenshot_files: list[Path],
+    dry_run: bool,
+) -> None:
+    """
+    Deterministically, with integrate_example.place_example (the same
+    placement the GitHub workflow runs):
+      1. Reject guides with local absolute paths, rewrite ../screenshots/ paths
+         to static img paths and add the docs-integrator frontmatter
+      2. Add the example page to the connector's items in sidebars.ts
+      3. Write example.md to the catalog location
+      4. Copy screenshots (and .webp siblings) to the static img directory
+      5. Link the example from the connector's overview.md
+    """
+    example_md_target = (
+        docs_repo / "en" / "docs" / "connectors" / "catalog"
+        / category / connector_slug / "example.md"
+    )
+    screenshot_target_dir = (
+        docs_repo / "en" / "static" / "img" / "connectors" / "catalog"
+        / category / connector_slug
+    )
+    sidebars_path = docs_repo / "en" / "sidebars.ts"
+    static_img_prefix = f"/img/connectors/catalog/{category}/{connector_slug}/"
+
+    if dry_run:
+        dry(f"Rewrite ../screenshots/ → {static_img_prefix} and write {example_md_target}")
+        dry(f"Copy {len(screenshot_files)} screenshot file(s) to {screenshot_target_dir}")
+        dry(f"Add connectors/catalog/{category}/{connector_slug}/example to {sidebars_path}")
+        dry(f"Link example.md from {example_md_target.parent / 'overview.md'}")
+        return
+
+    sys.path.insert(0, str(INTEGRATE_SCRIPTS_DIR))
+    from integrate_example import place_example
+
+    # place_example copies the .webp sibling of each PNG itself
+    pngs = [f for f in screenshot_files if f.suffix == ".png"]
+    try:
+        placement = place_example(
+            docs_repo, category, connector_slug,
+            source_doc_path.read_text(encoding="utf-8"), pngs,
+        )
+    except RuntimeError as exc:
+        fail(
+            f"Could not place the example page: {exc}\n"
+            "Rerun with --claude-placement to let Claude Code place it instead."
+        )
+
+    info(f"Wrote {example_md_target.relative_to(docs_repo)}")
+    info(f"Copied {len(placement['placed'])} screenshot file(s) to {screenshot_target_dir.relative_to(docs_repo)}")
+    info(f"Sidebar entry in place: connectors/catalog/{category}/{connector_slug}/example")
+    if placement["overviewUpdated"]:
+        info(f"Linked the example from {category}/{connector_slug}/overview.md")
+
+
+def placed_doc_paths(docs_repo: Path, category: str, connector_slug: str) -> list[Path]:
+    """Every path place_docs writes, to stage after placement and restore on failure."""
+    doc_dir = docs_repo / "en" / "docs" / "connectors" / "catalog" / category / connector_slug
+    return [
+        doc_dir / "example.md",
+        doc_dir / "overview.md",
+        docs_repo / "en" / "static" / "img" / "connectors" / "catalog" / category / connector_slug,
+        docs_repo / "en" / "sidebars.ts",
+    ]
+
+
+def place_docs(
+    docs_repo: Path,
+    category: str,
+    connector_slug: str,
+    connector_name: str,
+    source_doc_path: Path,
+    screenshot_files: list[Path],
+    claude_placement: bool,
+    dry_run: bool,
+) -> None:
+    """Place the docs deterministically, or with Claude Code when --claude-placement is set."""
+    place = run_claude_code_placement if claude_placement else place_example_docs
+    place(
+        docs_repo, category, connector_slug, connector_name,
+        source_doc_path, screenshot_files, dry_run,
+    )
+
 
 def run_claude_code_placement(
     docs_repo: Path,
@@ -523,103 +678,200 @@ Confirm each step as you complete it. If a step fails, report the error clearly.
 
 # ── Step 9: Docusaurus preview screenshots ────────────────────────────────────
 
-def take_preview_screenshots(
-    docs_repo: Path,
-    connector_slug: str,
-    category: str,
-    artifacts_dir: Path,
-    dry_run: bool,
-) -> list[Path]:
+def tile_screenshot(png: bytes, tile_height: int) -> list[bytes]:
     """
-    Start Docusaurus dev server, take scroll-based desktop screenshots
-    of the connector example page covering all content.
-    Returns list of screenshot paths saved to artifacts/preview-screenshots/.
+    Slice a full-page screenshot into viewport-height tiles: 0, 900, 1800, …
+    with the last tile aligned to the bottom of the page so it is full height.
     """
-    if dry_run:
-        dry("Start Docusaurus server and take full-page desktop preview screenshots")
-        return []
+    import io
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png)) as image:
+        width, height = image.size
+        positions = list(range(0, height, tile_height))
+        bottom = max(0, height - tile_height)
+        if positions[-1] > bottom:
+            positions[-1] = bottom
+        tiles = []
+        for top in positions:
+            buffer = io.BytesIO()
+            image.crop((0, top, width, min(top + tile_height, height))).save(buffer, format="PNG")
+            tiles.append(buffer.getvalue())
+    return tiles
+
+
+async def _wait_for_title(page: object, page_url: str, title: str) -> None:
+    """
+    Reload until the page renders `title`. The dev server serves its
+    client-side NotFound page, or the previous build of the page, until it has
+    rebuilt the one just placed.
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError  # type: ignore
 
-    en_dir = docs_repo / "en"
-    if not (en_dir / "node_modules").exists():
-        raise PreviewError(
-            f"node_modules not found in {en_dir}.\n"
-            f"Run: cd {en_dir} && npm install"
-        )
+    deadline = time.monotonic() + PAGE_TIMEOUT_SECONDS
+    while True:
+        try:
+            await page.wait_for_function(  # type: ignore[attr-defined]
+                "title => document.title.startsWith(title)", arg=title, timeout=10_000
+            )
+            return
+        except PlaywrightTimeoutError:
+            if time.monotonic() > deadline:
+                shown = await page.title()  # type: ignore[attr-defined]
+                raise PreviewError(f"{page_url} still shows '{shown}' instead of '{title}'")
+        await page.reload(wait_until="networkidle")  # type: ignore[attr-defined]
+
+
+async def _capture_page(
+    browser: object,
+    page_url: str,
+    title: str | None,
+    connector_slug: str,
+    preview_dir: Path,
+    capture: str,
+) -> list[Path]:
+    context = await browser.new_context(  # type: ignore[attr-defined]
+        viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT}
+    )
+    try:
+        page = await context.new_page()
+        page.set_default_timeout(PREVIEW_SETTLE_TIMEOUT_MS)
+        await page.goto(page_url, wait_until="networkidle")
+        if title:
+            await _wait_for_title(page, page_url, title)
+        # Lazy images below the fold would never load without scrolling
+        await page.evaluate("for (const img of document.images) img.loading = 'eager'")
+        await page.wait_for_function(PAGE_SETTLED_JS)
+        await page.wait_for_load_state("networkidle")
+        png = await page.screenshot(full_page=True, animations="disabled")
+    finally:
+        await context.close()
 
-    preview_dir = artifacts_dir / "preview-screenshots"
-    preview_dir.mkdir(parents=True, exist_ok=True)
+    prefix = connector_slug.replace(".", "_")
+    if capture == "full":
+        images = {f"{prefix}_preview_full.png": png}
+    else:
+        images = {
+            f"{prefix}_preview_{i:02d}.png": tile
+            for i, tile in enumerate(tile_screenshot(png, VIEWPORT_HEIGHT), start=1)
+        }
+    files = []
+    for name, data in images.items():
+        out = preview_dir / name
+        out.write_bytes(data)
+        files.append(out)
+    info(f"  {connector_slug}: {len(files)} {capture} screenshot(s) → {preview_dir}")
+    return files
 
-    page_url = (
-        f"http://localhost:{PREVIEW_PORT}/docs/connectors/catalog"
-        f"/{category}/{connector_slug}/example"
-    )
 
-    info("Starting Docusaurus dev server...")
-    server_proc = subprocess.Popen(
-        ["npm", "run", "start", "--", f"--port={PREVIEW_PORT}", "--no-open"],
-        cwd=str(en_dir),
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
+async def _capture_pages(
+    pages: list[tuple[str, str | None, str]], preview_dir: Path, capture: str
+) -> list[list[Path]]:
+    from playwright.async_api import async_playwright  # type: ignore
 
-    # Poll until server is ready (max 90s)
-    ready = False
-    for _ in range(90):
+    limit = asyncio.Semaphore(PREVIEW_CONCURRENCY)
+
+    async def capture_one(page_url: str, title: str | None, connector_slug: str) -> list[Path]:
+        async with limit:
+            return await _capture_page(browser, page_url, title, connector_slug, preview_dir, capture)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
         try:
-            urllib.request.urlopen(f"http://localhost:{PREVIEW_PORT}", timeout=1)
-            ready = True
-            break
-        except Exception:
-            time.sleep(1)
+            return await asyncio.gather(*(capture_one(*page) for page in pages))
+        finally:
+            await browser.close()
+
+
+def capture_preview_pages(
+    docs_repo: Path,
+    server: PreviewServer,
+    connectors: Sequence[tuple[str, str]],
+    artifacts_dir: Path,
+    capture: str = "tiled",
+) -> dict[str, list[Path]]:
+    """
+    Capture the example pages of (connector_slug, category) pairs from a
+    running preview server, each in its own browser context, up to
+    PREVIEW_CONCURRENCY at a time. A page is captured once it renders the
+    title of its example.md in docs_repo, its network is idle, every <img>
+    has loaded and web fonts are ready, as one full-page screenshot; "tiled"
+    slices it into viewport-height images.
+    Returns the screenshot paths per connector slug.
+    """
+    preview_dir = artifacts_dir / "preview-screenshots"
+    preview_dir.mkdir(parents=True, exist_ok=True)
+
+    pages = []
+    for connector_slug, category in connectors:
+        page_url = server.page_url(category, connector_slug)
+        source = (
+            docs_repo / "en" / "docs" / "connectors" / "catalog"
+            / category / connector_slug / "example.md"
+        )
+        server.wait_for_page(page_url, source)
+        title = page_title(source.read_text(encoding="utf-8")) if source.exists() else None
+        info(f"Capturing: {page_url}")
+        pages.append((page_url, title, connector_slug))
 
-    if not ready:
-        server_proc.kill()
-        raise PreviewError(f"Docusaurus server did not start within 90s on port {PREVIEW_PORT}.")
+    results = asyncio.run(_capture_pages(pages, preview_dir, capture))
+    return {slug: files for (_, _, slug), files in zip(pages, results)}
 
-    info(f"Server ready. Navigating to: {page_url}")
 
-    screenshot_files: list[Path] = []
-    try:
-        from playwright.sync_api import sync_playwright  # type: ignore
+def take_batch_preview_screenshots(
+    docs_repo: Path,
+    connectors: Sequence[tuple[str, str]],
+    artifacts_dir: Path,
+    dry_run: bool,
+    server: PreviewServer | None = None,
+    preview_mode: str = "dev",
+    capture: str = "tiled",
+) -> dict[str, list[Path]]:
+    """
+    Take desktop screenshots of the example pages of (connector_slug, category)
+    pairs, all served by `server` (left running), or by one Docusaurus server
+    started and stopped for this call when None.
+    Returns the screenshot paths per connector slug, saved to
+    artifacts/preview-screenshots/.
+    """
+    if dry_run:
+        target = server.base_url if server else f"a Docusaurus {preview_mode} server"
+        dry(
+            f"Take {capture} full-page desktop preview screenshots of "
+            f"{len(connectors)} page(s) from {target}"
+        )
+        return {}
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page(
-                viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT}
+    if server is None:
+        info(f"Starting Docusaurus {preview_mode} server...")
+        with PreviewServer(docs_repo, preview_mode) as own_server:
+            return take_batch_preview_screenshots(
+                docs_repo, connectors, artifacts_dir, dry_run, own_server, capture=capture,
             )
-            page.goto(page_url)
-            page.wait_for_load_state("networkidle")
-            page.wait_for_timeout(1000)  # let any animations/fonts settle
-
-            page_height: int = page.evaluate("document.body.scrollHeight")
-            info(f"Page height: {page_height}px — taking scroll screenshots at {VIEWPORT_HEIGHT}px steps")
-
-            # Build scroll positions: 0, 900, 1800, … + final bottom position
-            positions = list(range(0, page_height, VIEWPORT_HEIGHT))
-            # Ensure the very bottom of the page is always captured
-            bottom = max(0, page_height - VIEWPORT_HEIGHT)
-            if not positions or positions[-1] < bottom:
-                positions.append(bottom)
-
-            for i, scroll_y in enumerate(positions, start=1):
-                page.evaluate(f"window.scrollTo(0, {scroll_y})")
-                page.wait_for_timeout(400)  # let lazy-loaded images render
-                out = preview_dir / f"{connector_slug.replace('.', '_')}_preview_{i:02d}.png"
-                page.screenshot(path=str(out))
-                screenshot_files.append(out)
-                info(f"  [{i:02d}] scroll={scroll_y}px → {out.name}")
-
-            browser.close()
-    finally:
-        server_proc.send_signal(signal.SIGTERM)
-        try:
-            server_proc.wait(timeout=10)
-        except subprocess.TimeoutExpired:
-            server_proc.kill()
-        info("Docusaurus server stopped.")
 
-    info(f"Captured {len(screenshot_files)} preview screenshot(s).")
-    return screenshot_files
+    screenshots = capture_preview_pages(docs_repo, server, connectors, artifacts_dir, capture)
+    info(f"Captured {sum(map(len, screenshots.values()))} preview screenshot(s).")
+    return screenshots
+
+
+def take_preview_screenshots(
+    docs_repo: Path,
+    connector_slug: str,
+    category: str,
+    artifacts_dir: Path,
+    dry_run: bool,
+    server: PreviewServer | None = None,
+    preview_mode: str = "dev",
+    capture: str = "tiled",
+) -> list[Path]:
+    """
+    Take desktop screenshots of the connector example page covering all
+    content; see take_batch_preview_screenshots.
+    Returns list of screenshot paths saved to artifacts/preview-screenshots/.
+    """
+    return take_batch_preview_screenshots(
+        docs_repo, [(connector_slug, category)], artifacts_dir, dry_run, server, preview_mode, capture,
+    ).get(connector_slug, [])
 
 
 def upload_preview_as_release(
@@ -748,6 +1000,7 @@ Added {connector_name} connector example guide showing how to configure the \
 ## Documentation
 
 - `en/docs/connectors/catalog/{category}/{connector_slug}/example.md` (added)
+- `en/docs/connectors/catalog/{category}/{connector_slug}/overview.md` (example link added)
 - `en/static/img/connectors/catalog/{category}/{connector_slug}/` (screenshots added)
 - `en/sidebars.ts` (sidebar entry added)
 
@@ -800,6 +1053,71 @@ def create_pr(
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
 
+def add_screenshot_optimization_args(parser: argparse.ArgumentParser) -> None:
+    """Flags for the pre-placement screenshot optimization stage (shared with batch_commit_docs)."""
+    parser.add_argument(
+        "--no-optimize",
+        action="store_true",
+        help="Place screenshots exactly as captured, without recompressing them",
+    )
+    parser.add_argument(
+        "--quantize-screenshots",
+        action="store_true",
+        help="Allow lossy 256-colour palette quantization when it makes a screenshot smaller",
+    )
+    parser.add_argument(
+        "--webp",
+        action="store_true",
+        help="Also place a lossless .webp sibling next to each screenshot",
+    )
+
+
+def add_placement_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--claude-placement",
+        action="store_true",
+        help=(
+            "Place the docs and edit sidebars.ts with Claude Code (claude --print) "
+            "instead of the deterministic placement"
+        ),
+    )
+
+
+def add_preview_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--preview-url",
+        default=DEFAULT_PREVIEW_URL,
+        metavar="URL",
+        help=(
+            "Take preview screenshots from an already running preview server "
+            "(make preview-server) instead of starting one (default: DOCS_PREVIEW_URL env var)"
+        ),
+    )
+    parser.add_argument(
+        "--preview-mode",
+        choices=PREVIEW_MODES,
+        default="dev",
+        help=(
+            "Server started when --preview-url is unset: dev (docusaurus start) "
+            "or static (docusaurus build, then serve) (default: dev)"
+        ),
+    )
+    parser.add_argument(
+        "--preview-capture",
+        choices=PREVIEW_CAPTURES,
+        default="tiled",
+        help=(
+            "tiled: the full-page capture sliced into viewport-height images; "
+            "full: one full-page image (default: tiled)"
+        ),
+    )
+
+
+def shared_preview_server(preview_url: str | None) -> PreviewServer | None:
+    """The long-lived preview server at --preview-url, if one was given."""
+    return PreviewServer.attach(preview_url) if preview_url else None
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
@@ -869,6 +1187,9 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip Playwright preview screenshots",
     )
+    add_preview_args(parser)
+    add_placement_args(parser)
+    add_screenshot_optimization_args(parser)
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -909,18 +1230,20 @@ def main() -> None:
     sync_and_branch(docs_repo, branch_name, args.dry_run,
                     upstream_slug=upstream, base_branch=args.base_branch)
 
+    # ── 4b. Optimize screenshots ──────────────────────────────────────────────
+    if not args.no_optimize:
+        screenshot_files = optimize_artifact_screenshots(
+            artifacts_dir, screenshot_files, args.quantize_screenshots, args.webp, args.dry_run
+        )
+
     # ── 5-8. Place example.md, copy screenshots, update sidebar ───────────────
-    run_claude_code_placement(
+    place_docs(
         docs_repo, category, connector_slug, connector_name,
-        source_doc_path, screenshot_files, args.dry_run,
+        source_doc_path, screenshot_files, args.claude_placement, args.dry_run,
     )
 
     # ── 9. Commit + push ──────────────────────────────────────────────────────
-    generated_paths: list[Path] = [
-        docs_repo / "en" / "docs" / "connectors" / "catalog" / category / connector_slug / "example.md",
-        docs_repo / "en" / "static" / "img" / "connectors" / "catalog" / category / connector_slug,
-        docs_repo / "en" / "sidebars.ts",
-    ]
+    generated_paths = placed_doc_paths(docs_repo, category, connector_slug)
     commit_and_push(docs_repo, connector_name, branch_name, args.dry_run, generated_paths)
 
     if args.no_pr:
@@ -938,7 +1261,8 @@ def main() -> None:
     if not args.no_preview:
         try:
             preview_files = take_preview_screenshots(
-                docs_repo, connector_slug, category, artifacts_dir, args.dry_run
+                docs_repo, connector_slug, category, artifacts_dir, args.dry_run,
+                shared_preview_server(args.preview_url), args.preview_mode, args.preview_capture,
             )
             if preview_files and not args.dry_run:
                 preview_urls = upload_preview_as_release(
@@ -320,15 +320,16 @@ def create_pr(
 
 # ── Step 9: Write run-log entry ───────────────────────────────────────────────
 
-def write_sample_log(project_name: str, dry_run: bool) -> None:
-    sample_path = f"connectors/{project_name}"
+def write_sample_log(project_names: list[str], dry_run: bool) -> None:
+    """Record the published sample paths, one per line."""
+    sample_paths = [f"connectors/{name}" for name in project_names]
     if dry_run:
-        dry(f"Write published sample path to {PUBLISHED_SAMPLE_LOG}: {sample_path}")
+        dry(f"Write published sample path(s) to {PUBLISHED_SAMPLE_LOG}: {', '.join(sample_paths)}")
         return
     log_file = Path(PUBLISHED_SAMPLE_LOG)
     log_file.parent.mkdir(parents=True, exist_ok=True)
-    log_file.write_text(sample_path, encoding="utf-8")
-    info(f"Recorded sample path: {sample_path} → {PUBLISHED_SAMPLE_LOG}")
+    log_file.write_text("\n".join(sample_paths), encoding="utf-8")
+    info(f"Recorded sample path(s): {', '.join(sample_paths)} → {PUBLISHED_SAMPLE_LOG}")
 
 
 # ── Step 10: Delete local project ─────────────────────────────────────────────
@@ -491,7 +492,7 @@ def main() -> None:
                 fork, branch_name, project_name, pr_body,
                 args.upstream, args.base_branch, args.dry_run,
             )
-            write_sample_log(project_name, args.dry_run)
+            write_sample_log([project_name], args.dry_run)
             print()
             print("=" * 79)
             if args.dry_run:
@@ -501,7 +502,7 @@ def main() -> None:
             print("=" * 79)
         else:
             info(f"Branch '{branch_name}' pushed — PR creation skipped (--no-pr).")
-            write_sample_log(project_name, args.dry_run)
+            write_sample_log([project_name], args.dry_run)
             print()
             print("=" * 79)
             if args.dry_run:
@@ -0,0 +1,87 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from batch_pr_docs import (  # noqa: E402
+    branch_log_range,
+    read_connectors_from_branch,
+    read_example_pages_from_branch,
+)
+
+
+class BranchRangeTests(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.repo = Path(self.temp.name)
+        self.git("init", "-q", "-b", "main")
+        self.commit("base", "README.md")
+        self.git("update-ref", "refs/remotes/origin/main", "HEAD")
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=self.repo, check=True, capture_output=True, text=True,
+        ).stdout
+
+    def commit(self, message: str, *paths: str) -> None:
+        for path in paths:
+            (self.repo / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.repo / path).write_text(message, encoding="utf-8")
+        self.git("add", ".")
+        self.git("commit", "-qm", message)
+
+    def example(self, category: str, slug: str) -> str:
+        return f"en/docs/connectors/catalog/{category}/{slug}/example.md"
+
+    def test_pages_merged_from_upstream_are_not_part_of_the_batch(self):
+        # Upstream moved on past the fork's origin/main with someone else's page
+        self.commit("docs: add Kafka connector example guide", self.example("messaging", "kafka"))
+        self.git("update-ref", "refs/remotes/upstream/main", "HEAD")
+        self.git("checkout", "-q", "-b", "docs/batch", "origin/main")
+        self.commit("docs: add MySQL connector example guide", self.example("database", "mysql"))
+        self.git("merge", "-q", "--no-edit", "upstream/main")
+        self.commit("docs: add Redis connector example guide", self.example("database", "redis"))
+
+        log_range = branch_log_range(self.repo, "main")
+
+        self.assertCountEqual(
+            read_example_pages_from_branch(self.repo, log_range),
+            [("mysql", "database"), ("redis", "database")],
+        )
+        self.assertCountEqual(read_connectors_from_branch(self.repo, log_range), ["MySQL", "Redis"])
+
+    def test_falls_back_to_origin_without_an_upstream_remote(self):
+        self.git("checkout", "-q", "-b", "docs/batch")
+        self.commit("docs: add MySQL connector example guide", self.example("database", "mysql"))
+
+        log_range = branch_log_range(self.repo, "main")
+
+        self.assertEqual(read_example_pages_from_branch(self.repo, log_range), [("mysql", "database")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from job_store import MemoryJobStore, SqliteJobStore, evictable_jobs, open_job_store  # noqa: E402
+
+
+class EvictableJobsTests(unittest.TestCase):
+    FINISHED = [(30.0, "c"), (10.0, "a"), (20.0, "b")]
+
+    def test_keeps_the_newest_jobs_within_the_cache_size(self):
+        self.assertEqual(evictable_jobs(self.FINISHED, 2, 3600, now=40.0), ["a"])
+        self.assertEqual(evictable_jobs(self.FINISHED, 3, 3600, now=40.0), [])
+
+    def test_drops_jobs_past_the_ttl(self):
+        self.assertEqual(evictable_jobs(self.FINISHED, 10, 15, now=40.0), ["a", "b"])
+
+    def test_zero_size_or_ttl_evicts_every_finished_job(self):
+        self.assertEqual(evictable_jobs(self.FINISHED, 0, 3600, now=40.0), ["a", "b", "c"])
+        self.assertEqual(evictable_jobs(self.FINISHED, 10, 0, now=40.0), ["a", "b", "c"])
+
+    def test_busy_jobs_are_kept_and_not_counted(self):
+        self.assertEqual(evictable_jobs(self.FINISHED, 0, 0, now=40.0, busy={"b"}), ["a", "c"])
+        self.assertEqual(evictable_jobs(self.FINISHED, 1, 3600, now=40.0, busy={"c"}), ["a"])
+
+
+class SqliteJobStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp.name) / "jobs.sqlite3"
+        self.store = SqliteJobStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp.cleanup()
+
+    def test_round_trips_a_job_with_its_logs_and_trace(self):
+        self.store.create("job", 100.0)
+        for offset, line in enumerate(["one", "two", "three"]):
+            self.store.append_log("job", offset, line)
+        self.store.update("job", "done", {"turns": 3}, 160.0)
+        self.store.save_trace("job", {"traceEvents": []})
+
+        self.assertEqual(self.store.load("job"), {
+            "status": "done", "usage": {"turns": 3}, "createdAt": 100.0, "finishedAt": 160.0, "logCount": 3,
+        })
+        self.assertEqual(self.store.read_logs("job"), ["one", "two", "three"])
+        self.assertEqual(self.store.read_logs("job", since=2), ["three"])
+        self.assertEqual(self.store.load_trace("job"), {"traceEvents": []})
+        self.assertIsNone(self.store.load("unknown"))
+        self.assertIsNone(self.store.load_trace("unknown"))
+
+    def test_recover_marks_unfinished_jobs_as_errors(self):
+        self.store.create("queued", 1.0)
+        self.store.create("running", 2.0)
+        self.store.update("running", "running", None, None)
+        self.store.append_log("running", 0, "started")
+        self.store.create("done", 3.0)
+        self.store.update("done", "done", None, 4.0)
+
+        self.assertEqual(sorted(self.store.recover(50.0)), ["queued", "running"])
+        self.assertEqual(self.store.load("running")["status"], "error")
+        self.assertEqual(self.store.load("running")["finishedAt"], 50.0)
+        self.assertIn("restarted", self.store.read_logs("running", since=1)[0])
+        self.assertEqual(self.store.load("done")["status"], "done")
+        self.assertEqual(self.store.recover(60.0), [])
+
+    def test_prune_deletes_old_jobs_with_their_logs_and_traces(self):
+        for job_id, finished_at in (("old", 10.0), ("new", 90.0)):
+            self.store.create(job_id, 0.0)
+            self.store.append_log(job_id, 0, "line")
+            self.store.save_trace(job_id, {})
+            self.store.update(job_id, "done", None, finished_at)
+
+        self.assertEqual(self.store.prune(50.0), 1)
+        self.assertIsNone(self.store.load("old"))
+        self.assertEqual(self.store.read_logs("old"), [])
+        self.assertIsNone(self.store.load_trace("old"))
+        self.assertEqual(self.store.load("new")["logCount"], 1)
+
+    def test_open_job_store_recovers_and_prunes_on_open(self):
+        self.store.create("left-running", 0.0)
+        self.store.close()
+        self.store = open_job_store(str(self.path), retention_days=1)
+        self.assertEqual(self.store.load("left-running")["status"], "error")
+        self.assertIsInstance(open_job_store("memory", retention_days=1), MemoryJobStore)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from job_log import JobLog  # noqa: E402
+from job_trace import TOOLS_TID, JobTrace  # noqa: E402
+
+
+class JobTraceTests(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        logs = Path(self.temp.name)
+        self.log = JobLog(logs / "job.jsonl", 1024, 8000)
+        self.trace = JobTrace("job", logs / "job.trace.jsonl", self.log.path)
+
+    def tearDown(self):
+        self.log.close()
+        self.temp.cleanup()
+
+    def tool_call(self, tool_use_id: str, name: str, preview: str) -> None:
+        now = self.trace.message("AssistantMessage")
+        self.log.append(f"[TOOL] {name} → {preview}")
+        self.trace.tool_use(tool_use_id, name, self.log.count - 1, now)
+        now = self.trace.message("UserMessage")
+        self.trace.tool_result(tool_use_id, False, now)
+        self.trace.model_input(now)
+
+    def test_finished_calls_leave_nothing_but_durations_in_memory(self):
+        for n in range(200):
+            self.tool_call(f"t{n}", "Bash", f"echo {n}")
+
+        self.assertEqual(self.trace.pending_tools, {})
+        self.assertFalse(hasattr(self.trace, "events"))
+        self.assertEqual(self.trace.tool_latency()["Bash"]["calls"], 200)
+
+    def test_tool_spans_take_their_input_preview_from_the_job_log(self):
+        self.log.append("[SESSION] id=1")
+        self.tool_call("t1", "Read", "{'file_path': 'a.bal'}")
+        self.trace.tool_use("t2", "Write", 5, self.trace.message("AssistantMessage"))
+        self.trace.finish()
+
+        spans = [e for e in self.trace.to_chrome()["traceEvents"] if e["ph"] == "X" and e["tid"] == TOOLS_TID]
+
+        self.assertEqual([(e["name"], e["args"]["input"]) for e in spans], [
+            ("Read", "{'file_path': 'a.bal'}"),
+            ("Write", ""),
+        ])
+        self.assertTrue(spans[1]["args"]["unfinished"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# Copyright (c) 2026, WSO2 LLC. (http://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from batch_session import BatchSession  # noqa: E402
+from publish_docs import place_example_docs, placed_doc_paths  # noqa: E402
+
+SIDEBAR = """\
+{
+  type: 'category',
+  label: 'MySQL',
+  link: {type: 'doc', id: 'connectors/catalog/database/mysql/overview'},
+  items: [
+    'connectors/catalog/database/mysql/setup-guide',
+  ],
+},
+"""
+OVERVIEW = '---\ntitle: "MySQL Overview"\n---\n\n## Documentation\n\n* **[Setup Guide](setup-guide.md)**: Guide.\n'
+
+
+class PlacedDocPathsTests(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        temp = Path(self.temp.name)
+        self.repo = temp / "docs-integrator"
+        doc_dir = self.repo / "en/docs/connectors/catalog/database/mysql"
+        doc_dir.mkdir(parents=True)
+        (doc_dir / "overview.md").write_text(OVERVIEW, encoding="utf-8")
+        (self.repo / "en/sidebars.ts").write_text(SIDEBAR, encoding="utf-8")
+        self.git("init", "-q")
+        self.git("add", ".")
+        self.git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base")
+
+        screenshots = temp / "artifacts" / "screenshots"
+        screenshots.mkdir(parents=True)
+        self.png = screenshots / "mysql_screenshot_01_palette.png"
+        self.png.write_bytes(b"p")
+        self.png.with_suffix(".webp").write_bytes(b"w")
+        self.guide = temp / "artifacts" / "guide.md"
+        self.guide.write_text("# Example\n\n![Palette](../screenshots/mysql_screenshot_01_palette.png)\n")
+        self.paths = placed_doc_paths(self.repo, "database", "mysql")
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=self.repo, check=True, capture_output=True, text=True
+        ).stdout
+
+    def place(self) -> None:
+        place_example_docs(
+            self.repo, "database", "mysql", "MySQL", self.guide,
+            [self.png, self.png.with_suffix(".webp")], dry_run=False,
+        )
+
+    def test_stages_exactly_the_files_placement_touches(self):
+        self.place()
+        self.git("add", "--", *map(str, self.paths))
+
+        self.assertCountEqual(self.git("status", "--porcelain", "--untracked-files=all").splitlines(), [
+            "M  en/docs/connectors/catalog/database/mysql/overview.md",
+            "M  en/sidebars.ts",
+            "A  en/docs/connectors/catalog/database/mysql/example.md",
+            "A  en/static/img/connectors/catalog/database/mysql/mysql_screenshot_01_palette.png",
+            "A  en/static/img/connectors/catalog/database/mysql/mysql_screenshot_01_palette.webp",
+        ])
+
+    def test_failed_batch_placement_leaves_the_checkout_clean(self):
+        session = BatchSession(self.repo, "docs/batch", "wso2/docs-integrator", "main")
+        session.manifest = {"items": []}
+        session.manifest_path = Path(self.temp.name) / "manifest.json"
+
+        def place_then_fail() -> None:
+            self.place()
+            raise RuntimeError("placement failed")
+
+        with self.assertRaises(RuntimeError):
+            session.commit("mysql", "docs: add MySQL connector example guide", self.paths, place_then_fail)
+        self.assertEqual(self.git("status", "--porcelain", "--untracked-files=all"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()